@@ -0,0 +1,94 @@
+"""
+golden_output_of_MUPMOC.py, Geoffrey Weal, 17/10/26
+
+This script is designed to check that the RSGC program still removes the same sidegroups from the example MUPMOC molecules as it did when the golden outputs were recorded.
+
+The sidegroups are removed from each of the MUPMOC molecules in Documentation/docs/Files/Repair_Crystal, for every combination of leave_as_ethyls and add_hydrogens_to_alpha_carbons.
+The elements, positions, and bonds of each molecule with its sidegroups removed are compared to those in golden_outputs/MUPMOC_golden_outputs.json. If any are different,
+this script exits with an error, so it can be used to check that making the RSGC program faster has not changed what it gives.
+
+If a change to the RSGC program is meant to change what it gives, the golden outputs can be recorded again with the --update option.
+
+Usage: python3 golden_output_of_MUPMOC.py [--update]
+"""
+import os, sys, glob, json, itertools
+import numpy as np
+
+from memory_of_removing_sidegroups import read_molecule_and_graph, example_molecules_folderpath
+
+from RSGC.RSGC.remove_sidechains_methods.remove_aliphatic_sidegroups import remove_aliphatic_sidegroups
+
+golden_outputs_filepath = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'golden_outputs', 'MUPMOC_golden_outputs.json')
+
+# This is the largest difference (in A) allowed between the positions of the atoms and those in the golden outputs.
+position_tolerance = 1e-4
+
+def get_outputs():
+	"""
+	This method is designed to remove the sidegroups from each of the MUPMOC molecules, for every combination of settings.
+
+	Returns
+	-------
+	outputs : dict.
+		These are the elements, positions, and bonds of each molecule with its sidegroups removed, given by "<molecule file>, leave_as_ethyls=<>, add_hydrogens_to_alpha_carbons=<>".
+	"""
+	outputs = {}
+	for filepath in sorted(glob.glob(os.path.join(example_molecules_folderpath, '*_molecules', '*.xyz'))):
+		molecule_name = os.path.relpath(filepath, example_molecules_folderpath)
+		for leave_as_ethyls, add_hydrogens_to_alpha_carbons in itertools.product((False, True), (False, True)):
+			molecule, molecule_graph = read_molecule_and_graph(filepath)
+			updated_molecule, updated_molecule_graph = remove_aliphatic_sidegroups(molecule, molecule_graph, filepath, leave_as_ethyls=leave_as_ethyls, add_hydrogens_to_alpha_carbons=add_hydrogens_to_alpha_carbons)
+			output_name = f'{molecule_name}, leave_as_ethyls={leave_as_ethyls}, add_hydrogens_to_alpha_carbons={add_hydrogens_to_alpha_carbons}'
+			outputs[output_name] = {'symbols': updated_molecule.get_chemical_symbols(), 'positions': np.round(updated_molecule.get_positions(), 6).tolist(), 'bonds': sorted(sorted([int(index1), int(index2)]) for index1, index2 in updated_molecule_graph.edges)}
+	return outputs
+
+def compare_outputs(outputs, golden_outputs):
+	"""
+	This method is designed to compare the outputs of the RSGC program to the golden outputs.
+
+	Parameters
+	----------
+	outputs : dict.
+		These are the outputs given by the RSGC program now.
+	golden_outputs : dict.
+		These are the golden outputs.
+
+	Returns
+	-------
+	differences : list of str.
+		These are the differences between the outputs and the golden outputs.
+	"""
+	differences = []
+	for output_name in sorted(set(outputs.keys()) | set(golden_outputs.keys())):
+		if output_name not in golden_outputs:
+			differences.append(output_name+': not in the golden outputs')
+		elif output_name not in outputs:
+			differences.append(output_name+': not given by the RSGC program')
+		elif outputs[output_name]['symbols'] != golden_outputs[output_name]['symbols']:
+			differences.append(output_name+': different atoms ('+str(len(outputs[output_name]['symbols']))+' atoms rather than '+str(len(golden_outputs[output_name]['symbols']))+')')
+		elif not np.allclose(outputs[output_name]['positions'], golden_outputs[output_name]['positions'], rtol=0.0, atol=position_tolerance):
+			differences.append(output_name+': different positions')
+		elif outputs[output_name]['bonds'] != golden_outputs[output_name]['bonds']:
+			differences.append(output_name+': different bonds')
+	return differences
+
+if __name__ == '__main__':
+
+	# First, remove the sidegroups from the MUPMOC molecules.
+	outputs = get_outputs()
+
+	# Second, if --update is given, record these as the golden outputs.
+	if '--update' in sys.argv[1:]:
+		os.makedirs(os.path.dirname(golden_outputs_filepath), exist_ok=True)
+		with open(golden_outputs_filepath, 'w') as golden_outputs_file:
+			json.dump(outputs, golden_outputs_file, indent=1, sort_keys=True)
+		print(f'Recorded {len(outputs)} golden outputs in {golden_outputs_filepath}')
+		sys.exit()
+
+	# Third, compare the outputs to the golden outputs.
+	with open(golden_outputs_filepath) as golden_outputs_file:
+		golden_outputs = json.load(golden_outputs_file)
+	differences = compare_outputs(outputs, golden_outputs)
+	if len(differences) > 0:
+		sys.exit('Error: the RSGC program gives different outputs to the golden outputs:\n'+'\n'.join(differences))
+	print(f'All {len(outputs)} outputs are the same as the golden outputs.')
@@ -0,0 +1,84 @@
+"""
+import_time.py, Geoffrey Weal, 17/10/26
+
+This script is designed to measure how long it takes to start the RSGC program, and to check this against a time budget.
+
+This measures the time taken (in a new python process each time) to:
+	* import RSGC,
+	* import the RSGC function (from RSGC import RSGC), which imports ASE, networkx, and SUMELF, and
+	* run "rsgc --help".
+
+The median of the repeats is given for each. If "import RSGC" or "rsgc --help" take longer than their budget, this script exits with an error, so it can be used to check that
+changes to the RSGC program do not make it slower to start. Importing the RSGC function is given for information, as this is mostly the time taken to import the programs it needs.
+
+Usage: python3 import_time.py [no_of_repeats] [import_RSGC_budget_in_ms] [rsgc_help_budget_in_ms]
+"""
+import os, sys, time, subprocess
+from statistics import median
+
+RSGC_folderpath = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+rsgc_filepath   = os.path.join(RSGC_folderpath, 'bin', 'rsgc')
+
+def get_time_to_run(command, no_of_repeats):
+	"""
+	This method is designed to measure the time taken to run a command in a new python process.
+
+	Parameters
+	----------
+	command : list of str.
+		This is the command to run.
+	no_of_repeats : int
+		This is the number of times to run the command.
+
+	Returns
+	-------
+	time_taken : float
+		This is the median time (in ms) taken to run the command.
+	"""
+	environment = dict(os.environ)
+	environment['PYTHONPATH'] = RSGC_folderpath + ((os.pathsep + environment['PYTHONPATH']) if ('PYTHONPATH' in environment) else '')
+	times_taken = []
+	for _ in range(no_of_repeats):
+		start_time = time.perf_counter()
+		subprocess.run(command, env=environment, check=True, stdout=subprocess.DEVNULL)
+		times_taken.append((time.perf_counter() - start_time) * 1000.0)
+	return median(times_taken)
+
+if __name__ == '__main__':
+
+	# First, obtain the settings for this benchmark.
+	no_of_repeats             = int(sys.argv[1])   if (len(sys.argv) > 1) else 10
+	import_RSGC_budget_in_ms  = float(sys.argv[2]) if (len(sys.argv) > 2) else 150.0
+	rsgc_help_budget_in_ms    = float(sys.argv[3]) if (len(sys.argv) > 3) else 250.0
+
+	# Second, measure the time taken to start python, as this is included in all the other times.
+	python_time = get_time_to_run([sys.executable, '-c', 'pass'], no_of_repeats)
+
+	# Third, measure the time taken to import RSGC, to import the RSGC function, and to run "rsgc --help".
+	import_RSGC_time = get_time_to_run([sys.executable, '-c', 'import RSGC'], no_of_repeats)
+	try:
+		import_RSGC_function_time = get_time_to_run([sys.executable, '-c', 'from RSGC import RSGC'], no_of_repeats)
+	except subprocess.CalledProcessError:
+		# The programs needed by the RSGC function (such as SUMELF) are not installed.
+		import_RSGC_function_time = None
+	rsgc_help_time = get_time_to_run([sys.executable, rsgc_filepath, '--help'], no_of_repeats)
+
+	# Fourth, report the times taken.
+	print('Median times over '+str(no_of_repeats)+' repeats (including the time to start python):')
+	print('  python -c "pass":               {:8.1f} ms'.format(python_time))
+	print('  import RSGC:                    {:8.1f} ms (budget: {:.1f} ms)'.format(import_RSGC_time, import_RSGC_budget_in_ms))
+	if import_RSGC_function_time is None:
+		print('  from RSGC import RSGC:          could not be imported (are all the programs the RSGC program needs installed?)')
+	else:
+		print('  from RSGC import RSGC:          {:8.1f} ms'.format(import_RSGC_function_time))
+	print('  rsgc --help:                    {:8.1f} ms (budget: {:.1f} ms)'.format(rsgc_help_time, rsgc_help_budget_in_ms))
+
+	# Fifth, check the times against their budgets.
+	over_budget = []
+	if import_RSGC_time > import_RSGC_budget_in_ms:
+		over_budget.append('import RSGC')
+	if rsgc_help_time > rsgc_help_budget_in_ms:
+		over_budget.append('rsgc --help')
+	if len(over_budget) > 0:
+		sys.exit('Error: '+', '.join(over_budget)+' took longer than the time budget.')
+	print('All start up times are within their budgets.')
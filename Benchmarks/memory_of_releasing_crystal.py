@@ -0,0 +1,111 @@
+"""
+memory_of_releasing_crystal.py, Geoffrey Weal, 17/10/26
+
+This script is designed to check that the original crystal is released by remove_sidegroups_from_crystal when low_memory is True.
+
+A synthetic crystal (made by synthetic_alkylated_crystals.py) is written to file and read back, and handed to remove_sidegroups_from_crystal inside a list, as RSGC does. The memory
+in use (allocated by python, using tracemalloc) is measured when the molecules are first checked, which is just after the original crystal is no longer needed. This is done with
+low_memory set to False and True, for each bonding method. With low_memory set to True, no crystal as large as the original crystal should still be alive at this point, and
+the memory in use should be smaller by at least the size of the arrays of the original crystal. If not, this script exits with an error.
+
+Running this needs SUMELF to be installed.
+
+Usage: python3 memory_of_releasing_crystal.py [no_of_molecules]
+"""
+import os, sys, gc, tempfile, tracemalloc
+
+from ase.io import read, write
+from ase    import Atoms
+
+from synthetic_alkylated_crystals import make_synthetic_crystal
+
+from RSGC.RSGC.RSGC_methods.remove_sidegroups_from_crystal import remove_sidegroups_from_crystal
+from RSGC.RSGC.RSGC_methods.get_cell_list_graph            import bonding_methods
+
+# This is the module that contains remove_sidegroups_from_crystal, so that the memory can be measured when it checks the molecules.
+remove_sidegroups_from_crystal_module = sys.modules[remove_sidegroups_from_crystal.__module__]
+
+def measure_memory_after_releasing_crystal(crystal_filepath, low_memory, bonding_method):
+	"""
+	This method is designed to measure the memory in use when remove_sidegroups_from_crystal first checks the molecules of a crystal.
+
+	Parameters
+	----------
+	crystal_filepath : str.
+		This is the path to the crystal file.
+	low_memory : bool.
+		This is the low_memory setting to give to remove_sidegroups_from_crystal.
+	bonding_method : str.
+		This is the bonding_method setting to give to remove_sidegroups_from_crystal.
+
+	Returns
+	-------
+	memory_in_use : int
+		This is the memory (in bytes) allocated by python when the molecules were first checked, not including the memory in use before the crystal was read.
+	no_of_crystals_alive : int
+		This is the number of crystals (ase.Atoms objects with as many atoms as the original crystal) that were still alive when the molecules were first checked.
+	crystal_size : int
+		This is the size (in bytes) of the arrays of the original crystal.
+	"""
+
+	# First, measure the memory in use the first time check_molecules is called.
+	measurements = []
+	check_molecules = remove_sidegroups_from_crystal_module.check_molecules
+	def check_molecules_and_measure_memory(*args, **kwargs):
+		if len(measurements) == 0:
+			gc.collect()
+			no_of_crystals_alive = sum(1 for obj in gc.get_objects() if isinstance(obj, Atoms) and (len(obj) >= no_of_atoms_in_crystal))
+			measurements.append((tracemalloc.get_traced_memory()[0] - memory_before_reading, no_of_crystals_alive))
+		return check_molecules(*args, **kwargs)
+
+	# Second, read the crystal and hand it over to remove_sidegroups_from_crystal inside a list, as RSGC does, so that nothing else holds on to it.
+	gc.collect()
+	tracemalloc.start()
+	remove_sidegroups_from_crystal_module.check_molecules = check_molecules_and_measure_memory
+	try:
+		memory_before_reading = tracemalloc.get_traced_memory()[0]
+		crystal_holder = [read(crystal_filepath)]
+		no_of_atoms_in_crystal = len(crystal_holder[0])
+		crystal_size = sum(array.nbytes for array in crystal_holder[0].arrays.values())
+		remove_sidegroups_from_crystal(crystal_holder, crystal_filepath, problematic_molecules_policy='fail', low_memory=low_memory, bonding_method=bonding_method)
+	finally:
+		remove_sidegroups_from_crystal_module.check_molecules = check_molecules
+		tracemalloc.stop()
+
+	# Third, return the memory in use when the molecules were first checked.
+	memory_in_use, no_of_crystals_alive = measurements[0]
+	return memory_in_use, no_of_crystals_alive, crystal_size
+
+if __name__ == '__main__':
+
+	# First, obtain the settings for this benchmark.
+	no_of_molecules = int(sys.argv[1]) if (len(sys.argv) > 1) else 64
+
+	# Second, make the synthetic crystal and write it to file, as RSGC reads the crystal from file.
+	crystal, _ = make_synthetic_crystal(no_of_rings_in_core=3, no_of_sidechains=4, sidechain_length=12, Z_prime=1, no_of_symmetric_copies=no_of_molecules)
+	with tempfile.TemporaryDirectory() as temporary_folderpath:
+		crystal_filepath = os.path.join(temporary_folderpath, 'synthetic_crystal.xyz')
+		write(crystal_filepath, crystal)
+		print(f'Synthetic crystal: {len(crystal)} atoms in {no_of_molecules} molecules')
+		del crystal
+
+		# Third, measure the memory in use after the original crystal is no longer needed, with and without low_memory, for each bonding method.
+		issues = []
+		for bonding_method in bonding_methods:
+			memory_in_use,            no_of_crystals_alive,            crystal_size = measure_memory_after_releasing_crystal(crystal_filepath, False, bonding_method)
+			memory_in_use_low_memory, no_of_crystals_alive_low_memory, _            = measure_memory_after_releasing_crystal(crystal_filepath, True,  bonding_method)
+			print(f'bonding_method={bonding_method}:')
+			print(f'    Size of the arrays of the crystal:       {crystal_size/1024.0:.1f} KiB')
+			print(f'    Memory in use (low_memory=False):        {memory_in_use/1024.0:.1f} KiB ({no_of_crystals_alive} crystal(s) alive)')
+			print(f'    Memory in use (low_memory=True):         {memory_in_use_low_memory/1024.0:.1f} KiB ({no_of_crystals_alive_low_memory} crystal(s) alive)')
+
+			# 3.1: Check that the original crystal was released when low_memory is True.
+			if no_of_crystals_alive_low_memory > 0:
+				issues.append(f'bonding_method={bonding_method}: {no_of_crystals_alive_low_memory} crystal(s) were still alive after the crystal was no longer needed with low_memory=True')
+			if (memory_in_use - memory_in_use_low_memory) < crystal_size:
+				issues.append(f'bonding_method={bonding_method}: low_memory=True only used {(memory_in_use - memory_in_use_low_memory)/1024.0:.1f} KiB less memory, which is less than the size of the arrays of the crystal ({crystal_size/1024.0:.1f} KiB)')
+
+	# Fourth, check that the original crystal was released in every case.
+	if len(issues) > 0:
+		sys.exit('Error: '+'\n'.join(issues))
+	print('The original crystal is released once it is no longer needed when low_memory is True.')
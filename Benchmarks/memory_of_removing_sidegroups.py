@@ -0,0 +1,126 @@
+"""
+memory_of_removing_sidegroups.py, Geoffrey Weal, 17/10/26
+
+This script is designed to measure the memory used when removing the aliphatic sidegroups from the molecules of a crystal.
+
+This measures the peak memory (using tracemalloc) when removing sidegroups from the molecules in the example MUPMOC crystals, as the RSGC program does now
+(each non-solvent molecule copied once, graphs and solvents not copied), and when every molecule and graph is deep-copied before sidegroups are removed (as the RSGC program used to do).
+
+Usage: python3 memory_of_removing_sidegroups.py [no_of_copies_of_each_molecule] [no_of_solvents]
+"""
+import os, sys, glob, tracemalloc
+from copy import deepcopy
+
+from ase.io   import read
+from networkx import Graph
+
+from RSGC.RSGC.remove_sidechains_methods.remove_aliphatic_sidegroups_from_molecules import remove_aliphatic_sidegroups_from_molecules
+
+example_molecules_folderpath = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Documentation', 'docs', 'Files', 'Repair_Crystal')
+
+def read_molecule_and_graph(filepath):
+	"""
+	This method is designed to read a molecule and obtain its graph from the neighbours list saved in the molecule's xyz file.
+
+	Parameters
+	----------
+	filepath : str.
+		This is the path to the molecule xyz file.
+
+	Returns
+	-------
+	molecule : ase.Atoms
+		This is the molecule.
+	molecule_graph : networkx.Graph
+		This is the graph of this molecule.
+	"""
+	molecule = read(filepath)
+	molecule_graph = Graph()
+	molecule_graph.add_nodes_from((index, {'E': symbol}) for index, symbol in enumerate(molecule.get_chemical_symbols()))
+	for index, neighbours in enumerate(molecule.arrays['NeighboursList']):
+		molecule_graph.add_edges_from((index, int(neighbour)) for neighbour in str(neighbours).split(',') if (neighbour != ''))
+	return molecule, molecule_graph
+
+def get_molecules(no_of_copies_of_each_molecule, no_of_solvents):
+	"""
+	This method is designed to obtain a set of molecules to remove sidegroups from, made from the example MUPMOC molecules.
+
+	Parameters
+	----------
+	no_of_copies_of_each_molecule : int
+		This is the number of copies of each MUPMOC molecule to include.
+	no_of_solvents : int
+		This is the number of molecules to mark as solvents.
+
+	Returns
+	-------
+	molecules : dict. of ase.Atoms
+		These are the molecules.
+	molecule_graphs : dict. of networkx.Graph
+		These are the graphs of the molecules.
+	solvent_components : list of ints
+		These are the names of the molecules that are solvents.
+	"""
+	filepaths = sorted(glob.glob(os.path.join(example_molecules_folderpath, '*_molecules', '*.xyz')))
+	molecules = {}; molecule_graphs = {}
+	for filepath in filepaths * no_of_copies_of_each_molecule:
+		molecule, molecule_graph = read_molecule_and_graph(filepath)
+		molecule_name = len(molecules) + 1
+		molecules[molecule_name] = molecule
+		molecule_graphs[molecule_name] = molecule_graph
+	solvent_components = sorted(molecules.keys())[:no_of_solvents]
+	return molecules, molecule_graphs, solvent_components
+
+def measure_peak_memory(method, *args):
+	"""
+	This method is designed to measure the peak memory used while running method.
+
+	Parameters
+	----------
+	method : function
+		This is the method to run.
+	args : tuple
+		These are the inputs to give to method.
+
+	Returns
+	-------
+	peak_memory : int
+		This is the peak memory (in bytes) that was allocated while running method.
+	"""
+	tracemalloc.start()
+	method(*args)
+	_, peak_memory = tracemalloc.get_traced_memory()
+	tracemalloc.stop()
+	return peak_memory
+
+def remove_sidegroups(molecules, molecule_graphs, solvent_components):
+	"""
+	This method will remove sidegroups from the molecules, as the RSGC program does.
+	"""
+	remove_aliphatic_sidegroups_from_molecules(molecules, molecule_graphs, solvent_components, 'benchmark')
+
+def remove_sidegroups_from_deep_copies(molecules, molecule_graphs, solvent_components):
+	"""
+	This method will deep-copy every molecule and graph before removing sidegroups from the molecules, as the RSGC program used to do.
+	"""
+	molecules_copy       = {molecule_name: molecule.copy()           for molecule_name, molecule       in molecules.items()}
+	molecule_graphs_copy = {molecule_name: deepcopy(molecule_graph) for molecule_name, molecule_graph in molecule_graphs.items()}
+	remove_aliphatic_sidegroups_from_molecules(molecules_copy, molecule_graphs_copy, solvent_components, 'benchmark')
+
+if __name__ == '__main__':
+
+	# First, obtain the molecules to remove sidegroups from.
+	no_of_copies_of_each_molecule = int(sys.argv[1]) if (len(sys.argv) > 1) else 4
+	no_of_solvents                = int(sys.argv[2]) if (len(sys.argv) > 2) else 4
+	molecules, molecule_graphs, solvent_components = get_molecules(no_of_copies_of_each_molecule, no_of_solvents)
+
+	# Second, measure the peak memory used to remove sidegroups in both ways.
+	peak_memory_now         = measure_peak_memory(remove_sidegroups,                  molecules, molecule_graphs, solvent_components)
+	peak_memory_deep_copies = measure_peak_memory(remove_sidegroups_from_deep_copies, molecules, molecule_graphs, solvent_components)
+
+	# Third, report the peak memory used.
+	print(f'Number of molecules: {len(molecules)} ({len(solvent_components)} solvents)')
+	print(f'Peak memory (copy once, solvents not copied): {peak_memory_now/1024.0:.1f} KiB')
+	print(f'Peak memory (deep-copy everything first):     {peak_memory_deep_copies/1024.0:.1f} KiB')
+	print(f'Reduction: {100.0*(1.0 - peak_memory_now/peak_memory_deep_copies):.1f}%')
+
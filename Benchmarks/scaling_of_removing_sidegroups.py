@@ -0,0 +1,83 @@
+"""
+scaling_of_removing_sidegroups.py, Geoffrey Weal, 17/10/26
+
+This script is designed to check that the time taken to remove sidegroups from a molecule grows no faster than linearly with the size of the molecule.
+
+Synthetic molecules (made by synthetic_alkylated_crystals.py) are made bigger in three ways: longer sidechains, bigger conjugated cores, and more (branched) sidechains.
+For each series of molecules, the growth exponent k (where time ~ no_of_atoms^k) is obtained from a straight-line fit between log(time) and log(no_of_atoms) for:
+	* the total time taken by remove_aliphatic_sidegroups,
+	* the time taken by the ring traversal (get_list_of_rings),
+	* the time taken by the moiety traversal (determine_atoms_between_moieties_to_keep), and
+	* the number of ring paths explored by get_list_of_rings, which does not depend on how fast the computer is.
+
+If any of these grow faster than max_exponent, this script exits with an error, so it can be used to check that changes to the RSGC program do not introduce super-linear
+slowdowns in the ring and moiety traversals.
+
+Usage: python3 scaling_of_removing_sidegroups.py [no_of_repeats] [max_exponent]
+"""
+import sys
+import numpy as np
+
+from synthetic_alkylated_crystals import make_synthetic_molecule
+from time_of_removing_sidegroups  import time_removing_sidegroups
+
+# These are the series of molecules to check, given as the settings to give to make_synthetic_molecule for each molecule in the series.
+scaling_series = {
+	'sidechain length':    [{'no_of_rings_in_core': 3, 'no_of_sidechains': 2, 'sidechain_length': sidechain_length} for sidechain_length in (8, 16, 32, 64, 128)],
+	'core size':           [{'no_of_rings_in_core': no_of_rings_in_core, 'no_of_sidechains': 2, 'sidechain_length': 8} for no_of_rings_in_core in (2, 4, 8, 16, 32)],
+	'branched sidechains': [{'no_of_rings_in_core': 2*no_of_sidechains, 'no_of_sidechains': no_of_sidechains, 'sidechain_type': '2-ethylhexyl'} for no_of_sidechains in (2, 4, 8, 16, 32)],
+}
+
+# These are the stage times and counts to check the growth of.
+measures_to_check = ['total', 'get_list_of_rings', 'determine_atoms_between_moieties_to_keep', 'ring_paths_explored']
+
+def get_growth_exponent(sizes, values):
+	"""
+	This method is designed to obtain the growth exponent k, where values ~ sizes^k.
+
+	Parameters
+	----------
+	sizes : list of int
+		These are the sizes of the molecules (the number of atoms).
+	values : list of float
+		These are the times or counts for each molecule.
+
+	Returns
+	-------
+	growth_exponent : float
+		This is the slope of the straight-line fit between log(values) and log(sizes).
+	"""
+	return float(np.polyfit(np.log(sizes), np.log(values), 1)[0])
+
+if __name__ == '__main__':
+
+	# First, obtain the settings for this benchmark.
+	no_of_repeats = int(sys.argv[1])   if (len(sys.argv) > 1) else 5
+	max_exponent  = float(sys.argv[2]) if (len(sys.argv) > 2) else 1.5
+
+	# Second, obtain the growth exponents of each series of molecules.
+	super_linear_measures = []
+	for series_name, series in scaling_series.items():
+
+		# 2.1: Time removing sidegroups from each molecule in this series.
+		sizes = []; measures = {measure: [] for measure in measures_to_check}
+		for settings in series:
+			molecule, molecule_graph = make_synthetic_molecule(**settings)
+			stage_times, counts = time_removing_sidegroups(molecule, molecule_graph, no_of_repeats=no_of_repeats)
+			sizes.append(len(molecule))
+			for measure in measures_to_check:
+				measures[measure].append(stage_times[measure] if (measure in stage_times) else counts[measure])
+
+		# 2.2: Report the growth exponent of each measure, and record the measures that grow faster than max_exponent.
+		print(f'{series_name} (molecules with {sizes[0]} to {sizes[-1]} atoms):')
+		for measure in measures_to_check:
+			growth_exponent = get_growth_exponent(sizes, measures[measure])
+			over_limit = growth_exponent > max_exponent
+			print('    {:45s} k = {:5.2f}{}'.format(measure, growth_exponent, ('   <-- grows faster than no_of_atoms^'+str(max_exponent)) if over_limit else ''))
+			if over_limit:
+				super_linear_measures.append(series_name+': '+measure)
+
+	# Third, check that nothing grew faster than max_exponent.
+	if len(super_linear_measures) > 0:
+		sys.exit('Error: the following grow faster than no_of_atoms^'+str(max_exponent)+': '+', '.join(super_linear_measures))
+	print('All stages grow no faster than no_of_atoms^'+str(max_exponent)+'.')
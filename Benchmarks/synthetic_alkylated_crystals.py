@@ -0,0 +1,376 @@
+"""
+synthetic_alkylated_crystals.py, Geoffrey Weal, 17/10/26
+
+This script is designed to make synthetic molecules and crystals, made of a conjugated core with aliphatic sidechains attached to it, to benchmark the RSGC program with.
+
+The conjugated core is a row of fused benzene rings (an acene) that lies flat in the xy plane. Sidechains are attached to the hydrogen-bearing carbons around the edge of the core,
+with their carbons zig-zagging in the plane of the core and their hydrogens above and below this plane. A sidechain can be branched (such as 2-ethylhexyl), where the branch points
+out of the plane of the core. All bond lengths and angles are chemically sensible, so the bonding of these molecules can also be obtained from their atom positions.
+
+The size of every part of the molecule can be changed, so these molecules can be used to check how the time taken by the RSGC program grows as molecules get bigger.
+"""
+import numpy as np
+
+from ase      import Atoms
+from networkx import Graph
+
+# These are the bond lengths (in A) used to make the synthetic molecules.
+aromatic_CC_bond_length = 1.40
+aliphatic_CC_bond_length = 1.54
+CH_bond_length = 1.09
+
+# This is the tetrahedral angle (in radians).
+tetrahedral_angle = np.arccos(-1.0/3.0)
+
+# These are the sidechains commonly found on organic semiconductors, given as (sidechain_length, branch_position, branch_length). See make_synthetic_molecule for more information.
+sidechain_types = {'methyl': (1, None, 0), 'n-butyl': (4, None, 0), 'n-hexyl': (6, None, 0), 'n-octyl': (8, None, 0), 'n-dodecyl': (12, None, 0), '2-ethylhexyl': (6, 2, 2), '2-butyloctyl': (8, 2, 4), '2-hexyldecyl': (10, 2, 6), '2-octyldodecyl': (12, 2, 8)}
+
+def make_synthetic_molecule(no_of_rings_in_core=3, no_of_sidechains=2, sidechain_length=8, branch_position=None, branch_length=0, sidechain_type=None):
+	"""
+	This method is designed to make a synthetic molecule, made of a conjugated core with aliphatic sidechains attached to it.
+
+	Parameters
+	----------
+	no_of_rings_in_core : int
+		This is the number of fused benzene rings in the conjugated core. Default: 3.
+	no_of_sidechains : int
+		This is the number of sidechains to attach to the core. Sidechains are attached to the edge of the core far enough apart that they do not overlap, so long cores are needed for many sidechains. Default: 2.
+	sidechain_length : int
+		This is the number of carbons in the longest chain of each sidechain (the backbone). Default: 8.
+	branch_position : int or None
+		This is the carbon in the backbone of each sidechain that the branch is attached to, where 1 is the carbon attached to the core. If None, the sidechains are not branched. Default: None.
+	branch_length : int
+		This is the number of carbons in the branch of each sidechain. For example, 2-ethylhexyl is given by sidechain_length=6, branch_position=2, and branch_length=2. Default: 0.
+	sidechain_type : str. or None
+		This is the name of a sidechain in sidechain_types (such as '2-ethylhexyl'). If given, this is used instead of sidechain_length, branch_position, and branch_length. Default: None.
+
+	Returns
+	-------
+	molecule : ase.Atoms
+		This is the synthetic molecule.
+	molecule_graph : networkx.Graph
+		This is the graph of this molecule, where each node is given the element of its atom as 'E'.
+	"""
+
+	# Preliminary Step: obtain the sidechain, and check that it can be made.
+	if sidechain_type is not None:
+		if sidechain_type not in sidechain_types:
+			raise Exception('Error: sidechain_type must be one of '+str(list(sidechain_types.keys()))+'. sidechain_type = '+str(sidechain_type))
+		sidechain_length, branch_position, branch_length = sidechain_types[sidechain_type]
+	if no_of_rings_in_core < 1:
+		raise Exception('Error: no_of_rings_in_core must be 1 or greater. no_of_rings_in_core = '+str(no_of_rings_in_core))
+	if sidechain_length < 1:
+		raise Exception('Error: sidechain_length must be 1 or greater. sidechain_length = '+str(sidechain_length))
+	if (branch_position is not None) and (not (1 <= branch_position < sidechain_length)):
+		raise Exception('Error: branch_position must be between 1 and sidechain_length-1. branch_position = '+str(branch_position)+', sidechain_length = '+str(sidechain_length))
+
+	# First, make the conjugated core.
+	symbols, positions, bonds, edge_sites = make_acene_core(no_of_rings_in_core)
+
+	# Second, choose the edge sites to attach the sidechains to, where the sidechains are far enough apart to not overlap.
+	sidechain_sites = choose_sidechain_sites(edge_sites, positions, no_of_sidechains)
+
+	# Third, add a sidechain or a hydrogen to each edge site of the core.
+	for edge_carbon, outward_direction in edge_sites:
+		if edge_carbon in sidechain_sites:
+			add_sidechain(symbols, positions, bonds, edge_carbon, outward_direction, sidechain_length, branch_position, branch_length)
+		else:
+			add_atom(symbols, positions, bonds, 'H', positions[edge_carbon] + CH_bond_length*outward_direction, edge_carbon)
+
+	# Fourth, make the molecule and its graph.
+	molecule = Atoms(symbols=symbols, positions=positions)
+	molecule_graph = Graph()
+	molecule_graph.add_nodes_from((index, {'E': symbol}) for index, symbol in enumerate(symbols))
+	molecule_graph.add_edges_from(bonds)
+	return molecule, molecule_graph
+
+def make_synthetic_crystal(no_of_rings_in_core=3, no_of_sidechains=2, sidechain_length=8, branch_position=None, branch_length=0, sidechain_type=None, Z_prime=1, no_of_symmetric_copies=2, spacing=3.0):
+	"""
+	This method is designed to make a synthetic crystal of molecules made by make_synthetic_molecule.
+
+	The crystal contains Z_prime unique molecules (the asymmetric unit), each with no_of_symmetric_copies copies in the unit cell. Each unique molecule is given a
+	slightly different twist, so that they are not equivalent to each other, while symmetric copies are inverted through the centre of their place in the unit cell.
+	The molecules are placed on a grid with spacing (in A) between them, so that no atoms from different molecules are bonded to each other.
+
+	Parameters
+	----------
+	no_of_rings_in_core, no_of_sidechains, sidechain_length, branch_position, branch_length, sidechain_type
+		These describe the molecules in the crystal. See make_synthetic_molecule for more information.
+	Z_prime : int
+		This is the number of unique molecules in the crystal. Default: 1.
+	no_of_symmetric_copies : int
+		This is the number of copies of each unique molecule in the unit cell. Copies are alternatively inverted. Default: 2.
+	spacing : float
+		This is the shortest distance (in A) between the atoms of different molecules. Default: 3.0.
+
+	Returns
+	-------
+	crystal : ase.Atoms
+		This is the synthetic crystal.
+	molecule_graphs : list of networkx.Graph
+		These are the graphs of the molecules in the crystal, with atoms given by their index in the crystal. These are given in the same order as the molecules in the crystal.
+	"""
+
+	# First, make each unique molecule, giving each a different twist about the long axis of its core so that they are not equivalent.
+	unique_molecules = []
+	for index in range(Z_prime):
+		molecule, molecule_graph = make_synthetic_molecule(no_of_rings_in_core=no_of_rings_in_core, no_of_sidechains=no_of_sidechains, sidechain_length=sidechain_length, branch_position=branch_position, branch_length=branch_length, sidechain_type=sidechain_type)
+		molecule.rotate(7.0*index, 'x', center='COP')
+		molecule.translate(-molecule.get_positions().mean(axis=0))
+		unique_molecules.append((molecule, molecule_graph))
+
+	# Second, obtain the size of the grid cell to give each molecule.
+	all_positions = np.concatenate([molecule.get_positions() for molecule, _ in unique_molecules])
+	grid_cell_lengths = 2.0*np.abs(all_positions).max(axis=0) + spacing
+
+	# Third, place the molecules on a grid, inverting every other symmetric copy.
+	no_of_molecules = Z_prime * no_of_symmetric_copies
+	no_of_grid_points = int(np.ceil(no_of_molecules ** (1.0/3.0)))
+	crystal = Atoms(pbc=True)
+	molecule_graphs = []
+	for index in range(no_of_molecules):
+		molecule, molecule_graph = unique_molecules[index % Z_prime]
+		molecule = molecule.copy()
+		if (index // Z_prime) % 2 == 1:
+			molecule.positions *= -1.0
+		grid_point = np.array([index % no_of_grid_points, (index // no_of_grid_points) % no_of_grid_points, index // (no_of_grid_points**2)])
+		molecule.translate((grid_point + 0.5) * grid_cell_lengths)
+		molecule_graphs.append(Graph([(index1 + len(crystal), index2 + len(crystal)) for index1, index2 in molecule_graph.edges]))
+		molecule_graphs[-1].add_nodes_from((node + len(crystal), attributes) for node, attributes in molecule_graph.nodes(data=True))
+		crystal += molecule
+
+	# Fourth, set the unit cell of the crystal.
+	crystal.set_cell(no_of_grid_points * grid_cell_lengths)
+	crystal.set_pbc(True)
+	return crystal, molecule_graphs
+
+# -----------------------------------------------------------------------------------------------------------------------------
+
+def make_acene_core(no_of_rings_in_core):
+	"""
+	This method is designed to make the carbon atoms of an acene (a row of fused benzene rings) in the xy plane, with the rings fused along the x axis.
+
+	Parameters
+	----------
+	no_of_rings_in_core : int
+		This is the number of fused benzene rings.
+
+	Returns
+	-------
+	symbols : list of str.
+		These are the elements of the carbons in the core.
+	positions : list of numpy.array
+		These are the positions of the carbons in the core.
+	bonds : list of (int, int)
+		These are the bonds between the carbons in the core.
+	edge_sites : list of (int, numpy.array)
+		These are the carbons around the edge of the core that a hydrogen or sidechain is attached to, along with the direction (unit vector) that points out from the core from this carbon.
+	"""
+	symbols = []; positions = []; bonds = []; edge_sites = []
+	atom_indices = {}
+	ring_spacing = np.sqrt(3.0) * aromatic_CC_bond_length
+
+	# First, make the six carbons of each ring, sharing the carbons between fused rings.
+	for ring_index in range(no_of_rings_in_core):
+		ring_centre = np.array([ring_index * ring_spacing, 0.0, 0.0])
+		ring_atoms = []
+		for angle in (90.0, 30.0, -30.0, -90.0, -150.0, 150.0):
+			position = ring_centre + aromatic_CC_bond_length*np.array([np.cos(np.radians(angle)), np.sin(np.radians(angle)), 0.0])
+			key = tuple(np.round(position, 4))
+			if key not in atom_indices:
+				atom_indices[key] = len(symbols)
+				symbols.append('C')
+				positions.append(position)
+			ring_atoms.append(atom_indices[key])
+
+		# 1.1: Bond the carbons around this ring.
+		for index1, index2 in zip(ring_atoms, ring_atoms[1:]+ring_atoms[:1]):
+			if (index1, index2) not in bonds and (index2, index1) not in bonds:
+				bonds.append((index1, index2))
+
+	# Second, obtain the carbons around the edge of the core, which are the carbons bonded to only two other carbons.
+	no_of_bonds = [0] * len(symbols)
+	for index1, index2 in bonds:
+		no_of_bonds[index1] += 1
+		no_of_bonds[index2] += 1
+	core_centre = np.mean(positions, axis=0)
+	for index in range(len(symbols)):
+		if no_of_bonds[index] == 2:
+			neighbours = [(index2 if (index1 == index) else index1) for index1, index2 in bonds if (index in (index1, index2))]
+			outward_direction = 2.0*positions[index] - positions[neighbours[0]] - positions[neighbours[1]]
+			edge_sites.append((index, outward_direction/np.linalg.norm(outward_direction)))
+
+	# Third, order the edge sites from the ends of the core inwards, so that sidechains are spread along the core.
+	edge_sites.sort(key=lambda edge_site: -abs(positions[edge_site[0]][0] - core_centre[0]))
+	return symbols, positions, bonds, edge_sites
+
+def choose_sidechain_sites(edge_sites, positions, no_of_sidechains, minimum_distance=4.0):
+	"""
+	This method is designed to choose the edge sites of the core to attach sidechains to, so that the sidechains are at least minimum_distance apart.
+
+	Parameters
+	----------
+	edge_sites : list of (int, numpy.array)
+		These are the carbons around the edge of the core, along with the direction that points out from the core from each carbon.
+	positions : list of numpy.array
+		These are the positions of the atoms in the molecule.
+	no_of_sidechains : int
+		This is the number of sidechains to attach to the core.
+	minimum_distance : float
+		This is the shortest distance (in A) between the first carbons of two sidechains. Default: 4.0.
+
+	Returns
+	-------
+	sidechain_sites : list of int
+		These are the carbons in the core to attach sidechains to.
+	"""
+	sidechain_sites = []
+	for edge_carbon, outward_direction in edge_sites:
+		if len(sidechain_sites) == no_of_sidechains:
+			break
+		first_sidechain_carbon = positions[edge_carbon] + aliphatic_CC_bond_length*outward_direction
+		if all(np.linalg.norm(first_sidechain_carbon - positions[site] - aliphatic_CC_bond_length*direction) >= minimum_distance for site, direction in edge_sites if (site in sidechain_sites)):
+			sidechain_sites.append(edge_carbon)
+	if len(sidechain_sites) < no_of_sidechains:
+		raise Exception('Error: only '+str(len(sidechain_sites))+' sidechains can be placed on this core without overlapping. Use more rings in the core or fewer sidechains. no_of_sidechains = '+str(no_of_sidechains))
+	return sidechain_sites
+
+def add_sidechain(symbols, positions, bonds, edge_carbon, outward_direction, sidechain_length, branch_position, branch_length):
+	"""
+	This method is designed to add a sidechain to a carbon on the edge of the core.
+
+	The backbone of the sidechain zig-zags in the plane of the core, pointing away from the core. If the sidechain is branched, the branch zig-zags out of the plane of the core.
+
+	Parameters
+	----------
+	symbols, positions, bonds : list
+		These are the elements, positions, and bonds of the molecule, which the sidechain is added to.
+	edge_carbon : int
+		This is the carbon in the core to attach the sidechain to.
+	outward_direction : numpy.array
+		This is the direction (unit vector) that points out from the core from edge_carbon.
+	sidechain_length, branch_position, branch_length
+		These describe the sidechain. See make_synthetic_molecule for more information.
+	"""
+
+	# First, obtain the directions to build the backbone of the sidechain along.
+	out_of_plane_direction = np.array([0.0, 0.0, 1.0])
+	zig_zag_direction = np.cross(out_of_plane_direction, outward_direction)
+
+	# Second, add the carbons of the backbone.
+	backbone = add_zig_zag_chain(symbols, positions, bonds, edge_carbon, outward_direction, zig_zag_direction, sidechain_length)
+
+	# Third, add the carbons of the branch, pointing out of the plane of the core.
+	branch = []
+	if (branch_position is not None) and (branch_length > 0):
+		branch_carbon = backbone[branch_position-1]
+		previous_carbon = positions[backbone[branch_position-2]] if (branch_position > 1) else positions[edge_carbon]
+		next_carbon = positions[backbone[branch_position]]
+		bisector = 2.0*positions[branch_carbon] - previous_carbon - next_carbon
+		branch = add_zig_zag_chain(symbols, positions, bonds, branch_carbon, out_of_plane_direction, bisector/np.linalg.norm(bisector), branch_length)
+
+	# Fourth, add the hydrogens to the carbons of the sidechain.
+	for carbon in backbone + branch:
+		add_hydrogens_to_sp3_carbon(symbols, positions, bonds, carbon)
+
+def add_zig_zag_chain(symbols, positions, bonds, start_atom, chain_direction, zig_zag_direction, no_of_carbons):
+	"""
+	This method is designed to add a chain of sp3 carbons to start_atom, which zig-zags along chain_direction with tetrahedral angles between the carbons.
+
+	Parameters
+	----------
+	symbols, positions, bonds : list
+		These are the elements, positions, and bonds of the molecule, which the chain is added to.
+	start_atom : int
+		This is the atom to attach the chain to.
+	chain_direction : numpy.array
+		This is the direction (unit vector) that the chain points along.
+	zig_zag_direction : numpy.array
+		This is the direction (unit vector, perpendicular to chain_direction) that the chain zig-zags along.
+	no_of_carbons : int
+		This is the number of carbons in the chain.
+
+	Returns
+	-------
+	chain : list of int
+		These are the carbons in the chain, starting from the carbon bonded to start_atom.
+	"""
+	along_chain = aliphatic_CC_bond_length * np.sin(tetrahedral_angle/2.0)
+	across_chain = aliphatic_CC_bond_length * np.cos(tetrahedral_angle/2.0)
+	chain = []
+	previous_atom = start_atom
+	for carbon_index in range(1, no_of_carbons+1):
+		position = positions[start_atom] + along_chain*carbon_index*chain_direction + across_chain*(carbon_index % 2)*zig_zag_direction
+		previous_atom = add_atom(symbols, positions, bonds, 'C', position, previous_atom)
+		chain.append(previous_atom)
+	return chain
+
+def add_hydrogens_to_sp3_carbon(symbols, positions, bonds, carbon):
+	"""
+	This method is designed to add hydrogens to an sp3 carbon, so that it has four neighbours in a tetrahedral shape.
+
+	Parameters
+	----------
+	symbols, positions, bonds : list
+		These are the elements, positions, and bonds of the molecule, which the hydrogens are added to.
+	carbon : int
+		This is the carbon to add hydrogens to.
+	"""
+
+	# First, obtain the directions from the carbon to each of its neighbours.
+	neighbours = [(index2 if (index1 == carbon) else index1) for index1, index2 in bonds if (carbon in (index1, index2))]
+	directions = [(positions[neighbour] - positions[carbon])/np.linalg.norm(positions[neighbour] - positions[carbon]) for neighbour in neighbours]
+
+	# Second, obtain the directions of the hydrogens, depending on the number of neighbours this carbon has.
+	if len(directions) == 1:
+		# 2.1: A methyl group, where the three hydrogens are spread around the bond to its neighbour.
+		axis = -directions[0]
+		perpendicular_1 = np.cross(axis, [0.0, 0.0, 1.0]) if (abs(axis[2]) < 0.9) else np.cross(axis, [1.0, 0.0, 0.0])
+		perpendicular_1 /= np.linalg.norm(perpendicular_1)
+		perpendicular_2 = np.cross(axis, perpendicular_1)
+		hydrogen_directions = [-np.cos(tetrahedral_angle)*axis + np.sin(tetrahedral_angle)*(np.cos(angle)*perpendicular_1 + np.sin(angle)*perpendicular_2) for angle in np.radians([0.0, 120.0, 240.0])]
+	elif len(directions) == 2:
+		# 2.2: A CH2 group, where the two hydrogens are either side of the plane of its two neighbours.
+		bisector = -(directions[0] + directions[1])
+		bisector /= np.linalg.norm(bisector)
+		normal = np.cross(directions[0], directions[1])
+		normal /= np.linalg.norm(normal)
+		hydrogen_directions = [np.cos(tetrahedral_angle/2.0)*bisector + sign*np.sin(tetrahedral_angle/2.0)*normal for sign in (1.0, -1.0)]
+	elif len(directions) == 3:
+		# 2.3: A CH group (such as at a branch), where the hydrogen points away from its three neighbours.
+		hydrogen_direction = -(directions[0] + directions[1] + directions[2])
+		hydrogen_directions = [hydrogen_direction/np.linalg.norm(hydrogen_direction)]
+	else:
+		hydrogen_directions = []
+
+	# Third, add the hydrogens.
+	for hydrogen_direction in hydrogen_directions:
+		add_atom(symbols, positions, bonds, 'H', positions[carbon] + CH_bond_length*hydrogen_direction, carbon)
+
+def add_atom(symbols, positions, bonds, symbol, position, bonded_atom):
+	"""
+	This method is designed to add an atom to the molecule, bonded to bonded_atom.
+
+	Parameters
+	----------
+	symbols, positions, bonds : list
+		These are the elements, positions, and bonds of the molecule, which the atom is added to.
+	symbol : str.
+		This is the element of the atom.
+	position : numpy.array
+		This is the position of the atom.
+	bonded_atom : int
+		This is the atom that this atom is bonded to.
+
+	Returns
+	-------
+	index : int
+		This is the index of the new atom.
+	"""
+	index = len(symbols)
+	symbols.append(symbol)
+	positions.append(np.array(position, dtype=float))
+	bonds.append((bonded_atom, index))
+	return index
+
+# -----------------------------------------------------------------------------------------------------------------------------
@@ -0,0 +1,118 @@
+"""
+time_of_obtaining_graph.py, Geoffrey Weal, 17/10/26
+
+This script is designed to compare the time taken to obtain the graph of a crystal with obtain_graph (from SUMELF) and with get_cell_list_graph (bonding_method='cell_list').
+get_cell_list_graph uses a KD-tree if scipy is installed, and the neighbour list of ASE otherwise. The time taken by the neighbour list of ASE is also given for comparison.
+
+Supercells of the example MUPMOC crystal in Documentation/docs/Files/Repair_Crystal are made, so the time taken by each method can be seen as the unit cell gets bigger.
+The bonds given by get_cell_list_graph are checked against the bonds written into the MUPMOC crystal file (which were given by obtain_graph), and against the bonds
+given by obtain_graph for each supercell. If any are different, this script exits with an error.
+
+Running obtain_graph needs SUMELF to be installed. If it is not, obtain_graph is not timed.
+
+Usage: python3 time_of_obtaining_graph.py [no_of_repeats] [largest_supercell]
+"""
+import os, sys, time
+
+from ase.io   import read
+from ase.data import covalent_radii
+
+from memory_of_removing_sidegroups import example_molecules_folderpath
+
+from RSGC.RSGC.RSGC_methods.get_cell_list_graph import get_cell_list_graph, get_bonds_with_neighbour_list
+from RSGC.RSGC.RSGC_methods.get_embedded_graph  import get_embedded_graph
+
+crystal_filepath = os.path.join(example_molecules_folderpath, 'MUPMOC_original.xyz')
+
+def get_bonds(crystal_graph):
+	"""
+	This method will give the bonds in a graph.
+
+	Parameters
+	----------
+	crystal_graph : networkx.Graph
+		This is the graph of the crystal.
+
+	Returns
+	-------
+	bonds : set of (int, int)
+		These are the bonds in the graph, given as (index1, index2) where index1 < index2.
+	"""
+	return set(tuple(sorted((int(index1), int(index2)))) for index1, index2 in crystal_graph.edges)
+
+def time_method(method, no_of_repeats=3):
+	"""
+	This method will give the fastest time taken to run a method over the repeats.
+
+	Parameters
+	----------
+	method : function
+		This is the method to time. It is given no inputs.
+	no_of_repeats : int
+		This is the number of times to run the method. Default: 3.
+
+	Returns
+	-------
+	fastest_time : float
+		This is the fastest time (in seconds) taken to run the method.
+	output : object
+		This is what the method gave the last time it was run.
+	"""
+	fastest_time = float('inf')
+	for _ in range(no_of_repeats):
+		start_time = time.perf_counter()
+		output = method()
+		fastest_time = min(fastest_time, time.perf_counter() - start_time)
+	return fastest_time, output
+
+if __name__ == '__main__':
+
+	# First, obtain the settings for this benchmark.
+	no_of_repeats     = int(sys.argv[1]) if (len(sys.argv) > 1) else 3
+	largest_supercell = int(sys.argv[2]) if (len(sys.argv) > 2) else 3
+
+	# Second, check that get_cell_list_graph gives the same bonds as those written into the MUPMOC crystal file.
+	crystal = read(crystal_filepath)
+	differences = []
+	if get_bonds(get_cell_list_graph(crystal)) != get_bonds(get_embedded_graph(crystal)):
+		differences.append('MUPMOC_original.xyz: the bonds given by get_cell_list_graph are different to those written into the crystal file')
+
+	# Third, determine if obtain_graph can be used.
+	try:
+		from SUMELF import obtain_graph
+	except ImportError as exception_message:
+		obtain_graph = None
+		print('Only timing get_cell_list_graph, as SUMELF is not installed: '+str(exception_message).strip().splitlines()[0])
+
+	# Fourth, time each method for each supercell of the MUPMOC crystal.
+	for supercell_size in range(1, largest_supercell+1):
+
+		# 4.1: Make the supercell. The graph written into the crystal file does not belong to the supercell, so it is removed.
+		supercell = crystal.repeat(supercell_size)
+		for array_name in [array_name for array_name in supercell.arrays.keys() if (array_name not in ['numbers', 'positions'])]:
+			del supercell.arrays[array_name]
+		supercell.info.pop('BondProperties', None)
+
+		# 4.2: Time get_cell_list_graph.
+		cell_list_time, cell_list_graph = time_method(lambda: get_cell_list_graph(supercell), no_of_repeats=no_of_repeats)
+		print('{}x{}x{} supercell ({} atoms, {} bonds):'.format(supercell_size, supercell_size, supercell_size, len(supercell), cell_list_graph.number_of_edges()))
+		print('    {:25s} {:10.2f} ms'.format('get_cell_list_graph', cell_list_time*1000.0))
+
+		# 4.3: Time the neighbour list of ASE, which get_cell_list_graph uses if scipy is not installed, and check it gives the same bonds.
+		cutoffs = 1.2 * covalent_radii[supercell.get_atomic_numbers()]
+		neighbour_list_time, neighbour_list_bonds = time_method(lambda: get_bonds_with_neighbour_list(supercell, cutoffs), no_of_repeats=no_of_repeats)
+		print('    {:25s} {:10.2f} ms'.format('ASE neighbour list', neighbour_list_time*1000.0))
+		if set(neighbour_list_bonds) != get_bonds(cell_list_graph):
+			differences.append(f'{supercell_size}x{supercell_size}x{supercell_size} supercell: the bonds given by get_cell_list_graph are different to those given by the neighbour list of ASE')
+
+		# 4.4: Time obtain_graph, and check it gives the same bonds as get_cell_list_graph.
+		if obtain_graph is not None:
+			obtain_graph_time, (_, obtain_graph_graph) = time_method(lambda: obtain_graph(supercell.copy(), name='crystal'), no_of_repeats=no_of_repeats)
+			print('    {:25s} {:10.2f} ms ({:.1f}x slower than get_cell_list_graph)'.format('obtain_graph', obtain_graph_time*1000.0, obtain_graph_time/cell_list_time))
+			if get_bonds(cell_list_graph) != get_bonds(obtain_graph_graph):
+				differences.append(f'{supercell_size}x{supercell_size}x{supercell_size} supercell: the bonds given by get_cell_list_graph are different to those given by obtain_graph')
+
+	# Fifth, check that the bonds given by each method were the same.
+	if len(differences) > 0:
+		sys.exit('Error: '+'\n'.join(differences))
+	print('get_cell_list_graph gives the same bonds as '+('obtain_graph.' if (obtain_graph is not None) else 'those written into the MUPMOC crystal file.'))
@@ -0,0 +1,128 @@
+"""
+time_of_removing_sidegroups.py, Geoffrey Weal, 17/10/26
+
+This script is designed to measure the time taken by each stage of the RSGC program, for synthetic molecules and crystals made by synthetic_alkylated_crystals.py.
+
+This measures:
+	* the time taken by each stage of remove_aliphatic_sidegroups (such as get_list_of_rings and determine_atoms_between_moieties_to_keep) for a range of synthetic molecules, and
+	* the time taken by each stage of the full RSGC program (such as reading the crystal, obtain_graph, process_crystal, and make_crystal) for a synthetic crystal.
+
+The minimum time over the repeats is given for each stage, as this is the least affected by other programs running on the computer.
+Running the full RSGC program needs all the programs the RSGC program uses (such as SUMELF) to be installed. If they are not, this part is skipped.
+
+Usage: python3 time_of_removing_sidegroups.py [no_of_repeats]
+"""
+import os, sys, json, tempfile
+
+from synthetic_alkylated_crystals import make_synthetic_molecule, make_synthetic_crystal
+
+from RSGC.RSGC.remove_sidechains_methods.remove_aliphatic_sidegroups import remove_aliphatic_sidegroups
+from RSGC.RSGC.RSGC_methods.Stage_Timer                             import Stage_Timer, set_active_stage_timer
+
+# These are the synthetic molecules to time, given as the settings to give to make_synthetic_molecule.
+synthetic_molecules = {'anthracene, 2 x n-octyl': {'no_of_rings_in_core': 3, 'no_of_sidechains': 2, 'sidechain_type': 'n-octyl'}, 'anthracene, 2 x 2-ethylhexyl': {'no_of_rings_in_core': 3, 'no_of_sidechains': 2, 'sidechain_type': '2-ethylhexyl'}, 'hexacene, 4 x 2-hexyldecyl': {'no_of_rings_in_core': 6, 'no_of_sidechains': 4, 'sidechain_type': '2-hexyldecyl'}, 'dodecacene, 8 x 2-octyldodecyl': {'no_of_rings_in_core': 12, 'no_of_sidechains': 8, 'sidechain_type': '2-octyldodecyl'}}
+
+def time_removing_sidegroups(molecule, molecule_graph, no_of_repeats=5, leave_as_ethyls=False):
+	"""
+	This method is designed to measure the time taken by each stage of remove_aliphatic_sidegroups for a molecule.
+
+	Parameters
+	----------
+	molecule : ase.Atoms
+		This is the molecule.
+	molecule_graph : networkx.Graph
+		This is the graph of this molecule.
+	no_of_repeats : int
+		This is the number of times to remove the sidegroups from the molecule. Default: 5.
+	leave_as_ethyls : bool.
+		If False, all sidegroups will be left as methyl. If true, they will be given as ethyl. Default: False.
+
+	Returns
+	-------
+	stage_times : dict. of floats
+		These are the minimum times (in seconds) taken by each stage over the repeats. The time taken by all of remove_aliphatic_sidegroups is given as 'total'.
+	counts : dict. of ints
+		These are the counts recorded while removing the sidegroups (such as 'rings' and 'ring_paths_explored').
+	"""
+	stage_times = {}
+	for _ in range(no_of_repeats):
+
+		# First, remove the sidegroups from the molecule, recording the time taken by each stage.
+		stage_timer = Stage_Timer()
+		previous_stage_timer = set_active_stage_timer(stage_timer)
+		try:
+			with stage_timer.stage('total'):
+				remove_aliphatic_sidegroups(molecule, molecule_graph, 'benchmark', leave_as_ethyls=leave_as_ethyls)
+		finally:
+			set_active_stage_timer(previous_stage_timer)
+
+		# Second, record the fastest time for each stage.
+		for stage_name, stage in stage_timer.stages.items():
+			stage_times[stage_name] = min(stage_times.get(stage_name, float('inf')), stage['time'])
+
+	return stage_times, stage_timer.counts
+
+def time_RSGC(crystal, no_of_repeats=1):
+	"""
+	This method is designed to measure the time taken by each stage of the full RSGC program for a crystal.
+
+	Parameters
+	----------
+	crystal : ase.Atoms
+		This is the crystal.
+	no_of_repeats : int
+		This is the number of times to run the RSGC program on the crystal. Default: 1.
+
+	Returns
+	-------
+	stage_times : dict. of floats
+		These are the minimum times (in seconds) taken by each stage over the repeats. The time taken by all of the RSGC program is given as 'total'.
+	"""
+	from ase.io import write
+	from RSGC   import RSGC
+	stage_times = {}
+	with tempfile.TemporaryDirectory() as temporary_folderpath:
+		crystal_filepath = os.path.join(temporary_folderpath, 'synthetic_crystal.xyz')
+		write(crystal_filepath, crystal)
+		for _ in range(no_of_repeats):
+			RSGC(crystal_filepath, save_crystal_folderpath=os.path.join(temporary_folderpath, 'crystals'), save_molecules_individually=True, problematic_molecules_policy='fail', stage_times_folderpath=temporary_folderpath)
+			with open(os.path.join(temporary_folderpath, 'synthetic_crystal_stage_times.json')) as stage_times_file:
+				report = json.load(stage_times_file)
+			stage_times['total'] = min(stage_times.get('total', float('inf')), report['total_time'])
+			for stage_name, stage in report['stages'].items():
+				stage_times[stage_name] = min(stage_times.get(stage_name, float('inf')), stage['time'])
+	return stage_times
+
+def print_stage_times(stage_times):
+	"""
+	This method will print the time taken by each stage, from the slowest to the fastest.
+
+	Parameters
+	----------
+	stage_times : dict. of floats
+		These are the times (in seconds) taken by each stage.
+	"""
+	for stage_name, stage_time in sorted(stage_times.items(), key=lambda item: -item[1]):
+		print('    {:45s} {:10.2f} ms'.format(stage_name, stage_time*1000.0))
+
+if __name__ == '__main__':
+
+	# First, obtain the settings for this benchmark.
+	no_of_repeats = int(sys.argv[1]) if (len(sys.argv) > 1) else 5
+
+	# Second, time each stage of remove_aliphatic_sidegroups for each synthetic molecule.
+	for name, settings in synthetic_molecules.items():
+		molecule, molecule_graph = make_synthetic_molecule(**settings)
+		stage_times, counts = time_removing_sidegroups(molecule, molecule_graph, no_of_repeats=no_of_repeats)
+		print(f'{name} ({len(molecule)} atoms, {counts.get("rings", 0)} rings, {counts.get("ring_paths_explored", 0)} ring paths explored, {counts.get("atoms_removed", 0)} atoms removed):')
+		print_stage_times(stage_times)
+
+	# Third, time each stage of the full RSGC program for a synthetic crystal.
+	crystal, _ = make_synthetic_crystal(no_of_rings_in_core=6, no_of_sidechains=4, sidechain_type='2-ethylhexyl', Z_prime=2, no_of_symmetric_copies=2)
+	try:
+		stage_times = time_RSGC(crystal, no_of_repeats=max(1, no_of_repeats//5))
+	except ImportError as exception_message:
+		print('Skipping the full RSGC program, as the programs it needs are not installed: '+str(exception_message).strip().splitlines()[0])
+	else:
+		print(f'Full RSGC program on a synthetic crystal ({len(crystal)} atoms, Z\'=2):')
+		print_stage_times(stage_times)
@@ -101,8 +101,9 @@ if os.path.exists('Rings_with_hydrogens_in_them.txt'):
 # 13.1: Obtain the total number of crystal you want to process with the RSGC program. 
 total_no_of_crystals = str(len(filepath_names))
 
-# 13.2: Set a counter to record successful RSGC executions.
+# 13.2: Set a counter to record successful RSGC executions, and a list to record the issues found.
 successful = 0
+issues = []
 
 # 13.3: For each crystal in the filepath_names list. 
 for counter, filepath in enumerate(filepath_names, start=0):
@@ -121,11 +122,15 @@ for counter, filepath in enumerate(filepath_names, start=0):
 
     except Hydrogen_in_Ring_Exception as exception_message:
 
-        # 13.5.3: If there was an issue with the RSGC program, write the issue in the 'RSGC_issues.txt' file
-        with open('RSGC_issues.txt','a+') as issuesTXT:
-            issuesTXT.write(filepath+': '+str(exception_message)+'\n')
+        # 13.5.3: If there was an issue with the RSGC program, record the issue.
+        issues.append(filepath+': '+str(exception_message)+'\n')
 
-# 13.6: Report the number of successful executions.
+# 13.6: Write all the issues found into the 'RSGC_issues.txt' file at once.
+if len(issues) > 0:
+    with open('RSGC_issues.txt','w') as issuesTXT:
+        issuesTXT.write(''.join(issues))
+
+# 13.7: Report the number of successful executions.
 print('========================')
 print('Number of successfuls: '+str(successful))
 
@@ -0,0 +1,8 @@
+"""
+Problematic_Molecules_Exception.py, Geoffrey Weal, 17/10/26
+
+This exception is raised when a crystal contains problematic molecules (such as molecules with no atoms in them), and the crystal is to be skipped.
+"""
+
+class Problematic_Molecules_Exception(Exception):
+	pass
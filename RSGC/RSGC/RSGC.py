@@ -3,26 +3,18 @@ remove_sidechains.py, Geoffrey Weal, 20/5/2022
 
 This program will remove aliphatic sidechains from the main molecule.
 """
-import os
-import traceback
-import numpy as np
-from copy import deepcopy
+import os, shutil
 
-from tqdm import tqdm
+from SUMELF import make_folder
 
-from ase import Atoms
-from ase.io import read, write
-from ase.visualize import view
+from RSGC.RSGC.RSGC_methods.remove_sidegroups_from_crystal import remove_sidegroups_from_crystal
+from RSGC.RSGC.RSGC_methods.save_molecules                 import save_molecules
+from RSGC.RSGC.RSGC_methods.Result_Cache                   import Result_Cache
+from RSGC.RSGC.RSGC_methods.Stage_Timer                    import record_stage_times, time_stage
+from RSGC.RSGC.RSGC_methods.Diagnostics_Sink               import record_diagnostics
+from RSGC                                                  import __version__
 
-from SUMELF import get_distance
-from SUMELF import obtain_graph, process_crystal
-from SUMELF import make_crystal
-from SUMELF import remove_folder, make_folder
-
-from RSGC.RSGC.remove_sidechains_methods.remove_aliphatic_sidegroups import remove_aliphatic_sidegroups
-from SUMELF                                                          import add_graph_to_ASE_Atoms_object
-
-def RSGC(filepath, save_crystal_folderpath='crystals_with_sidechains_removed', make_molecule_method='component_assembly_approach', leave_as_ethyls=False, save_molecules_individually=False, wrap=False, debug=False):
+def RSGC(filepath, save_crystal_folderpath='crystals_with_sidechains_removed', make_molecule_method='component_assembly_approach', leave_as_ethyls=False, add_hydrogens_to_alpha_carbons=False, save_molecules_individually=False, wrap=False, no_of_cpus=1, process_equivalent_molecules_once=False, sidegroup_roles_memo_filepath=None, problematic_molecules_policy='interactive', quarantine_folderpath=None, cache_folderpath=None, cache_max_size_MB=1000.0, output_database_filepath=None, stage_times_folderpath=None, record_stage_memory=False, low_memory=False, diagnostics_folderpath=None, use_embedded_graph=False, check_embedded_graph=False, bonding_method='obtain_graph', debug=False):
 	"""
 	This method is designed to to remove aliphatic sidechains from your molecules in the crystal file.
 
@@ -36,10 +28,42 @@ def RSGC(filepath, save_crystal_folderpath='crystals_with_sidechains_removed', m
 		This is the name of the method you want to use to create the molecule. See https://github.com/geoffreyweal/ECCP for more information. Default: 'component_assembly_approach'. 
 	leave_as_ethyls : bool.
 		If False, all sidegroups will be left as methyl. If true, they will be given as ethyl (to their beta carbon). 
+	add_hydrogens_to_alpha_carbons : bool.
+		If True, add any missing hydrogens to the sp3 carbons at the end of the sidegroups that have been shortened, so that these carbons have four neighbours. Default: False.
 	save_molecules_individually : bool.
 		This tag indicates if you also want to save the molecules in the crystal individual. Default: False. 
 	wrap : bool.
 		If true, wrap the molecule in the unit cell. If false, keep the molecule in its connected form.
+	no_of_cpus : int.
+		This is the number of processes to remove sidegroups from the molecules of this crystal with. This is useful for crystals with many molecules in them. Default: 1.
+	process_equivalent_molecules_once : bool.
+		If True, molecules in the crystal that are equivalent to each other (such as symmetric copies of the same molecule) are only fully processed once, and the result is reused for the other equivalent molecules. Default: False.
+	sidegroup_roles_memo_filepath : str. or None
+		This is the path to a sqlite database file that records the sidegroup roles of molecules, so that they can be reused for the same molecule in other crystals. If None, no memo is used. Default: None.
+	problematic_molecules_policy : str.
+		This is what to do if a molecule in the crystal has no atoms in it, either 'interactive', 'skip_molecule', 'skip_crystal', or 'fail'. See check_molecules for more information. Default: 'interactive'.
+	quarantine_folderpath : str. or None
+		This is the path to the folder to save problematic molecules into, along with the reason they are problematic. If None, problematic molecules are not saved. Default: None.
+	cache_folderpath : str. or None
+		This is the path to the folder to cache the files made by the RSGC program in. If this crystal file has already been processed with the same settings, the files are restored from this cache rather than processing the crystal again. If None, no cache is used. Default: None.
+	cache_max_size_MB : float or None
+		This is the largest size (in MB) that the cache can be. The least recently used crystals are removed from the cache when it gets bigger than this. If None, the cache has no size limit. Default: 1000.0.
+	output_database_filepath : str. or None
+		This is the path to an ASE database file to save the crystal (and its molecules if save_molecules_individually is True) into, rather than saving them as xyz files in save_crystal_folderpath. See RSGC_Database for more information. If None, xyz files are saved. Default: None.
+	stage_times_folderpath : str. or None
+		This is the path to the folder to save the time taken by each stage of the RSGC program (and counts such as the number of rings found) for this crystal into, as "<crystal_name>_stage_times.json". See Stage_Timer for more information. If None, stage times are not recorded. Default: None.
+	record_stage_memory : bool.
+		If True, also record the peak memory (the peak resident set size and the peak memory allocated by python) used by each stage in the stage times. This makes the RSGC program slower. Only used if stage_times_folderpath is given. Default: False.
+	low_memory : bool.
+		If True, use less memory by releasing the original crystal and molecules as soon as they are no longer needed, and by saving each molecule (if save_molecules_individually is True) as soon as it has been made. This is useful for very large crystals. Molecules are still kept until the end if output_database_filepath is given. Default: False.
+	diagnostics_folderpath : str. or None
+		This is the path to the folder to record diagnostics in, such as rings that contain hydrogens ("Rings_with_hydrogens_in_them.txt" and "RSGC_diagnostics.jsonl"). The diagnostics of this crystal are added to these files together at the end, so several RSGC programs can be run at the same time in the same folder. See Diagnostics_Sink for more information. If None, diagnostics are recorded in the current working directory. Default: None.
+	use_embedded_graph : bool.
+		If True and the crystal file already contains the graph of the crystal (the "NeighboursList" array and "BondProperties", as written by add_graph_to_ASE_Atoms_object in ReCrystals, ACSD, and the RSGC program), the graph is obtained from the crystal file rather than working out the bonds in the crystal again with obtain_graph. If the crystal file does not contain its graph, obtain_graph is used. See get_embedded_graph for more information. Default: False.
+	check_embedded_graph : bool.
+		If True, check that some of the bonds (chosen at random) in the graph given in the crystal file are not much longer than a covalent bond before using it. Only used if use_embedded_graph is True. Default: False.
+	bonding_method : str.
+		This is the method used to obtain the graph of the crystal, either 'obtain_graph' (from SUMELF) or 'cell_list', which finds the bonds between atoms closer than 1.2 times the sum of their covalent radii using a KD-tree (if scipy is installed) or the cell list of ASE. 'cell_list' is faster for large unit cells, but only gives the element of each atom in the graph. See get_cell_list_graph for more information. Default: 'obtain_graph'.
 	debug : bool.
 		This tag indicates if the user wants debugging information and files to be provided by this program.
 	"""
@@ -54,265 +78,93 @@ def RSGC(filepath, save_crystal_folderpath='crystals_with_sidechains_removed', m
 	print(divide_string)
 	filepath_without_ext = '.'.join(filepath.split('.')[:-1])
 	filename = os.path.basename(filepath)
-
-	if filepath.endswith('.cif'):
-		crystal = read(filepath) #,disorder_groups='remove_disorder')
-	else:
-		crystal = read(filepath)
-	crystal.set_pbc(True)
-
-	# Second, get the graph of the crystal.
-	crystal, crystal_graph = obtain_graph(crystal,name='crystal')
-
-	# Third, get the molecules and the graphs associated with each molecule in the crystal.
-	molecules, molecule_graphs, SolventsList, symmetry_operations, cell = process_crystal(crystal,crystal_graph=crystal_graph,take_shortest_distance=True,return_list=False,logger=None)
-	
-	# Fourth, determine the solvents in the crystal
-	solvent_components = list(make_SolventsList(crystal.info['SolventsList'])) if ('SolventsList' in crystal.info) else []
-
-	# Fifth, check to make sure the molecules are all good.
-	molecules, molecule_graphs, solvent_components = check_molecules(molecules, molecule_graphs, solvent_components)
-
-	# Sixth, initialise the dictionary and lists to store updated information on.
-	updated_molecules       = {}
-	updated_molecule_graphs = {}
-
-	# Seventh, remove the aliphatic sidegroup from molecules that are not solvents. Also get the list of molecules that are solvents. 
-	print('Removing aliphatic sidechains from non-solvent molecules.')
-	pbar = tqdm(sorted(molecules.keys()), unit='molecules')
-	for molecule_name in pbar:
-
-		# 7.1: Obtain the molecule and its associated graph.
-		molecule       = molecules[molecule_name].copy()
-		molecule_graph = deepcopy(molecule_graphs[molecule_name])
-
-		# 7.2: Do not process molecule if it is a solvent. 
-		#      * Keep in updated_molecules, but leave unchanged.
-		if molecule_name in solvent_components:
-			updated_molecules[molecule_name]       = molecule
-			updated_molecule_graphs[molecule_name] = molecule_graph
-			continue
-
-		# 7.3: Remove the aliphatic sidechains from this molecule. 
-		updated_molecule, updated_molecule_graph = remove_aliphatic_sidegroups(molecule, molecule_graph, filepath, leave_as_ethyls=leave_as_ethyls)
-
-		# 7.4: Update the molecules and molecule_graphs with updated_molecule and updated_molecule_graph for molecule_name
-		updated_molecules[molecule_name]       = updated_molecule
-		updated_molecule_graphs[molecule_name] = updated_molecule_graph
-
-	# Eighth, check to make sure the updated molecules are all good.
-	updated_molecules, updated_molecule_graphs, solvent_components = check_molecules(updated_molecules, updated_molecule_graphs, solvent_components, original_molecules=molecules)
-
-	# Ninth, create the crystal without aliphatic sidechains.
-	new_crystal, new_crystal_graph = make_crystal(updated_molecules, symmetry_operations=symmetry_operations, cell=cell, wrap=False, solvent_components=solvent_components, remove_solvent=False, molecule_graphs=updated_molecule_graphs)
-
-	# Tenth, check that no more atoms were added to the crystal, as only atoms should have been removed (and hydrogens added in their place)
-	if len(new_crystal) > len(crystal):
-		raise Exception('Error: The crystal contains more atoms after sidechains were removed than the original crystal. This should happen. Check your crystal file.')
-
-	# Eleventh, wrap the atoms in the crystal so that all atoms are found inside the unit cell.
-	if wrap:
-		new_crystal.wrap()
-
-	# Twelfth, add the node and edge properties of the crystal from the crystal_graph into the crystal ASE object itself. 
-	add_graph_to_ASE_Atoms_object(new_crystal, new_crystal_graph)
-
-	# Thirteenth, make the folder to place the editted crystal in if it doesnt currently exist.
-	make_folder(save_crystal_folderpath)
-
-	# Fourteenth, save the edited crystal file that excludes aliphatic sidechains from the crystal.
 	crystal_name = filepath_without_ext.split('/')[-1]
-	write(save_crystal_folderpath+'/'+crystal_name+'_with_sidechains_removed.xyz', new_crystal)
 
-	# Fifteenth, if save_molecules_individually is set to True, save the individual molecules
-	if save_molecules_individually:
-
-		# 15.1: Add the node and edge information from the molecules graph back to the molecule
-		for molecule_name in updated_molecules.keys():
-			add_graph_to_ASE_Atoms_object(updated_molecules[molecule_name], updated_molecule_graphs[molecule_name])
-
-		# 15.2: Create the folder to store molecule xyz data to.
-		make_folder(save_crystal_folderpath+'_molecules'+'/'+crystal_name)
-
-		# 15.3: Save each molecule from the crystal to disk
-		for molecule_name, updated_molecule in updated_molecules.items():
-			solvent_tag = 'S' if molecule_name in solvent_components else ''
-			write(save_crystal_folderpath+'_molecules'+'/'+crystal_name+'/'+str(molecule_name)+str(solvent_tag)+'.xyz', updated_molecule)
-
-	print(divide_string)
+	# Preliminary Step: if stage_times_folderpath is given, record the time taken by each stage of the RSGC program for this crystal.
+	#                   * The diagnostics found for this crystal are also recorded, and written into diagnostics_folderpath at the end.
+	stage_times_filepath = None if (stage_times_folderpath is None) else (stage_times_folderpath+'/'+crystal_name+'_stage_times.json')
+	with record_stage_times(stage_times_filepath, filepath, record_memory=record_stage_memory), record_diagnostics(diagnostics_folderpath):
+
+		# Preliminary Step: the cache stores xyz files, so it can not be used when saving into a database.
+		if (cache_folderpath is not None) and (output_database_filepath is not None):
+			raise Exception('Error: cache_folderpath can not be used together with output_database_filepath. cache_folderpath = '+str(cache_folderpath)+', output_database_filepath = '+str(output_database_filepath))
+
+		# Preliminary Step: if this crystal has already been processed with the same settings, restore the files from the cache rather than processing the crystal again.
+		if cache_folderpath is not None:
+			result_cache = Result_Cache(cache_folderpath, max_size_MB=cache_max_size_MB)
+			cache_settings = {'make_molecule_method': make_molecule_method, 'leave_as_ethyls': leave_as_ethyls, 'add_hydrogens_to_alpha_carbons': add_hydrogens_to_alpha_carbons, 'save_molecules_individually': save_molecules_individually, 'wrap': wrap, 'problematic_molecules_policy': problematic_molecules_policy, 'use_embedded_graph': use_embedded_graph, 'check_embedded_graph': check_embedded_graph, 'bonding_method': bonding_method}
+			cache_key = result_cache.get_key(filepath, cache_settings, __version__)
+			with time_stage('restore_from_cache'):
+				restored_from_cache = result_cache.restore(cache_key, save_crystal_folderpath, crystal_name)
+			if restored_from_cache:
+				print('Restored from cache: '+str(filepath))
+				print(divide_string)
+				return
+
+		# First, read the crystal.
+		#        * ase.io is only imported here as it takes a long time to import, so that importing the RSGC program is fast.
+		from ase.io import read, write
+		with time_stage('read'):
+			if filepath.endswith('.cif'):
+				crystal = read(filepath) #,disorder_groups='remove_disorder')
+			else:
+				crystal = read(filepath)
+
+		# Second, if using less memory, each molecule is saved as soon as it has been made, so make the folder to save the molecules in.
+		molecules_folderpath = save_crystal_folderpath+'_molecules'+'/'+crystal_name
+		save_molecules_as_made = low_memory and save_molecules_individually and (output_database_filepath is None)
+		if save_molecules_as_made:
+			make_folder(molecules_folderpath)
+
+		# Third, remove the aliphatic sidegroups from the molecules in the crystal.
+		#        * The crystal is handed over inside a list, so that remove_sidegroups_from_crystal holds the only reference to it and can release it (if low_memory is True) once it is no longer needed.
+		#        * If molecules were being saved as they were made but an issue stopped the RSGC program, the molecules saved for this crystal are removed.
+		crystal_holder = [crystal]
+		del crystal
+		try:
+			new_crystal, updated_molecules, updated_molecule_graphs, solvent_components = remove_sidegroups_from_crystal(crystal_holder, filepath, leave_as_ethyls=leave_as_ethyls, add_hydrogens_to_alpha_carbons=add_hydrogens_to_alpha_carbons, wrap=wrap, no_of_cpus=no_of_cpus, process_equivalent_molecules_once=process_equivalent_molecules_once, sidegroup_roles_memo_filepath=sidegroup_roles_memo_filepath, problematic_molecules_policy=problematic_molecules_policy, quarantine_folderpath=quarantine_folderpath, low_memory=low_memory, molecules_folderpath=(molecules_folderpath if save_molecules_as_made else None), use_embedded_graph=use_embedded_graph, check_embedded_graph=check_embedded_graph, bonding_method=bonding_method)
+		except BaseException:
+			if save_molecules_as_made and os.path.exists(molecules_folderpath):
+				shutil.rmtree(molecules_folderpath)
+			raise
+
+		# Fourth, if output_database_filepath is given, save the crystal (and its molecules) into the database rather than as xyz files.
+		if output_database_filepath is not None:
+			from RSGC.RSGC.RSGC_methods.RSGC_Database import RSGC_Database
+			with time_stage('save_to_database'):
+				RSGC_Database(output_database_filepath).save(crystal_name, new_crystal, updated_molecules=(updated_molecules if save_molecules_individually else None), updated_molecule_graphs=updated_molecule_graphs, solvent_components=solvent_components)
+			print(divide_string)
+			return
+
+		# Fifth, if using less memory, the molecules have already been saved, so they are released before the crystal is saved.
+		if save_molecules_as_made:
+			molecule_filepaths = [molecules_folderpath+'/'+str(molecule_name)+('S' if (molecule_name in solvent_components) else '')+'.xyz' for molecule_name in updated_molecules.keys()]
+		if low_memory:
+			del updated_molecules, updated_molecule_graphs
+
+		# Sixth, make the folder to place the editted crystal in if it doesnt currently exist.
+		make_folder(save_crystal_folderpath)
+
+		# Seventh, save the edited crystal file that excludes aliphatic sidechains from the crystal.
+		#         * Any file already there is removed first, as it may be hard-linked to a file in the cache.
+		crystal_filepath = save_crystal_folderpath+'/'+crystal_name+'_with_sidechains_removed.xyz'
+		if os.path.lexists(crystal_filepath):
+			os.remove(crystal_filepath)
+		with time_stage('write'):
+			write(crystal_filepath, new_crystal)
+
+		# Eighth, if save_molecules_individually is set to True, save the individual molecules (unless they have already been saved as they were made).
+		if not save_molecules_as_made:
+			molecule_filepaths = []
+			if save_molecules_individually:
+				with time_stage('save_molecules'):
+					molecule_filepaths = save_molecules(updated_molecules, updated_molecule_graphs, solvent_components, molecules_folderpath)
+
+		# Ninth, save the files made for this crystal into the cache.
+		if cache_folderpath is not None:
+			with time_stage('save_to_cache'):
+				result_cache.save(cache_key, crystal_filepath, molecule_filepaths)
+
+		print(divide_string)
 
 # -----------------------------------------------------------------------------------------------------------------------------
-
-def check_molecules(molecules, molecule_graphs, solvent_components, original_molecules=None):
-	"""
-	This method is designed to check the molecules are all good.
-
-	Parameters
-	----------
-	molecules : dict. of ase.Atoms
-		This is the dict. of molecules in the crystal
-	molecule_graphs : dict. of networkx.Graph 
-		This is the dict that contains the graph of each molecule in the molecules dictionary. 
-	solvent_components : list of int.
-		This list contains the indices of all the solvents in the molecules list. 
-	original_molecules : dict. of ase.Atoms or None
-		These are the dict. of molecules that was obtained from the original molecules before removing aliphatic sidechains. If set to None, molecules are molecules from the unmodified crystal. Default: None.
-	"""
-
-	# First, record all the molecules that have problems with them.
-	problematic_molecule_names = []
-
-	# Second, for each molecule in the molecules dictionary.
-	for mol_name, molecule in molecules.items():
-
-		# Third, if their are no atoms in the molecule, record it as a problem.
-		if len(molecule) == 0:
-			problematic_molecule_names.append(mol_name)
-
-	# Fourth, sort the problematic_molecule_names list
-	problematic_molecule_names.sort()
-
-	# Fifth, report the issue to the user if there are problematic molecules, and ask the user if they want to continue otherwise. 
-	if len(problematic_molecule_names) > 0:
-
-		# 5.1: Print error message.
-		traceback_stack = traceback.extract_stack()
-		print('Error: These is an issue at:')
-		for trace in traceback_stack:
-			print(f'  {trace.filename}, line {trace.lineno} in {trace.name}')#: {trace.line}')
-		print('Molecules '+str([prob_mol_name for prob_mol_name in problematic_molecule_names])+' in the crystal have no atoms in it?')
-		print("Look at the GUI's to see the problem")
-		print('One or more GUIs show all the problematic molecules before and after the RSGC has been applied to it')
-		print('The other GUI shows all the OK molecules')
-
-		# 5.2: For each problematic molecule
-		for problematic_molecule_name in problematic_molecule_names:
-
-			# 5.2.1: Create a list that contains the problematic molecule.
-			problem_molecule = [molecules[problematic_molecule_name]]
-
-			# 5.2.2: If original_molecules is not none, add the original molecule to the list to compare molecule with.
-			if original_molecules is not None:
-				problem_molecule.append(original_molecules[problematic_molecule_name])
-
-			# 5.2.3: Open the GUI to allow the user to see the problematic molecule (and its original version if given).
-			view(problem_molecule)
-
-		# 5.3: Show all the ok molecules
-		view([molecules[prob_mol_name] for prob_mol_name in molecules.keys() if (prob_mol_name not in problematic_molecule_names)])
-
-		# 5.4: Check with the user if they want to continue anyway.
-		while True:
-			to_continue = input('Would you like to continue without these problematic molecules in the crystal? (y/N): ')
-			to_continue = to_continue.lower()
-			if to_continue in ['y', 'yes']:
-				break
-			elif to_continue in ['n', 'no']:
-				exit('Program will exit without completing.')
-			print('Please type either yes (y) or no (n).')
-
-		# 5.5: Mark the problematic molecules as None objects. 
-		for prob_mol_name in problematic_molecule_names:
-			molecules[prob_mol_name] = None
-			molecule_graphs[prob_mol_name] = None
-
-		# 5.6: Update molecules, molecule_graphs, and solvent_components to remove molecules with no atoms
-		molecules, molecule_graphs, solvent_components = remove_None_placeholders(molecules, molecule_graphs, solvent_components)
-
-	# Sixth, return the molecules and molecule_graphs objects
-	return molecules, molecule_graphs, solvent_components
-
-def remove_None_placeholders(molecules, molecule_graphs, solvent_components):
-	"""
-	This method is designed to remove any None objects from the molecules, molecule_graphs, and solvent_components dictionaries and lists.
-
-	Parameters
-	----------
-	molecules : dict. of ase.Atoms
-		This is the dict. of molecules in the crystal
-	molecule_graphs : dict. of networkx.Graph 
-		This is the dict that contains the graph of each molecule in the molecules dictionary. 
-	solvent_components : list of int.
-		This list contains the indices of all the solvents in the molecules list. 
-
-	Returns
-	-------
-	molecules : dict. of ase.Atoms
-		This is the dict. of molecules in the crystal
-	molecule_graphs : dict. of networkx.Graph 
-		This is the dict that contains the graph of each molecule in the molecules dictionary. 
-	solvent_components : list of int.
-		This list contains the indices of all the solvents in the molecules list. 
-	"""
-
-	# First, check if there are any None objects in the molecules list.
-	None_object_names = []
-	for mol_name in sorted(molecules.keys(), reverse=False):
-		if molecules[mol_name] is None:
-			None_object_names.append(mol_name)
-
-	# Second, if there are values in None_object_names, there are None objects to remove, so do that
-	if len(None_object_names) > 0:
-
-		# 2.1: Remove all None objects from molecules and molecule_graphs, and their respective indices from solvent_components
-		for None_object_name in None_object_names:
-			del molecules[None_object_name]
-			del molecule_graphs[None_object_name]
-			if None_object_name in solvent_components:
-				solvent_components.remove(None_object_name)
-
-		# 2.2: Place all remaining molecules and molecule_graphs objects together, as well as a boolean to indicate if it is a solvent.
-		all_data = []
-		for mol_name in sorted(molecules.keys(), reverse=False):
-			molecule       = molecules[mol_name]
-			molecule_graph = molecule_graphs[mol_name]
-			is_solvent = mol_name in solvent_components
-			all_data.append([mol_name, molecule, molecule_graph, is_solvent])
-
-		# 2.3: Sort all_data by the mol_name.
-		all_data.sort(key=lambda x:x[0], reverse=False)
-
-		# 2.4: Decrement molecules by the approproriate amount
-		for index, (old_mol_name, molecule, molecule_graph, is_solvent) in enumerate(all_data):
-
-			# 2.4.1: Write the new name for this molecule.
-			new_mol_name = index + 1
-
-			# 2.4.2: Change the old_mol_name to new_mol_name for this datum set. 
-			all_data[index][0] = new_mol_name
-
-		# 2.4: Check that none of the molecules in all_data have the same name.
-		if not len(all_data) == len(set([mol_name for mol_name, _, _, _ in all_data])):
-			raise Exception('Error: Some molecules have the same indices after None objects have been removed from the all_data list. This is a programming error.')
-
-		# 2.5: Construct new molecules and molecule_graphs dictionaries, as well as a new solvent_components list.
-		molecules = {}; molecule_graphs = {}; solvent_components = []
-		for mol_name, molecule, molecule_graph, is_solvent in all_data:
-			molecules[mol_name]       = molecule
-			molecule_graphs[mol_name] = molecule_graph
-			if is_solvent:
-				solvent_components.append(mol_name)
-
-	# Third, return molecules, molecule_graphs, and solvent_components.
-	return molecules, molecule_graphs, solvent_components
-
-def make_SolventsList(SolventsList):
-	"""
-	This method is designed to require that SolventsList is a list, even if their is only one value in the list.
-
-	Parameters
-	----------
-	SolventsList : list of ints, np.int64
-		This is the SolventsList to convert to a list.
-
-	Returns
-	-------
-	SolventsList : list of ints
-		This is the SolventsList as a list.
-	"""
-	if isinstance(SolventsList,np.int64):
-		return [int(SolventsList)]
-	return SolventsList
-
-# -----------------------------------------------------------------------------------------------------------------------------
-
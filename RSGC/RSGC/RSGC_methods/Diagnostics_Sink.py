@@ -0,0 +1,265 @@
+"""
+Diagnostics_Sink.py, Geoffrey Weal, 17/10/26
+
+This class is designed to gather the diagnostics found while running the RSGC program (such as rings that contain hydrogens), so that they can be written to file all at once.
+"""
+import os, json, tempfile
+from contextlib import contextmanager, nullcontext
+
+try:
+	import fcntl
+except ImportError:
+	fcntl = None
+
+# These are the names of the files that diagnostics are written into.
+diagnostics_txt_filename   = 'Rings_with_hydrogens_in_them.txt'
+diagnostics_jsonl_filename = 'RSGC_diagnostics.jsonl'
+
+# These are the messages given in diagnostics_txt_filename for each reason.
+diagnostics_txt_messages = {'hydrogen_bonding_in_ring': ' (Ring may have hydrogen bonding in it.)', 'hydrogen_in_ring': ''}
+
+class Diagnostics_Sink:
+	"""
+	This class is designed to gather the diagnostics found while running the RSGC program (such as rings that contain hydrogens), so that they can be written to file all at once.
+
+	Each process records its diagnostics in memory in a Diagnostics_Sink rather than opening a file for each diagnostic. These are written to file at the end of each crystal
+	(see record_diagnostics), or gathered by run_RSGC_on_database and written once at the end of the database run, so that the lines written by RSGC programs running at the
+	same time are not mixed together.
+
+	Diagnostics are recorded by the RSGC program through record_diagnostic, which does nothing unless a Diagnostics_Sink is active.
+
+	Attributes
+	----------
+	records : list of dict.
+		These are the diagnostics that have been recorded. Each diagnostic gives the path to the crystal file ('crystal'), the name of the molecule ('molecule'), the atoms in the ring ('ring'), and the reason for the diagnostic ('reason').
+	molecule_name : int or None
+		This is the name of the molecule that is currently being looked at. None if not known.
+	"""
+	def __init__(self):
+		self.records = []
+		self.molecule_name = None
+
+	def record(self, filepath, reason, ring=None):
+		"""
+		This method will record a diagnostic.
+
+		Parameters
+		----------
+		filepath : str.
+			This is the path to the crystal file.
+		reason : str.
+			This is the reason for the diagnostic, such as 'hydrogen_in_ring' or 'hydrogen_bonding_in_ring'.
+		ring : list of int or None
+			These are the indices of the atoms in the ring. Default: None.
+		"""
+		self.records.append({'crystal': str(filepath), 'molecule': self.molecule_name, 'ring': (None if (ring is None) else [int(index) for index in ring]), 'reason': reason})
+
+	def merge(self, records):
+		"""
+		This method will add the diagnostics recorded in another process.
+
+		Parameters
+		----------
+		records : list of dict.
+			These are the diagnostics recorded in the other process.
+		"""
+		self.records += records
+
+	@contextmanager
+	def molecule(self, molecule_name):
+		"""
+		This method will record the diagnostics found in this context as belonging to a molecule.
+
+		Parameters
+		----------
+		molecule_name : int
+			This is the name of the molecule.
+		"""
+		previous_molecule_name = self.molecule_name
+		self.molecule_name = molecule_name
+		try:
+			yield
+		finally:
+			self.molecule_name = previous_molecule_name
+
+# -----------------------------------------------------------------------------------------------------------------------------
+
+# This is the Diagnostics_Sink that is currently recording diagnostics in this process. If None, diagnostics are not being recorded.
+active_diagnostics_sink = None
+
+def record_diagnostic(filepath, reason, ring=None):
+	"""
+	This method will record a diagnostic, if diagnostics are being recorded.
+
+	Parameters
+	----------
+	filepath : str.
+		This is the path to the crystal file.
+	reason : str.
+		This is the reason for the diagnostic, such as 'hydrogen_in_ring' or 'hydrogen_bonding_in_ring'.
+	ring : list of int or None
+		These are the indices of the atoms in the ring. Default: None.
+	"""
+	if active_diagnostics_sink is not None:
+		active_diagnostics_sink.record(filepath, reason, ring=ring)
+
+def diagnose_molecule(molecule_name):
+	"""
+	This method will give a context where the diagnostics recorded belong to a molecule, if diagnostics are being recorded.
+
+	Parameters
+	----------
+	molecule_name : int
+		This is the name of the molecule.
+
+	Returns
+	-------
+	context : contextmanager
+		This is the context to look at the molecule in. This does nothing if diagnostics are not being recorded.
+	"""
+	if active_diagnostics_sink is None:
+		return nullcontext()
+	return active_diagnostics_sink.molecule(molecule_name)
+
+def get_active_diagnostics_sink():
+	"""
+	This method will give the Diagnostics_Sink that is currently recording diagnostics in this process.
+
+	Returns
+	-------
+	diagnostics_sink : Diagnostics_Sink or None
+		This is the Diagnostics_Sink that is currently recording diagnostics. None if diagnostics are not being recorded.
+	"""
+	return active_diagnostics_sink
+
+def set_active_diagnostics_sink(diagnostics_sink):
+	"""
+	This method will set the Diagnostics_Sink that records diagnostics in this process.
+
+	Parameters
+	----------
+	diagnostics_sink : Diagnostics_Sink or None
+		This is the Diagnostics_Sink to record diagnostics with. If None, diagnostics are not recorded.
+
+	Returns
+	-------
+	previous_diagnostics_sink : Diagnostics_Sink or None
+		This is the Diagnostics_Sink that was recording diagnostics before.
+	"""
+	global active_diagnostics_sink
+	previous_diagnostics_sink = active_diagnostics_sink
+	active_diagnostics_sink = diagnostics_sink
+	return previous_diagnostics_sink
+
+@contextmanager
+def record_diagnostics(diagnostics_folderpath=None):
+	"""
+	This method will record the diagnostics found by the code run in this context, and append them to the diagnostics files at the end (even if an issue stops the RSGC program).
+
+	If a Diagnostics_Sink is already active (such as when run_RSGC_on_database is gathering the diagnostics of each crystal), the diagnostics are recorded in that Diagnostics_Sink instead,
+	and are not written to file here.
+
+	Parameters
+	----------
+	diagnostics_folderpath : str. or None
+		This is the path to the folder that contains the diagnostics files. If None, these are in the current working directory. Default: None.
+	"""
+
+	# First, if diagnostics are already being recorded, they are recorded there.
+	if active_diagnostics_sink is not None:
+		yield
+		return
+
+	# Second, record the diagnostics while the code in this context is run.
+	diagnostics_sink = Diagnostics_Sink()
+	previous_diagnostics_sink = set_active_diagnostics_sink(diagnostics_sink)
+	try:
+		yield
+	finally:
+		# Third, stop recording diagnostics, and append them to the diagnostics files.
+		set_active_diagnostics_sink(previous_diagnostics_sink)
+		if len(diagnostics_sink.records) > 0:
+			save_diagnostics(diagnostics_sink.records, diagnostics_folderpath, append=True)
+
+def save_diagnostics(records, diagnostics_folderpath=None, append=False):
+	"""
+	This method will write diagnostics into the diagnostics files.
+
+	Two files are written: diagnostics_txt_filename, which gives the path to the crystal for each diagnostic (as the RSGC program has always given), and diagnostics_jsonl_filename,
+	which gives each diagnostic as a json record on its own line.
+
+	If append is True, the diagnostics are added to the end of the diagnostics files in a single write while the files are locked, so that RSGC programs running at the same time in the
+	same folder do not mix their lines together. If append is False, the diagnostics files are replaced with the diagnostics given, by writing temporary files and then renaming them,
+	so the diagnostics files are never left half-written. If append is False and there are no diagnostics, the diagnostics files are left empty.
+
+	Parameters
+	----------
+	records : list of dict.
+		These are the diagnostics to write. See Diagnostics_Sink for more information.
+	diagnostics_folderpath : str. or None
+		This is the path to the folder to write the diagnostics files in. If None, these are written in the current working directory. Default: None.
+	append : bool.
+		If True, add the diagnostics to the end of the diagnostics files. If False, replace the diagnostics files. Default: False.
+	"""
+
+	# First, obtain the lines to write in each diagnostics file.
+	txt_lines   = ''.join(record['crystal']+diagnostics_txt_messages.get(record['reason'], ' ('+str(record['reason'])+')')+'\n' for record in records)
+	jsonl_lines = ''.join(json.dumps(record, sort_keys=True)+'\n' for record in records)
+
+	# Second, write the lines into each diagnostics file.
+	diagnostics_folderpath = '.' if (diagnostics_folderpath is None) else diagnostics_folderpath
+	for diagnostics_filename, lines in ((diagnostics_txt_filename, txt_lines), (diagnostics_jsonl_filename, jsonl_lines)):
+		diagnostics_filepath = os.path.join(diagnostics_folderpath, diagnostics_filename)
+		if append:
+			append_to_file(diagnostics_filepath, lines)
+		else:
+			write_file(diagnostics_filepath, lines)
+
+def append_to_file(filepath, text):
+	"""
+	This method will add text to the end of a file in a single write while the file is locked, so that processes writing to the same file at the same time do not mix their text together.
+
+	Files can only be locked on Unix systems. On other systems, the text is still added in a single write.
+
+	Parameters
+	----------
+	filepath : str.
+		This is the path to the file.
+	text : str.
+		This is the text to add to the end of the file.
+	"""
+	os.makedirs(os.path.dirname(os.path.abspath(filepath)), exist_ok=True)
+	with open(filepath, 'a') as file:
+		if fcntl is not None:
+			fcntl.flock(file.fileno(), fcntl.LOCK_EX)
+		try:
+			file.write(text)
+			file.flush()
+		finally:
+			if fcntl is not None:
+				fcntl.flock(file.fileno(), fcntl.LOCK_UN)
+
+def write_file(filepath, text):
+	"""
+	This method will replace a file with the text given, by writing a temporary file and then renaming it, so that the file is never left half-written.
+
+	Parameters
+	----------
+	filepath : str.
+		This is the path to the file.
+	text : str.
+		This is the text to write into the file.
+	"""
+	folderpath = os.path.dirname(os.path.abspath(filepath))
+	os.makedirs(folderpath, exist_ok=True)
+	file_descriptor, temporary_filepath = tempfile.mkstemp(prefix='.'+os.path.basename(filepath)+'_', dir=folderpath)
+	try:
+		with os.fdopen(file_descriptor, 'w') as file:
+			file.write(text)
+		os.replace(temporary_filepath, filepath)
+	except BaseException:
+		if os.path.exists(temporary_filepath):
+			os.remove(temporary_filepath)
+		raise
+
+# -----------------------------------------------------------------------------------------------------------------------------
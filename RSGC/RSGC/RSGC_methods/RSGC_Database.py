@@ -0,0 +1,182 @@
+"""
+RSGC_Database.py, Geoffrey Weal, 17/10/26
+
+This class is designed to save the crystals and molecules made by the RSGC program into a single ASE database, rather than into many small xyz files.
+"""
+import numbers
+import numpy as np
+
+from ase.db import connect
+
+from SUMELF import add_graph_to_ASE_Atoms_object
+
+class RSGC_Database:
+	"""
+	This class is designed to save the crystals and molecules made by the RSGC program into a single ASE database, rather than into many small xyz files.
+
+	Saving millions of small files can be very slow on some file systems (such as Lustre), so all the crystals and molecules from a run can be saved into one ASE (sqlite) database instead.
+	Each crystal and molecule is a row in the database, labelled with the following keys:
+		* crystal_name: The name of the crystal.
+		* structure: Either 'crystal' or 'molecule'.
+		* molecule_name: The name of the molecule (only for molecules).
+		* solvent: True if the molecule is a solvent (only for molecules).
+		* frame_index: The index of the structure in the original file (only for files with many structures).
+
+	The arrays attached to each crystal and molecule (such as the graph information added by add_graph_to_ASE_Atoms_object), and the simple values in atoms.info, are saved
+	into the data of each row, so they are given back when a structure is obtained with the get method. Any structure can be obtained from the database without reading the others.
+
+	Parameters
+	----------
+	database_filepath : str.
+		This is the path to the ASE database file (such as "RSGC_output.db"). This is created if it does not exist.
+
+	Attributes
+	----------
+	database_filepath : str.
+		This is the path to the ASE database file.
+	"""
+	def __init__(self, database_filepath):
+		self.database_filepath = database_filepath
+
+	def save(self, crystal_name, new_crystal, updated_molecules=None, updated_molecule_graphs=None, solvent_components=[], frame_index=None, replace=True):
+		"""
+		This method will save a crystal, and optionally its molecules, into the database.
+
+		Parameters
+		----------
+		crystal_name : str.
+			This is the name of the crystal.
+		new_crystal : ase.Atoms
+			This is the crystal with sidegroups removed.
+		updated_molecules : dict. of ase.Atoms or None
+			These are the molecules in the crystal. If None, the molecules are not saved. Default: None.
+		updated_molecule_graphs : dict. of networkx.Graph or None
+			This is the dict that contains the graph of each molecule in the updated_molecules dictionary. Default: None.
+		solvent_components : list of int.
+			This list contains the names of all the solvents in the updated_molecules dictionary. Default: [].
+		frame_index : int or None
+			This is the index of the structure in the original file, if the original file contains many structures. Default: None.
+		replace : bool.
+			If True, any crystal and molecules already saved in the database for this crystal (and frame_index) are removed first. Default: True.
+		"""
+
+		# First, add the node and edge information from the molecules graph back to the molecule.
+		if updated_molecules is not None:
+			for molecule_name in updated_molecules.keys():
+				add_graph_to_ASE_Atoms_object(updated_molecules[molecule_name], updated_molecule_graphs[molecule_name])
+
+		# Second, obtain the keys that label the rows of this crystal.
+		crystal_keys = {'crystal_name': str(crystal_name)}
+		if frame_index is not None:
+			crystal_keys['frame_index'] = int(frame_index)
+
+		# Third, save the crystal and its molecules in one transaction, so that the database is never left with only some of them.
+		database = connect(self.database_filepath)
+		with database:
+
+			# 3.1: Remove the rows from a previous run for this crystal.
+			if replace:
+				row_ids = [row.id for row in database.select(**crystal_keys)]
+				if len(row_ids) > 0:
+					database.delete(row_ids)
+
+			# 3.2: Save the crystal.
+			database.write(new_crystal, data=self.get_data(new_crystal), structure='crystal', **crystal_keys)
+
+			# 3.3: Save the molecules.
+			if updated_molecules is not None:
+				for molecule_name, updated_molecule in updated_molecules.items():
+					database.write(updated_molecule, data=self.get_data(updated_molecule), structure='molecule', molecule_name=int(molecule_name), solvent=bool(molecule_name in solvent_components), **crystal_keys)
+
+	def remove(self, crystal_name):
+		"""
+		This method will remove all the crystals and molecules for a crystal from the database.
+
+		Parameters
+		----------
+		crystal_name : str.
+			This is the name of the crystal.
+		"""
+		database = connect(self.database_filepath)
+		with database:
+			row_ids = [row.id for row in database.select(crystal_name=str(crystal_name))]
+			if len(row_ids) > 0:
+				database.delete(row_ids)
+
+	def get(self, crystal_name, molecule_name=None, frame_index=None):
+		"""
+		This method will obtain a crystal or molecule from the database, along with its arrays and info.
+
+		Parameters
+		----------
+		crystal_name : str.
+			This is the name of the crystal.
+		molecule_name : int or None
+			This is the name of the molecule to obtain. If None, the crystal is obtained. Default: None.
+		frame_index : int or None
+			This is the index of the structure in the original file, if the original file contains many structures. Default: None.
+
+		Returns
+		-------
+		atoms : ase.Atoms
+			This is the crystal or molecule.
+		"""
+
+		# First, obtain the keys of the row to get.
+		keys = {'crystal_name': str(crystal_name)}
+		if frame_index is not None:
+			keys['frame_index'] = int(frame_index)
+		if molecule_name is None:
+			keys['structure'] = 'crystal'
+		else:
+			keys['structure']     = 'molecule'
+			keys['molecule_name'] = int(molecule_name)
+
+		# Second, obtain the row, and make the crystal or molecule from it.
+		row   = connect(self.database_filepath).get(**keys)
+		atoms = row.toatoms()
+
+		# Third, add the arrays and info back to the crystal or molecule.
+		data = row.data
+		for array_name, values in data.get('arrays', {}).items():
+			if array_name in data.get('object_arrays', []):
+				array = np.empty(len(values), dtype=object)
+				for index, value in enumerate(values):
+					array[index] = tuple(value) if isinstance(value, list) else value
+				values = array
+			atoms.set_array(array_name, values)
+		atoms.info.update(data.get('info', {}))
+		return atoms
+
+	# -----------------------------------------------------------------------------------------------------------------------------
+
+	def get_data(self, atoms):
+		"""
+		This method will obtain the arrays and the info of a crystal or molecule that are not saved by ASE in the row of the database.
+
+		Arrays of numbers are saved as they are. Other arrays (such as arrays of strings or tuples) are saved as lists.
+
+		Parameters
+		----------
+		atoms : ase.Atoms
+			This is the crystal or molecule.
+
+		Returns
+		-------
+		data : dict.
+			This contains the arrays, the names of the arrays that are saved as lists, and the simple values in atoms.info.
+		"""
+		arrays = {}
+		object_arrays = []
+		for array_name, array in atoms.arrays.items():
+			if array_name in ('numbers', 'positions'):
+				continue
+			if array.dtype.kind in 'biufc':
+				arrays[array_name] = array
+			else:
+				arrays[array_name] = [(list(value) if isinstance(value, (tuple, list, np.ndarray)) else value) for value in array.tolist()]
+				object_arrays.append(array_name)
+		info = {key: (value.item() if isinstance(value, np.generic) else value) for key, value in atoms.info.items() if isinstance(value, (str, bool, numbers.Number))}
+		return {'arrays': arrays, 'object_arrays': object_arrays, 'info': info}
+
+# -----------------------------------------------------------------------------------------------------------------------------
@@ -0,0 +1,341 @@
+"""
+Result_Cache.py, Geoffrey Weal, 17/10/26
+
+This class is designed to store the files made by the RSGC program on disk, so that crystals that have already been processed with the same settings do not need to be processed again.
+"""
+import os, json, time, shutil, hashlib, tempfile
+from contextlib import contextmanager
+
+try:
+	import fcntl
+except ImportError:
+	fcntl = None
+
+from RSGC.RSGC.RSGC_methods.get_file_hash import get_file_hash
+
+# This is the name of the file in the cache folder that records the total size of the entries in the cache.
+cache_size_filename = '.cache_size'
+
+# When the cache becomes bigger than max_size_MB, entries are removed until it is this fraction of max_size_MB, so that entries do not need to be removed every time an entry is saved.
+eviction_fraction = 0.9
+
+class Result_Cache:
+	"""
+	This class is designed to store the files made by the RSGC program on disk, so that crystals that have already been processed with the same settings do not need to be processed again.
+
+	Each entry in the cache is a folder named after a key. This key is the sha256 hash of the bytes of the crystal file, the settings that change the files made by the RSGC program, and the version of the RSGC program.
+	This means an entry is only used if the crystal file, the settings, and the RSGC program are all the same as when the entry was made.
+
+	Entries are made in a temporary folder and then renamed into place, so that many RSGC processes can share the same cache folder.
+	The total size of the entries is kept in a file in the cache folder (updated while the file is locked), so that the cache does not need to be looked through every time an entry is saved.
+	When the cache becomes bigger than max_size_MB, the least recently used entries are removed from the cache until it is eviction_fraction of max_size_MB.
+
+	Parameters
+	----------
+	cache_folderpath : str.
+		This is the path to the folder to store the cache in.
+	max_size_MB : float or None
+		This is the largest size (in MB) that the cache can be. If None, the cache has no size limit. Default: 1000.0.
+
+	Attributes
+	----------
+	cache_folderpath : str.
+		This is the path to the folder to store the cache in.
+	max_size_MB : float or None
+		This is the largest size (in MB) that the cache can be.
+	"""
+	def __init__(self, cache_folderpath, max_size_MB=1000.0):
+
+		# First, record the settings for this cache.
+		self.cache_folderpath = cache_folderpath
+		self.max_size_MB      = max_size_MB
+
+		# Second, make the folder for the cache if it does not exist yet.
+		os.makedirs(self.cache_folderpath, exist_ok=True)
+
+	def get_key(self, filepath, RSGC_settings, version):
+		"""
+		This method will give the key of the entry in the cache for a crystal file.
+
+		Parameters
+		----------
+		filepath : str.
+			This is the path to the crystal file.
+		RSGC_settings : dict.
+			These are the settings that change the files made by the RSGC program.
+		version : str.
+			This is the version of the RSGC program.
+
+		Returns
+		-------
+		key : str.
+			This is the key of the entry in the cache for this crystal file.
+		"""
+
+		# First, hash the bytes of the crystal file.
+		file_hash = get_file_hash(filepath)
+
+		# Second, hash the crystal file hash along with the settings and the version of the RSGC program.
+		key_information = json.dumps({'file_hash': file_hash, 'RSGC_settings': RSGC_settings, 'version': str(version)}, sort_keys=True)
+		return hashlib.sha256(key_information.encode('utf-8')).hexdigest()
+
+	def restore(self, key, save_crystal_folderpath, crystal_name):
+		"""
+		This method will restore the files in an entry of the cache into the folders that the RSGC program saves files into.
+
+		Files are hard-linked from the cache if possible, otherwise they are copied from the cache. Crystal files with the same bytes share the same entry, so the crystal file
+		is restored under the name of this crystal rather than the name of the crystal that made the entry.
+
+		Parameters
+		----------
+		key : str.
+			This is the key of the entry in the cache.
+		save_crystal_folderpath : str.
+			This is the folder path to save the crystal with sidegroups removed into.
+		crystal_name : str.
+			This is the name of the crystal.
+
+		Returns
+		-------
+		restored : bool.
+			True if the entry was found in the cache and its files were restored. False if the entry is not in the cache.
+		"""
+
+		# First, obtain the entry from the cache, if it is in the cache.
+		entry_folderpath = os.path.join(self.cache_folderpath, key)
+		try:
+			with open(os.path.join(entry_folderpath, 'entry.json')) as entry_file:
+				entry = json.load(entry_file)
+		except (OSError, ValueError):
+			return False
+
+		# Second, restore the crystal file and the molecule files.
+		try:
+			self.place_file(os.path.join(entry_folderpath, 'crystal', entry['crystal_filename']), os.path.join(save_crystal_folderpath, crystal_name+'_with_sidechains_removed.xyz'))
+			for molecule_filename in entry['molecule_filenames']:
+				self.place_file(os.path.join(entry_folderpath, 'molecules', molecule_filename), os.path.join(save_crystal_folderpath+'_molecules', crystal_name, molecule_filename))
+		except OSError:
+			# 2.1: The entry was removed from the cache by another process while restoring it.
+			return False
+
+		# Third, record that this entry has just been used.
+		try:
+			os.utime(entry_folderpath)
+		except OSError:
+			pass
+		return True
+
+	def save(self, key, crystal_filepath, molecule_filepaths=[]):
+		"""
+		This method will save the files made by the RSGC program for a crystal into the cache.
+
+		Parameters
+		----------
+		key : str.
+			This is the key of the entry in the cache.
+		crystal_filepath : str.
+			This is the path to the crystal file made by the RSGC program.
+		molecule_filepaths : list of str.
+			These are the paths to the molecule files made by the RSGC program. Default: [].
+		"""
+
+		# First, if this entry is already in the cache, there is nothing to do.
+		entry_folderpath = os.path.join(self.cache_folderpath, key)
+		if os.path.exists(entry_folderpath):
+			return
+
+		# Second, copy the files into a temporary folder in the cache.
+		temporary_folderpath = tempfile.mkdtemp(prefix='.'+key+'_', dir=self.cache_folderpath)
+		try:
+			os.makedirs(os.path.join(temporary_folderpath, 'crystal'))
+			os.makedirs(os.path.join(temporary_folderpath, 'molecules'))
+			shutil.copy2(crystal_filepath, os.path.join(temporary_folderpath, 'crystal', os.path.basename(crystal_filepath)))
+			for molecule_filepath in molecule_filepaths:
+				shutil.copy2(molecule_filepath, os.path.join(temporary_folderpath, 'molecules', os.path.basename(molecule_filepath)))
+			entry_size = self.get_folder_size(temporary_folderpath)
+			entry = {'crystal_filename': os.path.basename(crystal_filepath), 'molecule_filenames': [os.path.basename(molecule_filepath) for molecule_filepath in molecule_filepaths], 'time_made': time.time(), 'size': entry_size}
+			with open(os.path.join(temporary_folderpath, 'entry.json'), 'w') as entry_file:
+				json.dump(entry, entry_file)
+
+			# Third, move the temporary folder into place. If another process has made this entry in the meantime, keep that entry instead.
+			os.rename(temporary_folderpath, entry_folderpath)
+		except OSError:
+			shutil.rmtree(temporary_folderpath, ignore_errors=True)
+			return
+
+		# Fourth, add the size of this entry to the total size of the cache, and remove the least recently used entries if the cache is now too big.
+		#         * The cache is only looked through when it is too big, so saving an entry does not take longer as the cache gets bigger.
+		if self.max_size_MB is None:
+			return
+		with self.lock_cache_size() as cache_size_file:
+			cache_size = self.read_cache_size(cache_size_file)
+			cache_size = (self.get_cache_size() if (cache_size is None) else (cache_size + entry_size))
+			if cache_size > self.max_size_MB * 1024.0 * 1024.0:
+				cache_size = self.evict()
+			self.write_cache_size(cache_size_file, cache_size)
+
+	def evict(self):
+		"""
+		This method will remove the least recently used entries from the cache until the cache is no bigger than eviction_fraction of max_size_MB.
+
+		This should only be run while the cache size file is locked (see lock_cache_size).
+
+		Returns
+		-------
+		cache_size : int
+			This is the total size (in bytes) of the entries left in the cache.
+		"""
+
+		# First, obtain the size and the time each entry was last used.
+		entries = self.get_entries()
+
+		# Second, remove the least recently used entries until the cache is small enough.
+		cache_size = sum(entry_size for _, entry_size, _ in entries)
+		max_size   = eviction_fraction * self.max_size_MB * 1024.0 * 1024.0
+		for _, entry_size, entry_folderpath in sorted(entries):
+			if cache_size <= max_size:
+				break
+			shutil.rmtree(entry_folderpath, ignore_errors=True)
+			cache_size -= entry_size
+
+		# Third, return the size of the cache.
+		return cache_size
+
+	def get_entries(self):
+		"""
+		This method will give the time each entry in the cache was last used, along with its size.
+
+		The size of each entry is recorded in its entry.json file, so the files in each entry do not need to be looked at (except for entries made by older versions of the RSGC program).
+
+		Returns
+		-------
+		entries : list of (float, int, str.)
+			These are the time each entry was last used, the size of the entry (in bytes), and the path to the entry.
+		"""
+		entries = []
+		for key in os.listdir(self.cache_folderpath):
+			entry_folderpath = os.path.join(self.cache_folderpath, key)
+			if key.startswith('.') or (not os.path.isdir(entry_folderpath)):
+				continue
+			try:
+				with open(os.path.join(entry_folderpath, 'entry.json')) as entry_file:
+					entry_size = json.load(entry_file).get('size')
+				if entry_size is None:
+					entry_size = self.get_folder_size(entry_folderpath)
+				entries.append((os.path.getmtime(entry_folderpath), entry_size, entry_folderpath))
+			except (OSError, ValueError):
+				continue
+		return entries
+
+	def get_cache_size(self):
+		"""
+		This method will give the total size of the entries in the cache, by looking through the cache.
+
+		Returns
+		-------
+		cache_size : int
+			This is the total size (in bytes) of the entries in the cache.
+		"""
+		return sum(entry_size for _, entry_size, _ in self.get_entries())
+
+	# -----------------------------------------------------------------------------------------------------------------------------
+
+	@contextmanager
+	def lock_cache_size(self):
+		"""
+		This method will open and lock the file that records the total size of the cache, so that only one process changes it at a time.
+
+		Files can only be locked on Unix systems. On other systems, the file is still opened.
+
+		Returns
+		-------
+		cache_size_file : file
+			This is the file that records the total size of the cache.
+		"""
+		with open(os.path.join(self.cache_folderpath, cache_size_filename), 'a+') as cache_size_file:
+			if fcntl is not None:
+				fcntl.flock(cache_size_file.fileno(), fcntl.LOCK_EX)
+			try:
+				yield cache_size_file
+			finally:
+				if fcntl is not None:
+					fcntl.flock(cache_size_file.fileno(), fcntl.LOCK_UN)
+
+	def read_cache_size(self, cache_size_file):
+		"""
+		This method will read the total size of the cache from the cache size file.
+
+		Parameters
+		----------
+		cache_size_file : file
+			This is the file that records the total size of the cache.
+
+		Returns
+		-------
+		cache_size : int or None
+			This is the total size (in bytes) of the entries in the cache. None if this has not been recorded yet.
+		"""
+		cache_size_file.seek(0)
+		try:
+			return int(cache_size_file.read().strip())
+		except ValueError:
+			return None
+
+	def write_cache_size(self, cache_size_file, cache_size):
+		"""
+		This method will write the total size of the cache into the cache size file.
+
+		Parameters
+		----------
+		cache_size_file : file
+			This is the file that records the total size of the cache.
+		cache_size : int
+			This is the total size (in bytes) of the entries in the cache.
+		"""
+		cache_size_file.seek(0)
+		cache_size_file.truncate()
+		cache_size_file.write(str(int(cache_size)))
+		cache_size_file.flush()
+
+	# -----------------------------------------------------------------------------------------------------------------------------
+
+	def place_file(self, cache_filepath, filepath):
+		"""
+		This method will place a file from the cache at filepath, using a hard link if possible, otherwise a copy.
+
+		Parameters
+		----------
+		cache_filepath : str.
+			This is the path to the file in the cache.
+		filepath : str.
+			This is the path to place the file at.
+		"""
+
+		# First, make the folder to place the file in, and remove any file already at filepath.
+		os.makedirs(os.path.dirname(filepath) or '.', exist_ok=True)
+		if os.path.lexists(filepath):
+			os.remove(filepath)
+
+		# Second, hard link the file from the cache, or copy it if hard links can not be made (such as between different file systems).
+		try:
+			os.link(cache_filepath, filepath)
+		except OSError:
+			shutil.copy2(cache_filepath, filepath)
+
+	def get_folder_size(self, folderpath):
+		"""
+		This method will give the total size of the files in a folder.
+
+		Parameters
+		----------
+		folderpath : str.
+			This is the path to the folder.
+
+		Returns
+		-------
+		folder_size : int
+			This is the total size (in bytes) of the files in the folder.
+		"""
+		return sum(os.path.getsize(os.path.join(root, filename)) for root, dirs, filenames in os.walk(folderpath) for filename in filenames)
+
+# -----------------------------------------------------------------------------------------------------------------------------
@@ -0,0 +1,331 @@
+"""
+Stage_Timer.py, Geoffrey Weal, 17/10/26
+
+This class is designed to record how long each stage of the RSGC program takes for a crystal, along with counts of what was done in each stage (such as the number of rings found).
+"""
+import os, json, time, tempfile, resource, tracemalloc
+from contextlib import contextmanager, nullcontext
+
+class Stage_Timer:
+	"""
+	This class is designed to record how long each stage of the RSGC program takes for a crystal, along with counts of what was done in each stage (such as the number of rings found).
+
+	For each stage, the total wall time (in seconds) and the number of times the stage was run are recorded. Some stages are run inside other stages (for example, get_list_of_rings is run
+	inside remove_aliphatic_sidegroups), so the times of the stages do not add up to the total time.
+
+	The stages are recorded by the RSGC program through time_stage and add_stage_count, which do nothing unless a Stage_Timer is active (see record_stage_times). This means that
+	recording stage times costs almost nothing when it is not being used.
+
+	If record_memory is True, the peak memory used during each stage is also recorded, both as the peak resident set size (RSS) of the process and as the peak memory allocated
+	by python (using tracemalloc). The peak of a stage includes the peaks of the stages run inside it. tracemalloc makes the RSGC program slower, so this is only done if asked for.
+
+	Parameters
+	----------
+	record_memory : bool.
+		If True, also record the peak memory used during each stage. tracemalloc must be tracing for the peak memory allocated by python to be recorded. Default: False.
+
+	Attributes
+	----------
+	stages : dict.
+		This contains the total time and number of calls of each stage (and the peak memory used in MB if record_memory is True), given by the name of the stage.
+	counts : dict.
+		This contains the counts of what was done in the stages (such as 'rings' or 'atoms_removed').
+	record_memory : bool.
+		If True, the peak memory used during each stage is recorded.
+	open_memory_peaks : list of [float, float]
+		These are the peak memory allocated by python and the peak RSS (in MB) recorded so far for each stage that is currently running, from the outermost to the innermost.
+	"""
+	def __init__(self, record_memory=False):
+		self.stages = {}
+		self.counts = {}
+		self.record_memory = record_memory
+		self.open_memory_peaks = []
+
+	@contextmanager
+	def stage(self, stage_name):
+		"""
+		This method will record the time taken to run the code in this context as part of a stage.
+
+		Parameters
+		----------
+		stage_name : str.
+			This is the name of the stage.
+		"""
+		if self.record_memory:
+			self.start_memory_tracking()
+		start_time = time.perf_counter()
+		try:
+			yield
+		finally:
+			stage = self.stages.setdefault(stage_name, {'time': 0.0, 'calls': 0})
+			stage['time']  += time.perf_counter() - start_time
+			stage['calls'] += 1
+			if self.record_memory:
+				peak_allocated_MB, peak_RSS_MB = self.stop_memory_tracking()
+				stage['peak_allocated_MB'] = max(stage.get('peak_allocated_MB', 0.0), peak_allocated_MB)
+				stage['peak_RSS_MB']       = max(stage.get('peak_RSS_MB', 0.0), peak_RSS_MB)
+
+	def start_memory_tracking(self):
+		"""
+		This method will start recording the peak memory used for a stage that is about to be run.
+
+		The peak memory recorders of tracemalloc and of the process are reset, so the peak recorded so far is first given to the stages that are already running.
+		"""
+		self.update_open_memory_peaks()
+		if tracemalloc.is_tracing():
+			tracemalloc.reset_peak()
+		reset_peak_RSS()
+		self.open_memory_peaks.append([0.0, 0.0])
+
+	def stop_memory_tracking(self):
+		"""
+		This method will stop recording the peak memory used for the stage that has just finished.
+
+		Returns
+		-------
+		peak_allocated_MB : float
+			This is the peak memory (in MB) allocated by python during this stage. This is 0.0 if tracemalloc is not tracing.
+		peak_RSS_MB : float
+			This is the peak RSS (in MB) of the process during this stage.
+		"""
+		self.update_open_memory_peaks()
+		peak_allocated_MB, peak_RSS_MB = self.open_memory_peaks.pop()
+		if len(self.open_memory_peaks) > 0:
+			self.open_memory_peaks[-1][0] = max(self.open_memory_peaks[-1][0], peak_allocated_MB)
+			self.open_memory_peaks[-1][1] = max(self.open_memory_peaks[-1][1], peak_RSS_MB)
+		return peak_allocated_MB, peak_RSS_MB
+
+	def update_open_memory_peaks(self):
+		"""
+		This method will give the peak memory used since the peak memory recorders were last reset to all the stages that are currently running.
+		"""
+		peak_allocated_MB = (tracemalloc.get_traced_memory()[1] / (1024.0 * 1024.0)) if tracemalloc.is_tracing() else 0.0
+		peak_RSS_MB = get_peak_RSS_MB()
+		for open_memory_peak in self.open_memory_peaks:
+			open_memory_peak[0] = max(open_memory_peak[0], peak_allocated_MB)
+			open_memory_peak[1] = max(open_memory_peak[1], peak_RSS_MB)
+
+	def add_count(self, count_name, value=1):
+		"""
+		This method will add to a count.
+
+		Parameters
+		----------
+		count_name : str.
+			This is the name of the count.
+		value : int
+			This is the amount to add to the count. Default: 1.
+		"""
+		self.counts[count_name] = self.counts.get(count_name, 0) + value
+
+	def merge(self, stage_times):
+		"""
+		This method will add the stage times and counts recorded by another Stage_Timer (such as one used in another process) to this Stage_Timer.
+
+		Parameters
+		----------
+		stage_times : dict.
+			These are the stage times and counts given by the get_stage_times method of the other Stage_Timer.
+		"""
+		for stage_name, other_stage in stage_times['stages'].items():
+			stage = self.stages.setdefault(stage_name, {'time': 0.0, 'calls': 0})
+			stage['time']  += other_stage['time']
+			stage['calls'] += other_stage['calls']
+			for memory_name in ('peak_allocated_MB', 'peak_RSS_MB'):
+				if memory_name in other_stage:
+					stage[memory_name] = max(stage.get(memory_name, 0.0), other_stage[memory_name])
+		for count_name, value in stage_times['counts'].items():
+			self.add_count(count_name, value)
+
+	def get_stage_times(self):
+		"""
+		This method will give the stage times and counts that have been recorded.
+
+		Returns
+		-------
+		stage_times : dict.
+			This contains the stage times ('stages') and counts ('counts').
+		"""
+		return {'stages': self.stages, 'counts': self.counts}
+
+	def save(self, report_filepath, filepath, completed, total_time, peak_memory=None):
+		"""
+		This method will save the stage times and counts for a crystal into a json file.
+
+		Parameters
+		----------
+		report_filepath : str.
+			This is the path to the json file to save the stage times into.
+		filepath : str.
+			This is the path to the crystal file.
+		completed : bool.
+			True if the RSGC program completed for this crystal, False if an issue stopped it.
+		total_time : float
+			This is the total time (in seconds) taken by the RSGC program for this crystal.
+		peak_memory : dict. or None
+			This contains the peak memory (in MB) used by the RSGC program for this crystal, given as 'peak_allocated_MB' and 'peak_RSS_MB'. If None, this is not saved. Default: None.
+		"""
+
+		# First, obtain the report for this crystal.
+		report = {'filepath': filepath, 'completed': completed, 'total_time': total_time, 'stages': self.stages, 'counts': self.counts}
+		if peak_memory is not None:
+			report.update(peak_memory)
+
+		# Second, write the report to a temporary file, and then rename it, so that a batch driver never reads a half-written report.
+		report_folderpath = os.path.dirname(os.path.abspath(report_filepath))
+		os.makedirs(report_folderpath, exist_ok=True)
+		file_descriptor, temporary_filepath = tempfile.mkstemp(prefix='.stage_times_', suffix='.json', dir=report_folderpath)
+		with os.fdopen(file_descriptor, 'w') as report_file:
+			json.dump(report, report_file, indent=1, sort_keys=True)
+		os.replace(temporary_filepath, report_filepath)
+
+# -----------------------------------------------------------------------------------------------------------------------------
+
+# This is the Stage_Timer that is currently recording stage times in this process. If None, stage times are not being recorded.
+active_stage_timer = None
+
+# This is the context that is given by time_stage when stage times are not being recorded. This does nothing.
+no_stage_timer = nullcontext()
+
+def time_stage(stage_name):
+	"""
+	This method will give a context that records the time taken by a stage, if stage times are being recorded.
+
+	Parameters
+	----------
+	stage_name : str.
+		This is the name of the stage.
+
+	Returns
+	-------
+	context : contextmanager
+		This is the context to run the stage in. This does nothing if stage times are not being recorded.
+	"""
+	if active_stage_timer is None:
+		return no_stage_timer
+	return active_stage_timer.stage(stage_name)
+
+def add_stage_count(count_name, value=1):
+	"""
+	This method will add to a count, if stage times are being recorded.
+
+	Parameters
+	----------
+	count_name : str.
+		This is the name of the count.
+	value : int
+		This is the amount to add to the count. Default: 1.
+	"""
+	if active_stage_timer is not None:
+		active_stage_timer.add_count(count_name, value)
+
+def get_active_stage_timer():
+	"""
+	This method will give the Stage_Timer that is currently recording stage times in this process.
+
+	Returns
+	-------
+	stage_timer : Stage_Timer or None
+		This is the Stage_Timer that is currently recording stage times. None if stage times are not being recorded.
+	"""
+	return active_stage_timer
+
+def set_active_stage_timer(stage_timer):
+	"""
+	This method will set the Stage_Timer that records stage times in this process.
+
+	Parameters
+	----------
+	stage_timer : Stage_Timer or None
+		This is the Stage_Timer to record stage times with. If None, stage times are not recorded.
+
+	Returns
+	-------
+	previous_stage_timer : Stage_Timer or None
+		This is the Stage_Timer that was recording stage times before.
+	"""
+	global active_stage_timer
+	previous_stage_timer = active_stage_timer
+	active_stage_timer = stage_timer
+	return previous_stage_timer
+
+def get_peak_RSS_MB():
+	"""
+	This method will give the peak resident set size (RSS) of this process since it was last reset with reset_peak_RSS.
+
+	This is read from /proc/self/status on Linux. On other systems, the peak RSS since the process started is given.
+
+	Returns
+	-------
+	peak_RSS_MB : float
+		This is the peak RSS (in MB) of this process.
+	"""
+	try:
+		with open('/proc/self/status') as status_file:
+			for line in status_file:
+				if line.startswith('VmHWM:'):
+					return int(line.split()[1]) / 1024.0
+	except (OSError, ValueError, IndexError):
+		pass
+	return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0
+
+def reset_peak_RSS():
+	"""
+	This method will reset the peak resident set size (RSS) of this process to its current RSS, so that the peak of each stage can be obtained.
+
+	This is only possible on Linux. On other systems, this does nothing.
+	"""
+	try:
+		with open('/proc/self/clear_refs', 'w') as clear_refs_file:
+			clear_refs_file.write('5')
+	except OSError:
+		pass
+
+@contextmanager
+def record_stage_times(report_filepath, filepath, record_memory=False):
+	"""
+	This method will record the stage times of the code run in this context, and save them to report_filepath at the end (even if an issue stops the RSGC program).
+
+	Parameters
+	----------
+	report_filepath : str. or None
+		This is the path to the json file to save the stage times into. If None, stage times are not recorded.
+	filepath : str.
+		This is the path to the crystal file.
+	record_memory : bool.
+		If True, also record the peak memory used during each stage. tracemalloc is started if it is not already tracing. See Stage_Timer for more information. Default: False.
+	"""
+
+	# First, if report_filepath is not given, stage times are not recorded.
+	if report_filepath is None:
+		yield
+		return
+
+	# Second, if the peak memory is to be recorded, start tracemalloc if it is not already tracing.
+	started_tracemalloc = record_memory and (not tracemalloc.is_tracing())
+	if started_tracemalloc:
+		tracemalloc.start()
+
+	# Third, record the stage times while the code in this context is run.
+	stage_timer = Stage_Timer(record_memory=record_memory)
+	previous_stage_timer = set_active_stage_timer(stage_timer)
+	if record_memory:
+		stage_timer.start_memory_tracking()
+	start_time = time.perf_counter()
+	completed = False
+	try:
+		yield
+		completed = True
+	finally:
+		# Fourth, stop recording stage times, and save the stage times.
+		total_time = time.perf_counter() - start_time
+		set_active_stage_timer(previous_stage_timer)
+		peak_memory = None
+		if record_memory:
+			peak_allocated_MB, peak_RSS_MB = stage_timer.stop_memory_tracking()
+			peak_memory = {'peak_allocated_MB': peak_allocated_MB, 'peak_RSS_MB': peak_RSS_MB}
+		if started_tracemalloc:
+			tracemalloc.stop()
+		stage_timer.save(report_filepath, filepath, completed, total_time, peak_memory=peak_memory)
+
+# -----------------------------------------------------------------------------------------------------------------------------
@@ -0,0 +1,265 @@
+"""
+check_molecules.py, Geoffrey Weal, 17/10/26
+
+This script is designed to check that the molecules in a crystal are all good, before and after the aliphatic sidegroups have been removed.
+"""
+import os, json, traceback
+
+from RSGC.RSGC.Problematic_Molecules_Exception import Problematic_Molecules_Exception
+
+problematic_molecules_policies = ['interactive', 'skip_molecule', 'skip_crystal', 'fail']
+
+def check_molecules(molecules, molecule_graphs, solvent_components, original_molecules=None, problematic_molecules_policy='interactive', filepath=None, quarantine_folderpath=None):
+	"""
+	This method is designed to check the molecules are all good.
+
+	Parameters
+	----------
+	molecules : dict. of ase.Atoms
+		This is the dict. of molecules in the crystal
+	molecule_graphs : dict. of networkx.Graph 
+		This is the dict that contains the graph of each molecule in the molecules dictionary. 
+	solvent_components : list of int.
+		This list contains the indices of all the solvents in the molecules list. 
+	original_molecules : dict. of ase.Atoms or None
+		These are the dict. of molecules that was obtained from the original molecules before removing aliphatic sidechains. This may not contain every molecule if the original molecules have been released to save memory. If set to None, molecules are molecules from the unmodified crystal. Default: None.
+	problematic_molecules_policy : str.
+		This is what to do if there are problematic molecules (molecules with no atoms in them). Default: 'interactive'. This can be:
+			* 'interactive': Show the problematic molecules in GUIs, and ask the user if they want to continue without them. 
+			* 'skip_molecule': Remove the problematic molecules from the crystal, and continue.
+			* 'skip_crystal': Raise a Problematic_Molecules_Exception, so that this crystal is skipped.
+			* 'fail': Raise an Exception.
+	filepath : str. or None
+		This is the path to the crystal file. This is used to name the folder that problematic molecules are saved into. Default: None.
+	quarantine_folderpath : str. or None
+		This is the path to the folder to save problematic molecules (and their original versions) into, along with a reason.json file that gives the reason they are problematic. If None, problematic molecules are not saved. Default: None.
+
+	Returns
+	-------
+	molecules : dict. of ase.Atoms
+		This is the dict. of molecules in the crystal, without the problematic molecules.
+	molecule_graphs : dict. of networkx.Graph 
+		This is the dict that contains the graph of each molecule in the molecules dictionary. 
+	solvent_components : list of int.
+		This list contains the indices of all the solvents in the molecules list. 
+	"""
+
+	# Preliminary Step: check that the policy for problematic molecules is one that is known.
+	if problematic_molecules_policy not in problematic_molecules_policies:
+		raise Exception(f'Error: problematic_molecules_policy must be one of {problematic_molecules_policies}. problematic_molecules_policy = {problematic_molecules_policy}')
+
+	# First, record all the molecules that have problems with them.
+	problematic_molecule_names = []
+
+	# Second, for each molecule in the molecules dictionary.
+	for mol_name, molecule in molecules.items():
+
+		# Third, if their are no atoms in the molecule, record it as a problem.
+		if len(molecule) == 0:
+			problematic_molecule_names.append(mol_name)
+
+	# Fourth, sort the problematic_molecule_names list
+	problematic_molecule_names.sort()
+
+	# Fifth, if there are problematic molecules, deal with them using the policy given. 
+	if len(problematic_molecule_names) > 0:
+
+		# 5.1: Save the problematic molecules (and their original versions if given) into the quarantine folder.
+		reason = 'Molecules '+str(problematic_molecule_names)+' in the crystal have no atoms in them'+(' after aliphatic sidegroups were removed.' if (original_molecules is not None) else '.')
+		if quarantine_folderpath is not None:
+			quarantine_problematic_molecules(molecules, problematic_molecule_names, original_molecules, filepath, quarantine_folderpath, problematic_molecules_policy, reason)
+
+		# 5.2: Deal with the problematic molecules using the policy given.
+		if problematic_molecules_policy == 'interactive':
+			ask_user_about_problematic_molecules(molecules, problematic_molecule_names, original_molecules)
+		elif problematic_molecules_policy == 'skip_molecule':
+			print('Warning: '+reason+' These molecules will be removed from the crystal.')
+		elif problematic_molecules_policy == 'skip_crystal':
+			raise Problematic_Molecules_Exception(reason)
+		else:
+			raise Exception('Error: '+reason)
+
+		# 5.3: Mark the problematic molecules as None objects. 
+		for prob_mol_name in problematic_molecule_names:
+			molecules[prob_mol_name] = None
+			molecule_graphs[prob_mol_name] = None
+
+		# 5.4: Update molecules, molecule_graphs, and solvent_components to remove molecules with no atoms
+		molecules, molecule_graphs, solvent_components = remove_None_placeholders(molecules, molecule_graphs, solvent_components)
+
+	# Sixth, return the molecules and molecule_graphs objects
+	return molecules, molecule_graphs, solvent_components
+
+def ask_user_about_problematic_molecules(molecules, problematic_molecule_names, original_molecules=None):
+	"""
+	This method is designed to show the problematic molecules to the user in GUIs, and ask the user if they want to continue without these problematic molecules.
+
+	Parameters
+	----------
+	molecules : dict. of ase.Atoms
+		This is the dict. of molecules in the crystal
+	problematic_molecule_names : list of int.
+		These are the names of the problematic molecules.
+	original_molecules : dict. of ase.Atoms or None
+		These are the dict. of molecules that was obtained from the original molecules before removing aliphatic sidechains. Default: None.
+
+	Raises
+	------
+	Problematic_Molecules_Exception
+		If the user does not want to continue without these problematic molecules.
+	"""
+
+	# First, print error message.
+	traceback_stack = traceback.extract_stack()
+	print('Error: These is an issue at:')
+	for trace in traceback_stack:
+		print(f'  {trace.filename}, line {trace.lineno} in {trace.name}')#: {trace.line}')
+	print('Molecules '+str([prob_mol_name for prob_mol_name in problematic_molecule_names])+' in the crystal have no atoms in it?')
+	print("Look at the GUI's to see the problem")
+	print('One or more GUIs show all the problematic molecules before and after the RSGC has been applied to it')
+	print('The other GUI shows all the OK molecules')
+
+	# Second, for each problematic molecule
+	#         * ase.visualize is only imported here, as it is only needed when the user is asked about problematic molecules.
+	from ase.visualize import view
+	for problematic_molecule_name in problematic_molecule_names:
+
+		# 2.1: Create a list that contains the problematic molecule.
+		problem_molecule = [molecules[problematic_molecule_name]]
+
+		# 2.2: If original_molecules is not none, add the original molecule to the list to compare molecule with.
+		#      * The original molecule may have already been released to save memory (see remove_aliphatic_sidegroups_from_molecules).
+		if (original_molecules is not None) and (problematic_molecule_name in original_molecules):
+			problem_molecule.append(original_molecules[problematic_molecule_name])
+
+		# 2.3: Open the GUI to allow the user to see the problematic molecule (and its original version if given).
+		view(problem_molecule)
+
+	# Third, show all the ok molecules
+	view([molecules[prob_mol_name] for prob_mol_name in molecules.keys() if (prob_mol_name not in problematic_molecule_names)])
+
+	# Fourth, check with the user if they want to continue anyway.
+	while True:
+		to_continue = input('Would you like to continue without these problematic molecules in the crystal? (y/N): ')
+		to_continue = to_continue.lower()
+		if to_continue in ['y', 'yes']:
+			break
+		elif to_continue in ['n', 'no']:
+			raise Problematic_Molecules_Exception('Molecules '+str(problematic_molecule_names)+' in the crystal have no atoms in them, and the user chose not to continue.')
+		print('Please type either yes (y) or no (n).')
+
+def quarantine_problematic_molecules(molecules, problematic_molecule_names, original_molecules, filepath, quarantine_folderpath, problematic_molecules_policy, reason):
+	"""
+	This method is designed to save the problematic molecules (and their original versions if given) into the quarantine folder, along with a json file that gives the reason they were quarantined.
+
+	Parameters
+	----------
+	molecules : dict. of ase.Atoms
+		This is the dict. of molecules in the crystal
+	problematic_molecule_names : list of int.
+		These are the names of the problematic molecules.
+	original_molecules : dict. of ase.Atoms or None
+		These are the dict. of molecules that was obtained from the original molecules before removing aliphatic sidechains. If set to None, molecules are molecules from the unmodified crystal.
+	filepath : str. or None
+		This is the path to the crystal file.
+	quarantine_folderpath : str.
+		This is the path to the folder to save problematic molecules into.
+	problematic_molecules_policy : str.
+		This is the policy used to deal with the problematic molecules.
+	reason : str.
+		This is the reason that these molecules are problematic.
+	"""
+
+	# First, make the folder to save the problematic molecules of this crystal into.
+	#        * If this crystal is one of many structures in a file, filepath is given as "<filepath>@<frame_index>".
+	filename, _, frame_index = os.path.basename(filepath).partition('@') if (filepath is not None) else ('crystal', '', '')
+	crystal_name = os.path.splitext(filename)[0] + (('_'+frame_index) if (frame_index != '') else '')
+	stage = 'after_removing_sidegroups' if (original_molecules is not None) else 'before_removing_sidegroups'
+	crystal_quarantine_folderpath = os.path.join(quarantine_folderpath, crystal_name, stage)
+	os.makedirs(crystal_quarantine_folderpath, exist_ok=True)
+
+	# Second, save each problematic molecule, and its original version if given.
+	from ase.io import write
+	for problematic_molecule_name in problematic_molecule_names:
+		write(os.path.join(crystal_quarantine_folderpath, str(problematic_molecule_name)+'.xyz'), molecules[problematic_molecule_name], format='extxyz')
+		if (original_molecules is not None) and (problematic_molecule_name in original_molecules):
+			write(os.path.join(crystal_quarantine_folderpath, str(problematic_molecule_name)+'_original.xyz'), original_molecules[problematic_molecule_name], format='extxyz')
+
+	# Third, save the reason that these molecules were quarantined.
+	reason_information = {'filepath': filepath, 'stage': stage, 'problematic_molecule_names': [int(problematic_molecule_name) for problematic_molecule_name in problematic_molecule_names], 'problem': 'no_atoms', 'reason': reason, 'policy': problematic_molecules_policy}
+	with open(os.path.join(crystal_quarantine_folderpath, 'reason.json'), 'w') as reason_file:
+		json.dump(reason_information, reason_file, indent=1)
+
+def remove_None_placeholders(molecules, molecule_graphs, solvent_components):
+	"""
+	This method is designed to remove any None objects from the molecules, molecule_graphs, and solvent_components dictionaries and lists.
+
+	Parameters
+	----------
+	molecules : dict. of ase.Atoms
+		This is the dict. of molecules in the crystal
+	molecule_graphs : dict. of networkx.Graph 
+		This is the dict that contains the graph of each molecule in the molecules dictionary. 
+	solvent_components : list of int.
+		This list contains the indices of all the solvents in the molecules list. 
+
+	Returns
+	-------
+	molecules : dict. of ase.Atoms
+		This is the dict. of molecules in the crystal
+	molecule_graphs : dict. of networkx.Graph 
+		This is the dict that contains the graph of each molecule in the molecules dictionary. 
+	solvent_components : list of int.
+		This list contains the indices of all the solvents in the molecules list. 
+	"""
+
+	# First, check if there are any None objects in the molecules list.
+	None_object_names = []
+	for mol_name in sorted(molecules.keys(), reverse=False):
+		if molecules[mol_name] is None:
+			None_object_names.append(mol_name)
+
+	# Second, if there are values in None_object_names, there are None objects to remove, so do that
+	if len(None_object_names) > 0:
+
+		# 2.1: Remove all None objects from molecules and molecule_graphs, and their respective indices from solvent_components
+		for None_object_name in None_object_names:
+			del molecules[None_object_name]
+			del molecule_graphs[None_object_name]
+			if None_object_name in solvent_components:
+				solvent_components.remove(None_object_name)
+
+		# 2.2: Place all remaining molecules and molecule_graphs objects together, as well as a boolean to indicate if it is a solvent.
+		all_data = []
+		for mol_name in sorted(molecules.keys(), reverse=False):
+			molecule       = molecules[mol_name]
+			molecule_graph = molecule_graphs[mol_name]
+			is_solvent = mol_name in solvent_components
+			all_data.append([mol_name, molecule, molecule_graph, is_solvent])
+
+		# 2.3: Sort all_data by the mol_name.
+		all_data.sort(key=lambda x:x[0], reverse=False)
+
+		# 2.4: Decrement molecules by the approproriate amount
+		for index, (old_mol_name, molecule, molecule_graph, is_solvent) in enumerate(all_data):
+
+			# 2.4.1: Write the new name for this molecule.
+			new_mol_name = index + 1
+
+			# 2.4.2: Change the old_mol_name to new_mol_name for this datum set. 
+			all_data[index][0] = new_mol_name
+
+		# 2.4: Check that none of the molecules in all_data have the same name.
+		if not len(all_data) == len(set([mol_name for mol_name, _, _, _ in all_data])):
+			raise Exception('Error: Some molecules have the same indices after None objects have been removed from the all_data list. This is a programming error.')
+
+		# 2.5: Construct new molecules and molecule_graphs dictionaries, as well as a new solvent_components list.
+		molecules = {}; molecule_graphs = {}; solvent_components = []
+		for mol_name, molecule, molecule_graph, is_solvent in all_data:
+			molecules[mol_name]       = molecule
+			molecule_graphs[mol_name] = molecule_graph
+			if is_solvent:
+				solvent_components.append(mol_name)
+
+	# Third, return molecules, molecule_graphs, and solvent_components.
+	return molecules, molecule_graphs, solvent_components
@@ -0,0 +1,153 @@
+"""
+get_cell_list_graph.py, Geoffrey Weal, 17/10/26
+
+This script is designed to obtain the graph of a crystal by finding the bonds between atoms with a cell list, as an alternative to obtain_graph.
+"""
+import numpy as np
+from networkx import Graph
+
+try:
+	from scipy.spatial import cKDTree
+except ImportError:
+	cKDTree = None
+
+# These are the methods that can be used to obtain the graph of a crystal.
+bonding_methods = ['obtain_graph', 'cell_list']
+
+def get_cell_list_graph(crystal, bond_length_factor=1.2):
+	"""
+	This method is designed to obtain the graph of a crystal by finding the bonds between atoms with a cell list.
+
+	Two atoms are bonded if they are closer than the sum of their covalent radii multiplied by bond_length_factor. If scipy is installed, the atoms close to each atom are found
+	with a KD-tree of the atoms in the unit cell and the atoms in the neighbouring unit cells that are close enough to bond to them (see get_bonds_with_KD_tree). Otherwise, the
+	neighbour list of ASE is used, which sorts the atoms into bins about the size of the longest bond so that only atoms in neighbouring bins are compared. Both take a time that
+	grows linearly with the number of atoms in the crystal, and work for any unit cell (including non-orthogonal unit cells and non-periodic structures). The KD-tree is about ten
+	times faster for large unit cells. Bonds across the boundary of the unit cell are given as bonds between the atoms in the unit cell.
+
+	Each atom in the graph is given its element ('E'), as this is what the RSGC program uses to tell atoms apart. Other properties given by obtain_graph (such as
+	hybridisation and the types of bonds) are not given.
+
+	Parameters
+	----------
+	crystal : ase.Atoms
+		This is the crystal.
+	bond_length_factor : float
+		Two atoms are bonded if they are closer than the sum of their covalent radii multiplied by this factor. Default: 1.2.
+
+	Returns
+	-------
+	crystal_graph : networkx.Graph
+		This is the graph of the crystal.
+	"""
+
+	# First, obtain the cutoff of each atom. Two atoms are bonded if they are closer than the sum of their cutoffs.
+	from ase.data import covalent_radii
+	cutoffs = bond_length_factor * covalent_radii[crystal.get_atomic_numbers()]
+
+	# Second, obtain the pairs of atoms that are bonded.
+	#         * The KD-tree needs the unit cell to be three-dimensional if the crystal is periodic in any direction.
+	if (cKDTree is not None) and ((not any(crystal.get_pbc())) or (crystal.cell.rank == 3)):
+		bonds = get_bonds_with_KD_tree(crystal, cutoffs)
+	else:
+		bonds = get_bonds_with_neighbour_list(crystal, cutoffs)
+
+	# Third, add the atoms and bonds to the graph.
+	crystal_graph = Graph()
+	crystal_graph.add_nodes_from((index, {'E': symbol}) for index, symbol in enumerate(crystal.get_chemical_symbols()))
+	crystal_graph.add_edges_from(bonds)
+
+	# Fourth, return the graph of the crystal.
+	return crystal_graph
+
+def get_bonds_with_KD_tree(crystal, cutoffs):
+	"""
+	This method is designed to obtain the bonds in a crystal using a KD-tree from scipy.
+
+	As the unit cell does not need to be orthogonal, the periodic boundary of the KD-tree in scipy can not be used. Instead, the atoms in the neighbouring unit cells that are
+	within the longest possible bond of the unit cell are added to the KD-tree, and the bonds from each atom in the unit cell to these are found.
+
+	Parameters
+	----------
+	crystal : ase.Atoms
+		This is the crystal.
+	cutoffs : numpy.array of floats
+		These are the cutoffs of each atom. Two atoms are bonded if they are closer than the sum of their cutoffs.
+
+	Returns
+	-------
+	bonds : list of (int, int)
+		These are the bonds in the crystal, given as (index1, index2) where index1 < index2, in order.
+	"""
+
+	# First, obtain the longest possible bond.
+	if len(crystal) == 0:
+		return []
+	longest_bond = 2.0 * float(np.max(cutoffs))
+
+	# Second, obtain the positions of the atoms in the unit cell, and the atoms in the neighbouring unit cells that are close enough to bond to them.
+	pbc = crystal.get_pbc()
+	if any(pbc):
+
+		# 2.1: Obtain the positions of the atoms as fractions of the unit cell, with the atoms in periodic directions moved into the unit cell.
+		cell = crystal.get_cell().array
+		scaled_positions = crystal.get_scaled_positions(wrap=False)
+		scaled_positions[:,pbc] %= 1.0
+
+		# 2.2: Obtain how far (as a fraction of the unit cell) the atoms in neighbouring unit cells need to be included in each direction.
+		#      * This is the longest bond divided by the distance between opposite faces of the unit cell.
+		padding = longest_bond * np.linalg.norm(np.linalg.inv(cell), axis=0)
+		padding[~pbc] = 0.0
+		no_of_cells = np.ceil(padding).astype(int)
+
+		# 2.3: Add the atoms in each neighbouring unit cell that are within padding of the unit cell.
+		image_positions = []; image_indices = []
+		for shift in np.array(np.meshgrid(*[range(-no_of_cell, no_of_cell+1) for no_of_cell in no_of_cells], indexing='ij')).reshape(3,-1).T:
+			shifted_positions = scaled_positions + shift
+			is_close = np.all((shifted_positions[:,pbc] > -padding[pbc]) & (shifted_positions[:,pbc] < 1.0 + padding[pbc]), axis=1)
+			image_positions.append(shifted_positions[is_close] @ cell)
+			image_indices.append(np.nonzero(is_close)[0])
+		positions       = scaled_positions @ cell
+		image_positions = np.concatenate(image_positions)
+		image_indices   = np.concatenate(image_indices)
+
+	else:
+		positions       = crystal.get_positions()
+		image_positions = positions
+		image_indices   = np.arange(len(crystal))
+
+	# Third, obtain the pairs of atoms that are closer than the longest possible bond.
+	pairs = cKDTree(positions).sparse_distance_matrix(cKDTree(image_positions), longest_bond, output_type='ndarray')
+	indices1 = pairs['i']
+	indices2 = image_indices[pairs['j']]
+
+	# Fourth, only keep the pairs that are closer than the sum of their cutoffs.
+	#         * Each bond is found twice (once from each atom), and may be found more than once if the unit cell is small, so only index1 < index2 is kept.
+	is_bond = (indices1 < indices2) & (pairs['v'] < cutoffs[indices1] + cutoffs[indices2])
+	bonds = np.unique(np.stack((indices1[is_bond], indices2[is_bond]), axis=1), axis=0)
+
+	# Fifth, return the bonds in the crystal.
+	return [(int(index1), int(index2)) for index1, index2 in bonds]
+
+def get_bonds_with_neighbour_list(crystal, cutoffs):
+	"""
+	This method is designed to obtain the bonds in a crystal using the neighbour list of ASE.
+
+	Parameters
+	----------
+	crystal : ase.Atoms
+		This is the crystal.
+	cutoffs : numpy.array of floats
+		These are the cutoffs of each atom. Two atoms are bonded if they are closer than the sum of their cutoffs.
+
+	Returns
+	-------
+	bonds : list of (int, int)
+		These are the bonds in the crystal, given as (index1, index2) where index1 < index2, in order.
+	"""
+
+	# First, obtain the pairs of atoms that are bonded.
+	from ase.neighborlist import neighbor_list
+	indices1, indices2 = neighbor_list('ij', crystal, cutoffs)
+
+	# Second, each bond is given twice by neighbor_list (once for each atom), and may be given more than once if the unit cell is small, so only index1 < index2 is kept.
+	return sorted(set((int(index1), int(index2)) for index1, index2 in zip(indices1, indices2) if (index1 < index2)))
@@ -0,0 +1,141 @@
+"""
+get_embedded_graph.py, Geoffrey Weal, 17/10/26
+
+This script is designed to obtain the graph of a crystal from the graph information that has already been written into the crystal (such as by add_graph_to_ASE_Atoms_object).
+"""
+import ast
+import numpy as np
+from networkx import Graph
+
+# These are the arrays in a crystal that are not node properties of its graph.
+#    * NeighboursList gives the bonds of the graph, and MoleculeList gives the molecule that each atom is in, which is obtained again by process_crystal.
+arrays_that_are_not_node_properties = ['numbers', 'positions', 'momenta', 'masses', 'tags', 'initial_charges', 'initial_magmoms', 'NeighboursList', 'MoleculeList']
+
+def get_embedded_graph(crystal, check_bonds=False, no_of_bonds_to_check=100, max_bond_length_factor=1.3):
+	"""
+	This method is designed to obtain the graph of a crystal from the graph information that has already been written into the crystal.
+
+	Programs such as ReCrystals, ACSD, and the RSGC program itself save the graph of a crystal into its extxyz file with add_graph_to_ASE_Atoms_object. The bonds of each atom are
+	given in the "NeighboursList" array, the properties of each atom are given in the other arrays of the crystal (such as "hybridisation"), and the properties of each bond are
+	given in "BondProperties" in the info of the crystal. Obtaining the graph from these is much faster than working out the bonds in the crystal again with obtain_graph.
+
+	The bonds given in NeighboursList are always checked to make sure that each bond is given for both of its atoms. If check_bonds is True, the lengths of some of the bonds
+	are also checked to make sure that they are not much longer than a covalent bond, in case the graph does not belong to these atoms.
+
+	Parameters
+	----------
+	crystal : ase.Atoms
+		This is the crystal.
+	check_bonds : bool.
+		If True, check that no_of_bonds_to_check bonds (chosen at random) are not much longer than a covalent bond. Default: False.
+	no_of_bonds_to_check : int
+		This is the number of bonds to check the lengths of if check_bonds is True. All the bonds are checked if the crystal has fewer bonds than this. Default: 100.
+	max_bond_length_factor : float
+		A bond is too long if it is longer than the sum of the covalent radii of its atoms multiplied by this factor. Default: 1.3.
+
+	Returns
+	-------
+	crystal_graph : networkx.Graph or None
+		This is the graph of the crystal. None if the graph has not been written into the crystal.
+	"""
+
+	# First, if the bonds of the crystal have not been written into the crystal, the graph needs to be obtained with obtain_graph.
+	if 'NeighboursList' not in crystal.arrays:
+		return None
+
+	# Second, obtain the bonds of each atom from NeighboursList.
+	neighbours_list = [get_neighbours(neighbours, len(crystal)) for neighbours in crystal.arrays['NeighboursList']]
+
+	# Third, check that each bond is given for both of its atoms.
+	bonds = [(index1, index2) for index1, neighbours in enumerate(neighbours_list) for index2 in neighbours if (index1 < index2)]
+	if sum(len(neighbours) for neighbours in neighbours_list) != 2 * len(bonds):
+		one_sided_bonds = sorted((index1, index2) for index1, neighbours in enumerate(neighbours_list) for index2 in neighbours if (index1 not in neighbours_list[index2]))
+		raise Exception('Error: The NeighboursList written into this crystal gives bonds that are only given for one of their atoms: '+str(one_sided_bonds[:10])+('...' if (len(one_sided_bonds) > 10) else '')+'. Set use_embedded_graph=False to obtain the graph of this crystal again.')
+
+	# Fourth, if check_bonds is True, check the lengths of some of the bonds.
+	if check_bonds and (len(bonds) > 0):
+		check_bond_lengths(crystal, bonds, no_of_bonds_to_check=no_of_bonds_to_check, max_bond_length_factor=max_bond_length_factor)
+
+	# Fifth, add the atoms and their properties to the graph.
+	crystal_graph = Graph()
+	node_properties = {array_name: array.tolist() for array_name, array in crystal.arrays.items() if (array_name not in arrays_that_are_not_node_properties)}
+	for index, symbol in enumerate(crystal.get_chemical_symbols()):
+		node_attributes = {'E': symbol}
+		for array_name, values in node_properties.items():
+			node_attributes[array_name] = values[index]
+		crystal_graph.add_node(index, **node_attributes)
+
+	# Sixth, add the bonds to the graph.
+	crystal_graph.add_edges_from(bonds)
+
+	# Seventh, add the properties of each bond to the graph.
+	bond_properties = crystal.info.get('BondProperties', {})
+	if isinstance(bond_properties, str):
+		bond_properties = ast.literal_eval(bond_properties)
+	for bond_property_name, bonds_and_values in bond_properties.items():
+		for (index1, index2), value in bonds_and_values:
+			if not crystal_graph.has_edge(index1, index2):
+				raise Exception('Error: BondProperties written into this crystal gives a bond ('+str(index1)+', '+str(index2)+') that is not in NeighboursList. Set use_embedded_graph=False to obtain the graph of this crystal again.')
+			crystal_graph.edges[index1, index2][bond_property_name] = value
+
+	# Eighth, return the graph of the crystal.
+	return crystal_graph
+
+def get_neighbours(neighbours, no_of_atoms):
+	"""
+	This method is designed to obtain the indices of the neighbours of an atom, as given in NeighboursList.
+
+	Parameters
+	----------
+	neighbours : str.
+		These are the indices of the neighbours of the atom, separated by commas. This is an empty string if the atom has no neighbours.
+	no_of_atoms : int
+		This is the number of atoms in the crystal.
+
+	Returns
+	-------
+	neighbours : list of ints
+		These are the indices of the neighbours of the atom.
+	"""
+	neighbours = [int(neighbour) for neighbour in str(neighbours).split(',') if (neighbour.strip() != '')]
+	if any(((neighbour < 0) or (neighbour >= no_of_atoms)) for neighbour in neighbours):
+		raise Exception('Error: The NeighboursList written into this crystal gives neighbours that are not atoms in this crystal: '+str(neighbours)+'. Set use_embedded_graph=False to obtain the graph of this crystal again.')
+	return neighbours
+
+def check_bond_lengths(crystal, bonds, no_of_bonds_to_check=100, max_bond_length_factor=1.3):
+	"""
+	This method is designed to check that some of the bonds of the crystal (chosen at random) are not much longer than a covalent bond.
+
+	The same bonds are chosen each time this method is run on the same crystal. The lengths of the bonds are obtained using the minimum image convention, so bonds across the
+	boundary of the unit cell are given their proper length.
+
+	Parameters
+	----------
+	crystal : ase.Atoms
+		This is the crystal.
+	bonds : list of (int, int)
+		These are the bonds in the crystal.
+	no_of_bonds_to_check : int
+		This is the number of bonds to check. Default: 100.
+	max_bond_length_factor : float
+		A bond is too long if it is longer than the sum of the covalent radii of its atoms multiplied by this factor. Default: 1.3.
+	"""
+
+	# First, choose the bonds to check.
+	from ase.data     import covalent_radii
+	from ase.geometry import find_mic
+	bond_indices = np.array(bonds, dtype=int)
+	if len(bond_indices) > no_of_bonds_to_check:
+		bond_indices = bond_indices[np.sort(np.random.default_rng(0).choice(len(bond_indices), no_of_bonds_to_check, replace=False))]
+
+	# Second, obtain the length of each bond, and the longest that each bond could be.
+	positions = crystal.get_positions()
+	_, bond_lengths = find_mic(positions[bond_indices[:,1]] - positions[bond_indices[:,0]], crystal.get_cell(), crystal.get_pbc())
+	atomic_numbers = crystal.get_atomic_numbers()
+	max_bond_lengths = max_bond_length_factor * (covalent_radii[atomic_numbers[bond_indices[:,0]]] + covalent_radii[atomic_numbers[bond_indices[:,1]]])
+
+	# Third, report any bonds that are too long.
+	too_long = bond_lengths > max_bond_lengths
+	if np.any(too_long):
+		long_bonds = [(int(index1), int(index2), round(float(bond_length), 3)) for (index1, index2), bond_length in zip(bond_indices[too_long], bond_lengths[too_long])]
+		raise Exception('Error: Some of the bonds written into this crystal are much longer than a covalent bond, so the graph may not belong to this crystal. (index1, index2, length in A): '+str(long_bonds[:10])+('...' if (len(long_bonds) > 10) else '')+'. Set use_embedded_graph=False to obtain the graph of this crystal again.')
@@ -0,0 +1,28 @@
+"""
+get_file_hash.py, Geoffrey Weal, 17/10/26
+
+This script is designed to obtain a hash of the contents of a file.
+"""
+import hashlib
+
+def get_file_hash(filepath):
+	"""
+	This method is designed to obtain the sha256 hash of the contents of a file.
+
+	The file is read in chunks, so that large files do not need to be read into memory all at once.
+
+	Parameters
+	----------
+	filepath : str.
+		This is the path to the file.
+
+	Returns
+	-------
+	file_hash : str.
+		This is the sha256 hash of the contents of the file, given as a hexadecimal string.
+	"""
+	file_hash = hashlib.sha256()
+	with open(filepath, 'rb') as file_to_hash:
+		for chunk in iter(lambda: file_to_hash.read(1 << 20), b''):
+			file_hash.update(chunk)
+	return file_hash.hexdigest()
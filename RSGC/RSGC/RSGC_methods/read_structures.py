@@ -0,0 +1,99 @@
+"""
+read_structures.py, Geoffrey Weal, 17/10/26
+
+This script is designed to read the structures in a file one at a time, along with the index of each structure in the file.
+"""
+from ase.io         import iread
+from ase.io.formats import string2index
+
+def read_structures(filepath, index=':'):
+	"""
+	This method is designed to read the structures in a file one at a time, along with the index of each structure in the file.
+
+	The index of each structure (frame_index) is its position in the file, not its position in the structures given by index. For example, index='2:4' gives the
+	structures with frame_index 2 and 3.
+
+	If a structure can not be read (such as if one of its positions is not a number), the issue is given for this structure, and the structures after it continue to be read.
+	If the file can not be read past this structure at all (such as if the number of atoms of a structure is not a number), the issue is given and no more structures are read.
+
+	Parameters
+	----------
+	filepath : str.
+		This is the path to the file that contains the structures.
+	index : str., int, or slice
+		These are the structures in the file to read, given in the same way as for ase.io.iread. Default: ':' (all structures).
+
+	Returns
+	-------
+	structures : generator of (int, ase.Atoms or None, Exception or None)
+		These are the index of each structure in the file, the structure (None if it could not be read), and the issue found when reading it (None if it was read).
+	"""
+
+	# First, obtain the indices of the structures to read, where the first structure to read is start and every step structure after this is read, up to (but not including) stop.
+	#         * If index contains negative values, the number of structures in the file is needed to obtain these indices, so the file is read through once first.
+	index = string2index(index) if isinstance(index, str) else index
+	if isinstance(index, int):
+		index = slice(index, (index + 1) if (index != -1) else None, 1)
+	start, stop, step = index.start, index.stop, (1 if (index.step is None) else index.step)
+	if (step < 0) or any(((value is not None) and (value < 0)) for value in (start, stop)):
+		no_of_structures = sum(1 for _ in read_structures_in_order(filepath, 0, None, 1))
+		start, stop, step = index.indices(no_of_structures)
+	start = 0 if (start is None) else start
+
+	# Second, read the structures in the file.
+	if step > 0:
+		yield from read_structures_in_order(filepath, start, stop, step)
+	else:
+		# 2.1: The structures are read backwards, so each structure is read on its own.
+		for frame_index in range(start, stop, step):
+			try:
+				yield frame_index, next(iread(filepath, index=frame_index)), None
+			except Exception as exception_message:
+				yield frame_index, None, exception_message
+
+def read_structures_in_order(filepath, start, stop, step):
+	"""
+	This method is designed to read the structures in a file from start to stop (not including stop), every step structures.
+
+	If a structure can not be read, iread can not continue, so the file is read again from the next structure. If reading the file again fails straight away with the same issue,
+	the file can not be read past this structure, so no more structures are read.
+
+	Parameters
+	----------
+	filepath : str.
+		This is the path to the file that contains the structures.
+	start : int
+		This is the index of the first structure to read. This must be 0 or greater.
+	stop : int or None
+		This is the index to stop reading structures at. If None, structures are read to the end of the file.
+	step : int
+		Every step structures are read. This must be greater than 0.
+
+	Returns
+	-------
+	structures : generator of (int, ase.Atoms or None, Exception or None)
+		These are the index of each structure in the file, the structure (None if it could not be read), and the issue found when reading it (None if it was read).
+	"""
+	frame_index = start
+	previous_issue = None
+	while (stop is None) or (frame_index < stop):
+
+		# First, read the structures from frame_index onwards.
+		no_of_structures_read = 0
+		try:
+			for crystal in iread(filepath, index=slice(frame_index, stop, step)):
+				yield frame_index, crystal, None
+				frame_index += step
+				no_of_structures_read += 1
+			return
+		except Exception as exception_message:
+			read_issue = exception_message
+
+		# Second, if the file could not be read past the previous structure that could not be read, no more structures can be read.
+		if (no_of_structures_read == 0) and (str(read_issue) == previous_issue):
+			return
+
+		# Third, give the issue for this structure, and read the file again from the next structure.
+		yield frame_index, None, read_issue
+		previous_issue = str(read_issue)
+		frame_index += step
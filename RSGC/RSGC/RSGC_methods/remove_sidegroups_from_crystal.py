@@ -0,0 +1,179 @@
+"""
+remove_sidegroups_from_crystal.py, Geoffrey Weal, 17/10/26
+
+This script is designed to remove the aliphatic sidegroups from the molecules in a single crystal structure that has already been read in.
+"""
+import os, shutil
+import numpy as np
+from functools import partial
+
+from SUMELF import obtain_graph, process_crystal
+from SUMELF import make_crystal
+from SUMELF import add_graph_to_ASE_Atoms_object
+
+from RSGC.RSGC.remove_sidechains_methods.remove_aliphatic_sidegroups_from_molecules import remove_aliphatic_sidegroups_from_molecules
+from RSGC.RSGC.RSGC_methods.check_molecules                                         import check_molecules
+from RSGC.RSGC.RSGC_methods.save_molecules                                          import save_molecule
+from RSGC.RSGC.RSGC_methods.get_embedded_graph                                      import get_embedded_graph
+from RSGC.RSGC.RSGC_methods.get_cell_list_graph                                     import get_cell_list_graph, bonding_methods
+from RSGC.RSGC.RSGC_methods.Stage_Timer                                             import time_stage, add_stage_count
+
+def remove_sidegroups_from_crystal(crystal, filepath, leave_as_ethyls=False, add_hydrogens_to_alpha_carbons=False, wrap=False, no_of_cpus=1, process_equivalent_molecules_once=False, sidegroup_roles_memo_filepath=None, problematic_molecules_policy='interactive', quarantine_folderpath=None, low_memory=False, molecules_folderpath=None, use_embedded_graph=False, check_embedded_graph=False, bonding_method='obtain_graph'):
+	"""
+	This method is designed to remove the aliphatic sidegroups from the molecules in a crystal.
+
+	This does not read or write any files (unless molecules_folderpath is given), so it can be used on each structure in a file that contains many structures.
+
+	If low_memory is True, the original crystal and its graph are released once the molecules have been obtained from them, and each original molecule is released as soon as its
+	sidegroups have been removed, so that only what is needed to make the new crystal is kept in memory. This is useful for very large crystals. The original crystal can only be
+	released if nothing else holds on to it, so the crystal can be given inside a list, which this method takes the crystal out of (as RSGC does).
+
+	Parameters
+	----------
+	crystal : ase.Atoms or list of ase.Atoms
+		This is the crystal to remove aliphatic sidegroups from. If a list containing the crystal is given, the crystal is taken out of the list, so that it can be released once it is no longer needed.
+	filepath : str.
+		This is the path to the crystal file. This is used when reporting issues with the crystal.
+	leave_as_ethyls : bool.
+		If False, all sidegroups will be left as methyl. If true, they will be given as ethyl (to their beta carbon). Default: False.
+	add_hydrogens_to_alpha_carbons : bool.
+		If True, add any missing hydrogens to the sp3 carbons at the end of the sidegroups that have been shortened. Default: False.
+	wrap : bool.
+		If true, wrap the molecule in the unit cell. If false, keep the molecule in its connected form. Default: False.
+	no_of_cpus : int.
+		This is the number of processes to remove sidegroups from the molecules of this crystal with. Default: 1.
+	process_equivalent_molecules_once : bool.
+		If True, molecules in the crystal that are equivalent to each other are only fully processed once, and the result is reused for the other equivalent molecules. Default: False.
+	sidegroup_roles_memo_filepath : str. or None
+		This is the path to a sqlite database file that records the sidegroup roles of molecules, so that they can be reused for the same molecule in other crystals. If None, no memo is used. Default: None.
+	problematic_molecules_policy : str.
+		This is what to do if a molecule in the crystal has no atoms in it, either 'interactive', 'skip_molecule', 'skip_crystal', or 'fail'. See check_molecules for more information. Default: 'interactive'.
+	quarantine_folderpath : str. or None
+		This is the path to the folder to save problematic molecules into, along with the reason they are problematic. If None, problematic molecules are not saved. Default: None.
+	low_memory : bool.
+		If True, release the original crystal, its graph, and its molecules as soon as they are no longer needed. Default: False.
+	molecules_folderpath : str. or None
+		If given, each molecule is saved into this folder (which must already exist) as soon as its sidegroups have been removed, rather than being saved at the end by save_molecules. Default: None.
+	use_embedded_graph : bool.
+		If True and the graph of the crystal has already been written into the crystal (such as by add_graph_to_ASE_Atoms_object), the graph is obtained from this rather than with obtain_graph. See get_embedded_graph for more information. Default: False.
+	check_embedded_graph : bool.
+		If True, check the lengths of some of the bonds in the graph written into the crystal before using it. Only used if use_embedded_graph is True. Default: False.
+	bonding_method : str.
+		This is the method used to obtain the graph of the crystal, either 'obtain_graph' (from SUMELF) or 'cell_list' (see get_cell_list_graph). Default: 'obtain_graph'.
+
+	Returns
+	-------
+	new_crystal : ase.Atoms
+		This is the crystal with aliphatic sidegroups removed, including the node and edge properties of its graph.
+	updated_molecules : dict. of ase.Atoms
+		This is the dict. of molecules in the crystal with aliphatic sidegroups removed.
+	updated_molecule_graphs : dict. of networkx.Graph
+		This is the dict that contains the graph of each molecule in the updated_molecules dictionary.
+	solvent_components : list of int.
+		This list contains the names of all the solvents in the updated_molecules dictionary.
+	"""
+
+	# First, the crystal is periodic.
+	#        * If the crystal is given inside a list, it is taken out of the list so that this method holds the only reference to it.
+	if isinstance(crystal, list):
+		crystal = crystal.pop()
+	crystal.set_pbc(True)
+
+	# Second, get the graph of the crystal.
+	#         * If use_embedded_graph is True and the graph has already been written into the crystal, the graph is obtained from this rather than working out the bonds again.
+	#         * The time taken by each step is recorded if stage times are being recorded (see Stage_Timer).
+	crystal_graph = None
+	if use_embedded_graph:
+		with time_stage('get_embedded_graph'):
+			crystal_graph = get_embedded_graph(crystal, check_bonds=check_embedded_graph)
+		add_stage_count('embedded_graph_used', int(crystal_graph is not None))
+	#         * Otherwise, the graph is obtained with the method given by bonding_method.
+	if bonding_method not in bonding_methods:
+		raise Exception(f'Error: bonding_method must be one of {bonding_methods}. bonding_method = {bonding_method}')
+	if crystal_graph is None:
+		if bonding_method == 'cell_list':
+			with time_stage('get_cell_list_graph'):
+				crystal_graph = get_cell_list_graph(crystal)
+		else:
+			with time_stage('obtain_graph'):
+				crystal, crystal_graph = obtain_graph(crystal,name='crystal')
+	add_stage_count('atoms_in_crystal', len(crystal))
+
+	# Third, get the molecules and the graphs associated with each molecule in the crystal.
+	with time_stage('process_crystal'):
+		molecules, molecule_graphs, SolventsList, symmetry_operations, cell = process_crystal(crystal,crystal_graph=crystal_graph,take_shortest_distance=True,return_list=False,logger=None)
+	
+	# Fourth, determine the solvents in the crystal
+	solvent_components = list(make_SolventsList(crystal.info['SolventsList'])) if ('SolventsList' in crystal.info) else []
+
+	# 4.1: Only the number of atoms in the original crystal is needed from here, so the crystal and its graph are released if using less memory.
+	no_of_atoms_in_crystal = len(crystal)
+	if low_memory:
+		del crystal, crystal_graph
+
+	# Fifth, check to make sure the molecules are all good.
+	with time_stage('check_molecules'):
+		molecules, molecule_graphs, solvent_components = check_molecules(molecules, molecule_graphs, solvent_components, problematic_molecules_policy=problematic_molecules_policy, filepath=filepath, quarantine_folderpath=quarantine_folderpath)
+
+	# Sixth, remove the aliphatic sidegroup from molecules that are not solvents. Solvents are kept, but left unchanged.
+	print('Removing aliphatic sidechains from non-solvent molecules.')
+	#         * If molecules_folderpath is given, each molecule is saved as soon as it has been made. A copy of the molecule is saved so that the molecule used to make the crystal is not changed.
+	save_molecule_as_made = partial(save_molecule, solvent_components=solvent_components, molecules_folderpath=molecules_folderpath, copy_molecule=True) if (molecules_folderpath is not None) else None
+	with time_stage('remove_aliphatic_sidegroups_from_molecules'):
+		updated_molecules, updated_molecule_graphs = remove_aliphatic_sidegroups_from_molecules(molecules, molecule_graphs, solvent_components, filepath, leave_as_ethyls=leave_as_ethyls, add_hydrogens_to_alpha_carbons=add_hydrogens_to_alpha_carbons, no_of_cpus=no_of_cpus, process_equivalent_molecules_once=process_equivalent_molecules_once, sidegroup_roles_memo_filepath=sidegroup_roles_memo_filepath, save_molecule=save_molecule_as_made, release_molecules=low_memory)
+
+	# Seventh, check to make sure the updated molecules are all good.
+	with time_stage('check_molecules'):
+		saved_molecule_names = list(updated_molecules.keys())
+		updated_molecules, updated_molecule_graphs, solvent_components = check_molecules(updated_molecules, updated_molecule_graphs, solvent_components, original_molecules=molecules, problematic_molecules_policy=problematic_molecules_policy, filepath=filepath, quarantine_folderpath=quarantine_folderpath)
+	del molecules, molecule_graphs
+
+	# 7.1: If problematic molecules were removed, the molecules have been renamed, so the molecules saved as they were made are saved again with their new names.
+	if (molecules_folderpath is not None) and (list(updated_molecules.keys()) != saved_molecule_names):
+		shutil.rmtree(molecules_folderpath)
+		os.makedirs(molecules_folderpath)
+		for molecule_name in updated_molecules.keys():
+			save_molecule(molecule_name, updated_molecules[molecule_name], updated_molecule_graphs[molecule_name], solvent_components, molecules_folderpath, copy_molecule=True)
+
+	# Eighth, create the crystal without aliphatic sidechains.
+	with time_stage('make_crystal'):
+		new_crystal, new_crystal_graph = make_crystal(updated_molecules, symmetry_operations=symmetry_operations, cell=cell, wrap=False, solvent_components=solvent_components, remove_solvent=False, molecule_graphs=updated_molecule_graphs)
+
+	# Ninth, check that no more atoms were added to the crystal, as only atoms should have been removed (and hydrogens added in their place)
+	#        * If missing hydrogens have been added to the alpha carbons, the crystal may contain more atoms than before.
+	if (not add_hydrogens_to_alpha_carbons) and (len(new_crystal) > no_of_atoms_in_crystal):
+		raise Exception('Error: The crystal contains more atoms after sidechains were removed than the original crystal. This should happen. Check your crystal file.')
+
+	# Tenth, wrap the atoms in the crystal so that all atoms are found inside the unit cell.
+	if wrap:
+		new_crystal.wrap()
+
+	# Eleventh, add the node and edge properties of the crystal from the crystal_graph into the crystal ASE object itself. 
+	with time_stage('add_graph_to_ASE_Atoms_object'):
+		add_graph_to_ASE_Atoms_object(new_crystal, new_crystal_graph)
+	add_stage_count('atoms_in_new_crystal', len(new_crystal))
+
+	# Twelfth, return the crystal without aliphatic sidechains, along with its molecules.
+	return new_crystal, updated_molecules, updated_molecule_graphs, solvent_components
+
+# -----------------------------------------------------------------------------------------------------------------------------
+
+def make_SolventsList(SolventsList):
+	"""
+	This method is designed to require that SolventsList is a list, even if their is only one value in the list.
+
+	Parameters
+	----------
+	SolventsList : list of ints, np.int64
+		This is the SolventsList to convert to a list.
+
+	Returns
+	-------
+	SolventsList : list of ints
+		This is the SolventsList as a list.
+	"""
+	if isinstance(SolventsList,np.int64):
+		return [int(SolventsList)]
+	return SolventsList
+
+# -----------------------------------------------------------------------------------------------------------------------------
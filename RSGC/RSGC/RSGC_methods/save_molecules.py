@@ -0,0 +1,89 @@
+"""
+save_molecules.py, Geoffrey Weal, 17/10/26
+
+This script is designed to save the molecules of a crystal individually.
+"""
+import os
+
+from ase.io import write
+
+from SUMELF import make_folder
+from SUMELF import add_graph_to_ASE_Atoms_object
+
+def save_molecules(updated_molecules, updated_molecule_graphs, solvent_components, molecules_folderpath):
+	"""
+	This method is designed to save the molecules of a crystal individually.
+
+	Each molecule is saved as "<molecule_name>.xyz", or "<molecule_name>S.xyz" if the molecule is a solvent.
+
+	Parameters
+	----------
+	updated_molecules : dict. of ase.Atoms
+		This is the dict. of molecules in the crystal.
+	updated_molecule_graphs : dict. of networkx.Graph
+		This is the dict that contains the graph of each molecule in the updated_molecules dictionary.
+	solvent_components : list of int.
+		This list contains the names of all the solvents in the updated_molecules dictionary.
+	molecules_folderpath : str.
+		This is the folder to save the molecules into.
+
+	Returns
+	-------
+	molecule_filepaths : list of str.
+		These are the paths to the molecule files that were saved.
+	"""
+
+	# First, create the folder to store molecule xyz data to.
+	make_folder(molecules_folderpath)
+
+	# Second, save each molecule from the crystal to disk.
+	molecule_filepaths = []
+	for molecule_name, updated_molecule in updated_molecules.items():
+		molecule_filepath = save_molecule(molecule_name, updated_molecule, updated_molecule_graphs[molecule_name], solvent_components, molecules_folderpath)
+		molecule_filepaths.append(molecule_filepath)
+
+	# Third, return the paths to the molecule files.
+	return molecule_filepaths
+
+def save_molecule(molecule_name, updated_molecule, updated_molecule_graph, solvent_components, molecules_folderpath, copy_molecule=False):
+	"""
+	This method is designed to save a molecule of a crystal, as "<molecule_name>.xyz", or "<molecule_name>S.xyz" if the molecule is a solvent.
+
+	The folder to save the molecule into must already exist.
+
+	Parameters
+	----------
+	molecule_name : int
+		This is the name of the molecule.
+	updated_molecule : ase.Atoms
+		This is the molecule.
+	updated_molecule_graph : networkx.Graph
+		This is the graph of the molecule.
+	solvent_components : list of int.
+		This list contains the names of all the solvents in the crystal.
+	molecules_folderpath : str.
+		This is the folder to save the molecule into.
+	copy_molecule : bool.
+		If True, the node and edge information of the graph are added to a copy of the molecule, so that updated_molecule is not changed. This is used if the molecule is saved before the crystal is made from it. Default: False.
+
+	Returns
+	-------
+	molecule_filepath : str.
+		This is the path to the molecule file that was saved.
+	"""
+
+	# First, add the node and edge information from the molecules graph back to the molecule.
+	if copy_molecule:
+		updated_molecule = updated_molecule.copy()
+	add_graph_to_ASE_Atoms_object(updated_molecule, updated_molecule_graph)
+
+	# Second, save the molecule to disk.
+	#         * Any file already there is removed first, as it may be hard-linked to a file in the cache.
+	solvent_tag = 'S' if molecule_name in solvent_components else ''
+	molecule_filepath = molecules_folderpath+'/'+str(molecule_name)+str(solvent_tag)+'.xyz'
+	if os.path.lexists(molecule_filepath):
+		os.remove(molecule_filepath)
+	write(molecule_filepath, updated_molecule)
+
+	# Third, return the path to the molecule file.
+	return molecule_filepath
@@ -0,0 +1,134 @@
+"""
+RSGC_on_multiple_structures.py, Geoffrey Weal, 17/10/26
+
+This program will remove aliphatic sidechains from every crystal structure in a file that contains many structures (such as an extxyz trajectory or a CIF file with many data blocks).
+"""
+import os
+import traceback
+
+from ase.io import write
+
+from SUMELF import make_folder
+
+from RSGC.RSGC.RSGC_methods.remove_sidegroups_from_crystal import remove_sidegroups_from_crystal
+from RSGC.RSGC.RSGC_methods.save_molecules                 import save_molecules
+from RSGC.RSGC.RSGC_methods.RSGC_Database                  import RSGC_Database
+from RSGC.RSGC.RSGC_methods.read_structures                import read_structures
+from RSGC.RSGC.Hydrogen_in_Ring_Exception                  import Hydrogen_in_Ring_Exception
+from RSGC.RSGC.Problematic_Molecules_Exception             import Problematic_Molecules_Exception
+from RSGC.RSGC.Unexpected_Coordination_Exception           import Unexpected_Coordination_Exception
+
+def RSGC_on_multiple_structures(filepath, save_crystal_folderpath='crystals_with_sidechains_removed', index=':', leave_as_ethyls=False, add_hydrogens_to_alpha_carbons=False, save_molecules_individually=False, wrap=False, no_of_cpus=1, process_equivalent_molecules_once=False, sidegroup_roles_memo_filepath=None, problematic_molecules_policy='skip_crystal', quarantine_folderpath=None, output_database_filepath=None, use_embedded_graph=False, check_embedded_graph=False, bonding_method='obtain_graph'):
+	"""
+	This method is designed to remove aliphatic sidechains from every crystal structure in a file that contains many structures.
+
+	The structures are read one at a time, and each crystal with sidegroups removed is appended to the output file as soon as it has been made.
+	This means that only one structure is held in memory at a time, no matter how many structures are in the file.
+
+	The crystals are all saved into one extxyz file called "<name>_with_sidechains_removed.xyz". The index of the structure in the original file is recorded as "frame_index" in the info of each crystal.
+	This is the position of the structure in the whole file, even if only some of the structures are given by index (for example, index='2:4' gives frame_index 2 and 3).
+	If there is an issue with a structure (including if it can not be read), the issue is recorded and this structure is not included in the output file, and the other structures continue to be processed.
+
+	Parameters
+	----------
+	filepath : str.
+		This is the path to the file that contains the crystal structures.
+	save_crystal_folderpath : str.
+		This is the folder path to save the crystals with sidegroups removed into.
+	index : str. or int
+		These are the structures in the file to remove sidegroups from, given in the same way as for ase.io.iread. Default: ':' (all structures).
+	leave_as_ethyls : bool.
+		If False, all sidegroups will be left as methyl. If true, they will be given as ethyl (to their beta carbon). Default: False.
+	add_hydrogens_to_alpha_carbons : bool.
+		If True, add any missing hydrogens to the sp3 carbons at the end of the sidegroups that have been shortened. Default: False.
+	save_molecules_individually : bool.
+		This tag indicates if you also want to save the molecules in each crystal individually. These are saved in a folder for each structure. Default: False.
+	wrap : bool.
+		If true, wrap the molecule in the unit cell. If false, keep the molecule in its connected form. Default: False.
+	no_of_cpus : int.
+		This is the number of processes to remove sidegroups from the molecules of each crystal with. Default: 1.
+	process_equivalent_molecules_once : bool.
+		If True, molecules in a crystal that are equivalent to each other are only fully processed once, and the result is reused for the other equivalent molecules. Default: False.
+	sidegroup_roles_memo_filepath : str. or None
+		This is the path to a sqlite database file that records the sidegroup roles of molecules, so that they can be reused for the same molecule in other structures. If None, no memo is used. Default: None.
+	problematic_molecules_policy : str.
+		This is what to do if a molecule in the crystal has no atoms in it, either 'interactive', 'skip_molecule', 'skip_crystal', or 'fail'. See check_molecules for more information. Default: 'skip_crystal'.
+	quarantine_folderpath : str. or None
+		This is the path to the folder to save problematic molecules into, along with the reason they are problematic. If None, problematic molecules are not saved. Default: None.
+	output_database_filepath : str. or None
+		This is the path to an ASE database file to save the crystals (and their molecules if save_molecules_individually is True) into, rather than into the extxyz file. Each crystal is labelled with its frame_index in the database. If None, the extxyz file is saved. Default: None.
+	use_embedded_graph : bool.
+		If True and a crystal file already contains the graph of the crystal (such as those made by ReCrystals and ACSD), the graph is obtained from the crystal file rather than with obtain_graph. Default: False.
+	check_embedded_graph : bool.
+		If True, check that some of the bonds in the graph given in the crystal file are not much longer than a covalent bond before using it. Only used if use_embedded_graph is True. Default: False.
+	bonding_method : str.
+		This is the method used to obtain the graph of the crystal, either 'obtain_graph' (from SUMELF) or 'cell_list', which finds the bonds between atoms closer than 1.2 times the sum of their covalent radii using a KD-tree (if scipy is installed) or the cell list of ASE. 'cell_list' is faster for large unit cells, but only gives the element of each atom in the graph. See get_cell_list_graph for more information. Default: 'obtain_graph'.
+
+	Returns
+	-------
+	results : list of (int, str., str. or None)
+		These are the results for each structure, given in the same order as in the file. Each result contains the index of the structure in the file, the outcome ('successful', 'Hydrogen_in_Ring_Exception', 'Problematic_Molecules_Exception', 'Unexpected_Coordination_Exception', or 'failed') and the issue message (None if successful).
+	"""
+
+	# First, obtain the name of the file and the path to save the crystals to.
+	filepath_without_ext = '.'.join(filepath.split('.')[:-1])
+	crystal_name = filepath_without_ext.split('/')[-1]
+	crystal_filepath = save_crystal_folderpath+'/'+crystal_name+'_with_sidechains_removed.xyz'
+
+	# Second, make the folder to place the editted crystals in, and remove any file (or crystals in the database) from a previous run, as crystals are appended to this file.
+	if output_database_filepath is not None:
+		output_database = RSGC_Database(output_database_filepath)
+		output_database.remove(crystal_name)
+	else:
+		make_folder(save_crystal_folderpath)
+		if os.path.lexists(crystal_filepath):
+			os.remove(crystal_filepath)
+
+	# Third, remove the aliphatic sidegroups from each structure in the file, one structure at a time.
+	results = []
+	for frame_index, crystal, read_issue in read_structures(filepath, index=index):
+		print('Looking at structure '+str(frame_index)+' in '+str(filepath))
+
+		# 3.1: If this structure could not be read, record the issue and move on to the next structure.
+		if read_issue is not None:
+			results.append((frame_index, 'failed', 'Could not read this structure: '+str(read_issue)))
+			continue
+
+		# 3.2: Remove the aliphatic sidegroups from the molecules in this structure.
+		try:
+			new_crystal, updated_molecules, updated_molecule_graphs, solvent_components = remove_sidegroups_from_crystal(crystal, filepath+'@'+str(frame_index), leave_as_ethyls=leave_as_ethyls, add_hydrogens_to_alpha_carbons=add_hydrogens_to_alpha_carbons, wrap=wrap, no_of_cpus=no_of_cpus, process_equivalent_molecules_once=process_equivalent_molecules_once, sidegroup_roles_memo_filepath=sidegroup_roles_memo_filepath, problematic_molecules_policy=problematic_molecules_policy, quarantine_folderpath=quarantine_folderpath, use_embedded_graph=use_embedded_graph, check_embedded_graph=check_embedded_graph, bonding_method=bonding_method)
+		except Hydrogen_in_Ring_Exception as exception_message:
+			results.append((frame_index, 'Hydrogen_in_Ring_Exception', str(exception_message)))
+			continue
+		except Problematic_Molecules_Exception as exception_message:
+			results.append((frame_index, 'Problematic_Molecules_Exception', str(exception_message)))
+			continue
+		except Unexpected_Coordination_Exception as exception_message:
+			results.append((frame_index, 'Unexpected_Coordination_Exception', str(exception_message)))
+			continue
+		except Exception as exception_message:
+			results.append((frame_index, 'failed', str(exception_message)+'\n'+traceback.format_exc()))
+			continue
+
+		# 3.3: Append this crystal to the file of crystals with sidegroups removed, or save it (and its molecules) into the database.
+		new_crystal.info['frame_index'] = frame_index
+		if output_database_filepath is not None:
+			output_database.save(crystal_name, new_crystal, updated_molecules=(updated_molecules if save_molecules_individually else None), updated_molecule_graphs=updated_molecule_graphs, solvent_components=solvent_components, frame_index=frame_index, replace=False)
+		else:
+			write(crystal_filepath, new_crystal, format='extxyz', append=True)
+
+		# 3.4: If save_molecules_individually is set to True, save the individual molecules in a folder for this structure.
+		if save_molecules_individually and (output_database_filepath is None):
+			save_molecules(updated_molecules, updated_molecule_graphs, solvent_components, save_crystal_folderpath+'_molecules'+'/'+crystal_name+'/'+str(frame_index))
+
+		# 3.5: Record that this structure was processed successfully.
+		results.append((frame_index, 'successful', None))
+
+	# Fourth, report the number of successful structures.
+	no_of_successful = len([outcome for _, outcome, _ in results if (outcome == 'successful')])
+	print('========================')
+	print('Number of successful structures: '+str(no_of_successful)+' out of '+str(len(results)))
+
+	# Fifth, return the results for each structure.
+	return results
+
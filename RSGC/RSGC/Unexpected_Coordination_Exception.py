@@ -0,0 +1,8 @@
+"""
+Unexpected_Coordination_Exception.py, Geoffrey Weal, 17/10/26
+
+This exception is raised when an atom in a molecule is bonded to an unexpected number or type of atoms (such as a carbon with more than four neighbours), so hydrogens can not be added to it.
+"""
+
+class Unexpected_Coordination_Exception(Exception):
+	pass
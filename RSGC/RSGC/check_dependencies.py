@@ -0,0 +1,94 @@
+"""
+check_dependencies.py, Geoffrey Weal, 17/10/26
+
+This script is designed to check that the programs needed by a part of the RSGC program are installed, only when that part of the RSGC program is first used.
+"""
+from importlib      import import_module
+from importlib.util import find_spec
+
+# These are the programs that the RSGC program needs, along with the smallest version of each program that can be used (None if any version can be used).
+dependencies = {'numpy': None, 'ase': '3.19.0', 'networkx': None, 'tqdm': None, 'packaging': None, 'SUMELF': None}
+
+# These are the websites that give instructions on how to install each program, if it can not be installed through pip.
+install_websites = {'SUMELF': 'https://github.com/geoffreyweal/SUMELF'}
+
+# This records the programs that have already been checked, so that each program is only checked once.
+checked_dependencies = set()
+
+def check_dependencies(dependency_names):
+	"""
+	This method is designed to check that the programs given are installed, and that they are new enough to be used by the RSGC program.
+
+	Only find_spec is used to check that a program is installed, so programs are not imported by this method unless their version needs to be checked.
+	Each program is only checked once.
+
+	Parameters
+	----------
+	dependency_names : list of str.
+		These are the names of the programs to check.
+
+	Raises
+	------
+	ImportError
+		If a program is not installed, or is older than the smallest version that can be used.
+	"""
+
+	# First, go through each program that has not been checked yet.
+	from RSGC import __version__
+	for dependency_name in dependency_names:
+		if dependency_name in checked_dependencies:
+			continue
+
+		# 1.1: Check that this program is installed.
+		if find_spec(dependency_name) is None:
+			raise ImportError(get_dependency_message(dependency_name, 'The Remove Sidechain Groups from Crystals (RSGC) Program requires the "'+str(dependency_name)+'" program.', __version__))
+
+		# 1.2: Check that this program is new enough, if needed.
+		minimum_version = dependencies.get(dependency_name, None)
+		if minimum_version is not None:
+			#      * This program is imported to obtain its version, as it is about to be imported by the part of the RSGC program that needs it anyway.
+			from packaging import version
+			installed_version = import_module(dependency_name).__version__
+			if version.parse(installed_version) < version.parse(minimum_version):
+				raise ImportError(get_dependency_message(dependency_name, 'The Remove Sidechain Groups from Crystals (RSGC) Program requires '+str(dependency_name)+' greater than or equal to '+str(minimum_version)+'.\nThe current version of '+str(dependency_name)+' you are using is '+str(installed_version)+'.', __version__))
+
+		# 1.3: Record that this program has been checked.
+		checked_dependencies.add(dependency_name)
+
+def get_dependency_message(dependency_name, problem, RSGC_version):
+	"""
+	This method is designed to give the message to show the user if a program needed by the RSGC program is not installed, or is too old.
+
+	Parameters
+	----------
+	dependency_name : str.
+		This is the name of the program.
+	problem : str.
+		This is the description of the problem with this program.
+	RSGC_version : str.
+		This is the version of the RSGC program.
+
+	Returns
+	-------
+	toString : str.
+		This is the message to show the user.
+	"""
+	toString = ''
+	toString += '\n'
+	toString += '================================================'+'\n'
+	toString += 'This is the Remove Sidechain Groups from Crystals (RSGC) Program'+'\n'
+	toString += 'Version: '+str(RSGC_version)+'\n'
+	toString += '\n'
+	toString += problem+'\n'
+	toString += '\n'
+	if dependency_name in install_websites:
+		toString += 'Install '+str(dependency_name)+' by following the instructions in '+str(install_websites[dependency_name])+'\n'
+	else:
+		toString += 'Install '+str(dependency_name)+' through pip by following the instruction in https://github.com/GardenGroupUO/RSGC'+'\n'
+		toString += 'These instructions will ask you to install '+str(dependency_name)+' by typing the following into your terminal\n'
+		toString += '\n'
+		toString += 'pip3 install --user --upgrade '+str(dependency_name)+'\n'
+	toString += '\n'
+	toString += 'This program will exit before beginning'+'\n'
+	toString += '================================================'+'\n'
+	return toString
@@ -0,0 +1,188 @@
+"""
+Sidegroup_Roles_Memo.py, Geoffrey Weal, 17/10/26
+
+This class is designed to record the sidegroup roles of molecules in a sqlite database, so that they can be reused for the same molecule in other crystals.
+"""
+import os, json, sqlite3
+from contextlib import closing
+
+from networkx import Graph, weisfeiler_lehman_graph_hash, vf2pp_isomorphism
+
+from RSGC.RSGC.remove_sidechains_methods.get_equivalent_molecules import get_element_graph
+from RSGC                                                         import __version__
+
+class Sidegroup_Roles_Memo:
+	"""
+	This class is designed to record the sidegroup roles of molecules in a sqlite database, so that they can be reused for the same molecule in other crystals.
+
+	The same molecule is often found in many crystals (such as in polymorphs, solvates, and redeterminations of the same crystal). The sidegroup roles of a molecule
+	(its rings, sp3 carbons, atoms to remove, and atoms to turn into hydrogens) are recorded along with the graph of the molecule, labelled with the element of each atom.
+	Entries are looked up by the Weisfeiler-Lehman hash of this labelled graph, the leave_as_ethyls setting, and the version of the RSGC program. The graph isomorphism
+	between the recorded molecule and the molecule being looked up is then used to map the sidegroup roles onto the molecule being looked up.
+
+	The sidegroup roles obtained from this memo are used in the same way as those of an equivalent molecule in the same crystal, so the sp3 carbons of each molecule are
+	still checked against its own geometry (see remove_aliphatic_sidegroups_using_equivalent_molecule).
+
+	Parameters
+	----------
+	memo_filepath : str.
+		This is the path to the sqlite database file to record sidegroup roles in. This is created if it does not exist.
+
+	Attributes
+	----------
+	memo_filepath : str.
+		This is the path to the sqlite database file to record sidegroup roles in.
+	"""
+	def __init__(self, memo_filepath):
+
+		# First, record the path to the sqlite database.
+		self.memo_filepath = memo_filepath
+
+		# Second, make the table for recording sidegroup roles if it does not exist yet.
+		memo_folderpath = os.path.dirname(self.memo_filepath)
+		if memo_folderpath != '':
+			os.makedirs(memo_folderpath, exist_ok=True)
+		with closing(self.connect()) as connection, connection:
+			connection.execute('CREATE TABLE IF NOT EXISTS sidegroup_roles (graph_hash TEXT, leave_as_ethyls INTEGER, version TEXT, element_graph TEXT, sidegroup_roles TEXT)')
+			connection.execute('CREATE INDEX IF NOT EXISTS sidegroup_roles_index ON sidegroup_roles (graph_hash, leave_as_ethyls, version)')
+
+	def connect(self):
+		"""
+		This method will connect to the sqlite database.
+
+		A new connection is made each time, so that this memo can be used by many processes at the same time.
+
+		Returns
+		-------
+		connection : sqlite3.Connection
+			This is the connection to the sqlite database.
+		"""
+		return sqlite3.connect(self.memo_filepath, timeout=60.0)
+
+	def lookup(self, molecule, molecule_graph, leave_as_ethyls):
+		"""
+		This method will look up the sidegroup roles of a molecule in this memo.
+
+		Parameters
+		----------
+		molecule : ase.Atoms
+			This is the molecule.
+		molecule_graph : networkx.Graph
+			This is the graph of this molecule.
+		leave_as_ethyls : bool.
+			If False, all sidegroups will be left as methyl. If true, they will be given as ethyl (to their beta carbon).
+
+		Returns
+		-------
+		sidegroup_roles : dict. or None
+			These are the rings, sp3 carbons, atoms to remove, and atoms to turn into hydrogens of the recorded molecule. None if this molecule is not in the memo.
+		mapping : dict. or None
+			This maps the atom indices of the recorded molecule to the atom indices of this molecule. None if this molecule is not in the memo.
+		"""
+
+		# First, obtain the labelled graph of this molecule and its hash.
+		element_graph = get_element_graph(molecule, molecule_graph)
+		graph_hash = weisfeiler_lehman_graph_hash(element_graph, node_attr='E')
+
+		# Second, obtain the recorded molecules with the same hash.
+		with closing(self.connect()) as connection:
+			entries = connection.execute('SELECT element_graph, sidegroup_roles FROM sidegroup_roles WHERE graph_hash = ? AND leave_as_ethyls = ? AND version = ?', (graph_hash, int(leave_as_ethyls), __version__)).fetchall()
+
+		# Third, determine if this molecule is the same as any of the recorded molecules.
+		for recorded_element_graph, recorded_sidegroup_roles in entries:
+			mapping = vf2pp_isomorphism(self.get_graph_from_json(recorded_element_graph), element_graph, node_label='E')
+			if mapping is not None:
+				return self.get_sidegroup_roles_from_json(recorded_sidegroup_roles), mapping
+
+		# Fourth, this molecule is not in the memo.
+		return None, None
+
+	def save(self, molecule, molecule_graph, leave_as_ethyls, sidegroup_roles):
+		"""
+		This method will record the sidegroup roles of a molecule in this memo.
+
+		Parameters
+		----------
+		molecule : ase.Atoms
+			This is the molecule.
+		molecule_graph : networkx.Graph
+			This is the graph of this molecule.
+		leave_as_ethyls : bool.
+			If False, all sidegroups will be left as methyl. If true, they will be given as ethyl (to their beta carbon).
+		sidegroup_roles : dict.
+			These are the rings, sp3 carbons, atoms to remove, and atoms to turn into hydrogens of this molecule.
+		"""
+
+		# First, if this molecule is already in the memo, there is nothing to do.
+		if self.lookup(molecule, molecule_graph, leave_as_ethyls)[0] is not None:
+			return
+
+		# Second, obtain the labelled graph of this molecule and its hash.
+		element_graph = get_element_graph(molecule, molecule_graph)
+		graph_hash = weisfeiler_lehman_graph_hash(element_graph, node_attr='E')
+
+		# Third, record this molecule and its sidegroup roles.
+		element_graph_json   = json.dumps({'symbols': molecule.get_chemical_symbols(), 'bonds': [[int(index1), int(index2)] for index1, index2 in element_graph.edges()]})
+		sidegroup_roles_json = json.dumps({role: self.get_ints(values) for role, values in sidegroup_roles.items()})
+		with closing(self.connect()) as connection, connection:
+			connection.execute('INSERT INTO sidegroup_roles VALUES (?, ?, ?, ?, ?)', (graph_hash, int(leave_as_ethyls), __version__, element_graph_json, sidegroup_roles_json))
+
+	# -----------------------------------------------------------------------------------------------------------------------------
+
+	def get_graph_from_json(self, element_graph_json):
+		"""
+		This method will obtain the labelled graph of a recorded molecule.
+
+		Parameters
+		----------
+		element_graph_json : str.
+			This is the labelled graph of the recorded molecule, as recorded in the memo.
+
+		Returns
+		-------
+		element_graph : networkx.Graph
+			This is the graph of the recorded molecule, where each node is labelled with its element ('E').
+		"""
+		element_graph_information = json.loads(element_graph_json)
+		element_graph = Graph()
+		element_graph.add_nodes_from((index, {'E': symbol}) for index, symbol in enumerate(element_graph_information['symbols']))
+		element_graph.add_edges_from((index1, index2) for index1, index2 in element_graph_information['bonds'])
+		return element_graph
+
+	def get_sidegroup_roles_from_json(self, sidegroup_roles_json):
+		"""
+		This method will obtain the sidegroup roles of a recorded molecule.
+
+		Parameters
+		----------
+		sidegroup_roles_json : str.
+			These are the sidegroup roles of the recorded molecule, as recorded in the memo.
+
+		Returns
+		-------
+		sidegroup_roles : dict.
+			These are the rings, sp3 carbons, atoms to remove, and atoms to turn into hydrogens of the recorded molecule.
+		"""
+		sidegroup_roles = json.loads(sidegroup_roles_json)
+		sidegroup_roles['atoms_to_turn_into_hydrogens'] = [tuple(outer_and_inner_indices) for outer_and_inner_indices in sidegroup_roles['atoms_to_turn_into_hydrogens']]
+		return sidegroup_roles
+
+	def get_ints(self, values):
+		"""
+		This method will convert the indices in a sidegroup role into ints, so that they can be recorded as json.
+
+		Parameters
+		----------
+		values : list
+			These are the indices in a sidegroup role. These can be given in nested lists and tuples.
+
+		Returns
+		-------
+		values : list
+			These are the indices in the sidegroup role, given as ints in nested lists.
+		"""
+		if isinstance(values, (list, tuple)):
+			return [self.get_ints(value) for value in values]
+		return int(values)
+
+# -----------------------------------------------------------------------------------------------------------------------------
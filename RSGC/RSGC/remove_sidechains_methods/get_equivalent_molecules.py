@@ -0,0 +1,77 @@
+"""
+get_equivalent_molecules.py, Geoffrey Weal, 17/10/26
+
+This script is designed to group the molecules in a crystal that are equivalent to each other (such as molecules that are symmetric copies of each other in the crystal).
+"""
+from networkx import Graph, weisfeiler_lehman_graph_hash, vf2pp_isomorphism
+
+def get_equivalent_molecules(molecules, molecule_graphs, molecule_names):
+	"""
+	This method is designed to group the molecules in a crystal that are equivalent to each other.
+
+	Two molecules are equivalent if their graphs are isomorphic, where the element of each atom must also match.
+
+	Parameters
+	----------
+	molecules : dict. of ase.Atoms
+		This is the dict. of molecules in the crystal.
+	molecule_graphs : dict. of networkx.Graph
+		This is the dict that contains the graph of each molecule in the molecules dictionary.
+	molecule_names : list of int.
+		These are the names of the molecules you want to group together.
+
+	Returns
+	-------
+	equivalent_molecules : dict.
+		The keys of this dictionary are the names of the representative molecule of each group. The values are lists of (molecule_name, mapping) for each other molecule in the group, where mapping maps the atom indices of the representative molecule to the atom indices of the other molecule.
+	"""
+
+	# First, initialise the dictionaries for recording the representative molecules and their equivalent molecules.
+	equivalent_molecules = {}
+	representatives_by_hash = {}
+	element_graphs = {}
+
+	# Second, go through each molecule in order of its name.
+	for molecule_name in sorted(molecule_names):
+
+		# 2.1: Obtain the graph of this molecule labelled with the element of each atom.
+		element_graph = get_element_graph(molecules[molecule_name], molecule_graphs[molecule_name])
+		element_graphs[molecule_name] = element_graph
+
+		# 2.2: Obtain a hash of this labelled graph. Equivalent molecules will always have the same hash.
+		graph_hash = weisfeiler_lehman_graph_hash(element_graph, node_attr='E')
+
+		# 2.3: Determine if this molecule is equivalent to any of the representative molecules with the same hash.
+		for representative_name in representatives_by_hash.setdefault(graph_hash, []):
+			mapping = vf2pp_isomorphism(element_graphs[representative_name], element_graph, node_label='E')
+			if mapping is not None:
+				equivalent_molecules[representative_name].append((molecule_name, mapping))
+				break
+		else:
+			# 2.4: This molecule is not equivalent to any of the current representative molecules, so it is a new representative molecule.
+			representatives_by_hash[graph_hash].append(molecule_name)
+			equivalent_molecules[molecule_name] = []
+
+	# Third, return the equivalent molecules.
+	return equivalent_molecules
+
+def get_element_graph(molecule, molecule_graph):
+	"""
+	This method is designed to obtain a graph of the molecule that only contains the element of each atom and the bonds between atoms.
+
+	Parameters
+	----------
+	molecule : ase.Atoms
+		This is the molecule.
+	molecule_graph : networkx.Graph
+		This is the graph of this molecule.
+
+	Returns
+	-------
+	element_graph : networkx.Graph
+		This is the graph of the molecule, where each node is labelled with its element ('E').
+	"""
+	element_graph = Graph()
+	element_graph.add_nodes_from((index, {'E': symbol}) for index, symbol in enumerate(molecule.get_chemical_symbols()))
+	element_graph.add_edges_from(molecule_graph.edges())
+	return element_graph
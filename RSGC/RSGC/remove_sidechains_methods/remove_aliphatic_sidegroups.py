@@ -3,17 +3,16 @@ general_methods.py, Geoffrey Weal, 19/2/22
 
 This script is designed to modify the aliphatic sidegroups of your OPV molecule. 
 """
-from copy import deepcopy
-
-from RSGC.RSGC.remove_sidechains_methods.remove_aliphatic_sidegroups_methods.get_list_of_rings                        import get_list_of_rings
+from RSGC.RSGC.remove_sidechains_methods.remove_aliphatic_sidegroups_methods.Compact_Molecule                         import Compact_Molecule
+from RSGC.RSGC.remove_sidechains_methods.remove_aliphatic_sidegroups_methods.get_list_of_rings                        import get_list_of_rings, hydrogen_in_ring_error_checking
 from RSGC.RSGC.remove_sidechains_methods.remove_aliphatic_sidegroups_methods.determine_flat_rings_in_molecule         import determine_flat_rings_in_molecule
 from RSGC.RSGC.remove_sidechains_methods.remove_aliphatic_sidegroups_methods.get_sp3_carbons                          import get_sp3_carbons
-from RSGC.RSGC.remove_sidechains_methods.remove_aliphatic_sidegroups_methods.determine_atoms_between_moieties_to_keep import determine_atoms_between_moieties_to_keep
-from RSGC.RSGC.remove_sidechains_methods.remove_aliphatic_sidegroups_methods.get_alpha_beta_and_gamma_atoms           import get_alpha_beta_and_gamma_atoms
+from RSGC.RSGC.remove_sidechains_methods.remove_aliphatic_sidegroups_methods.get_atoms_to_remove_from_molecule        import get_atoms_to_remove_from_molecule
 from RSGC.RSGC.remove_sidechains_methods.remove_aliphatic_sidegroups_methods.remove_atoms_from_molecule               import remove_atoms_from_molecule
 from RSGC.RSGC.remove_sidechains_methods.remove_aliphatic_sidegroups_methods.add_hydrogens_to_alpha_carbons_method    import add_hydrogens_to_alpha_carbons_method
+from RSGC.RSGC.RSGC_methods.Stage_Timer                                                                        import time_stage, add_stage_count
 
-def remove_aliphatic_sidegroups(original_molecule, original_molecule_graph, filepath, leave_as_ethyls=False):
+def remove_aliphatic_sidegroups(original_molecule, original_molecule_graph, filepath, leave_as_ethyls=False, add_hydrogens_to_alpha_carbons=False, return_sidegroup_roles=False):
 	"""
 	This method will remove all the aliphatic carbon sidechains from the OPV. 
 	Only the alpha carbon will be kept from the aliphatic sidegroup. 
@@ -28,6 +27,10 @@ def remove_aliphatic_sidegroups(original_molecule, original_molecule_graph, file
 		This is the path to the crystal file of interest.
 	leave_as_ethyls : bool.
 		If False, all sidegroups will be left as methyl. If true, they will be given as ethyl (to their beta carbon). 
+	add_hydrogens_to_alpha_carbons : bool.
+		If True, add any missing hydrogens to the sp3 carbons at the end of the sidegroups that have been shortened, so that these carbons have four neighbours. Default: False.
+	return_sidegroup_roles : bool.
+		If True, also return the rings, sp3 carbons, atoms to remove, and atoms to turn into hydrogens that were determined for this molecule. Default: False.
 
 	Returns
 	-------
@@ -35,95 +38,181 @@ def remove_aliphatic_sidegroups(original_molecule, original_molecule_graph, file
 		This is the molecule with aliphatic carbons removed
 	molecule_graph : networkx.Graph
 		This is the modified graph of this molecule.
+	sidegroup_roles : dict.
+		This contains the rings, sp3 carbons, atoms to remove, and atoms to turn into hydrogens in this molecule. Only given if return_sidegroup_roles is True.
 	"""
 
-	# Preliminary Step: make a copy of molecule, molecule_graph
-	molecule       = original_molecule.copy()
-	molecule_graph = deepcopy(original_molecule_graph)
+	# Preliminary Step: the molecule and graph do not need to be copied, as remove_atoms_from_molecule makes a new molecule and graph.
+	molecule       = original_molecule
+	molecule_graph = original_molecule_graph
+
+	# Preliminary Step: obtain the compact form of the molecule, which is used to determine which atoms to remove from the molecule.
+	#                   * The time taken by each step, and the number of rings, sp3 carbons, and atoms removed, are recorded if stage times are being recorded (see Stage_Timer).
+	with time_stage('Compact_Molecule'):
+		compact_molecule = Compact_Molecule(molecule, molecule_graph)
 
 	# First, obtains all the rings that are 7 atoms or less in size in the molecule.
-	rings_in_molecule = get_list_of_rings(molecule, molecule_graph, filepath)
+	with time_stage('get_list_of_rings'):
+		rings_in_molecule = get_list_of_rings(compact_molecule, filepath)
 
 	# Second, determine which rings are flat(ish). This will indicate if they are conjugated rings or not.
-	flat_rings_in_molecule = determine_flat_rings_in_molecule(rings_in_molecule, molecule)
+	with time_stage('determine_flat_rings_in_molecule'):
+		flat_rings_in_molecule = determine_flat_rings_in_molecule(rings_in_molecule, compact_molecule)
+
+	# Third, determine which carbons are sp3.
+	with time_stage('get_sp3_carbons'):
+		sp3_carbons = get_sp3_carbons(compact_molecule)
+
+	# Fourth, determine the atoms to remove from the molecule, and the atoms to turn into hydrogens.
+	with time_stage('get_atoms_to_remove_from_molecule'):
+		atoms_to_remove, atoms_to_turn_into_hydrogens = get_atoms_to_remove_from_molecule(compact_molecule, rings_in_molecule, sp3_carbons, leave_as_ethyls=leave_as_ethyls)
+
+	# Fifth, remove the branch atoms from the molecule. Hydrogens will be added in-place of any side-chains that have been removed by this method
+	with time_stage('remove_atoms_from_molecule'):
+		molecule, molecule_graph, branch_atoms_indices = remove_atoms_from_molecule(molecule, molecule_graph, atoms_to_remove, atoms_to_turn_into_hydrogens, remove_non_H_leaf_atoms=False, return_new_branch_indices=True)
+
+	# Sixth, add any missing hydrogens to sp3 carbons. Not all sp3 carbons may have all the required number of hydrogens bound to them due to Xray crystallography issues with sp3 carbons.
+	if add_hydrogens_to_alpha_carbons:
+		with time_stage('add_hydrogens_to_alpha_carbons'):
+			sp3_branch_atoms_indices = get_sp3_branch_atoms_indices(atoms_to_turn_into_hydrogens, branch_atoms_indices, sp3_carbons)
+			molecule, molecule_graph = add_hydrogens_to_alpha_carbons_method(molecule, molecule_graph, sp3_branch_atoms_indices, in_place=True)
+	add_sidegroup_counts(rings_in_molecule, sp3_carbons, atoms_to_remove, atoms_to_turn_into_hydrogens)
+
+	# Seventh, return the molecule without the side chains, and the molecule graph that is associated to this main component of the molecule
+	if return_sidegroup_roles:
+		sidegroup_roles = {'rings_in_molecule': rings_in_molecule, 'sp3_carbons': sp3_carbons, 'atoms_to_remove': atoms_to_remove, 'atoms_to_turn_into_hydrogens': atoms_to_turn_into_hydrogens}
+		return molecule, molecule_graph, sidegroup_roles
+	return molecule, molecule_graph
 
-	# Third, get all atoms that are not hydrogens or carbons.
-	non_hydrogen_and_carbon_atoms = [index for index in range(len(molecule)) if (molecule[index].symbol not in ['H', 'D', 'T', 'C'])]
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
 
-	# Fourth, determine other non-sp3 moieties in the molecules.
-	sp3_carbons = get_sp3_carbons(molecule, molecule_graph)
-	non_sp3_carbons = [index for index in range(len(molecule)) if ((molecule[index].symbol == 'C') and (index not in sp3_carbons))]
+def remove_aliphatic_sidegroups_using_equivalent_molecule(original_molecule, original_molecule_graph, filepath, equivalent_sidegroup_roles, mapping, leave_as_ethyls=False, add_hydrogens_to_alpha_carbons=False):
+	"""
+	This method will remove all the aliphatic carbon sidechains from the OPV, reusing the sidegroup roles of a molecule that is equivalent to this molecule.
 
-	# Fifth, determine all the atoms in the molecule that should be kept.
-	all_atom_of_moieties_to_keep = tuple(set([j for sub in rings_in_molecule for j in sub] + non_hydrogen_and_carbon_atoms + non_sp3_carbons))
+	The rings and the atoms between moieties only depend on the elements and bonding of the molecule, so these are mapped from the equivalent molecule.
+	The sp3 carbons depend on the geometry of the molecule, so they are always obtained for this molecule. If the sp3 carbons do not match those of the
+	equivalent molecule, the atoms to remove are determined for this molecule from scratch (using the mapped rings).
 
-	# Sixth, determine all the unique paths between the rings in your molecule
-	atoms_in_any_ring, atoms_between_rings = determine_atoms_between_moieties_to_keep(molecule, molecule_graph, all_atom_of_moieties_to_keep)
+	Parameters
+	----------
+	original_molecule : ase.Atoms
+		This is the molecule you want to remove the aliphatic carbons to.
+	original_molecule_graph : networkx.Graph
+		This is the graph of this molecule.
+	filepath : str.
+		This is the path to the crystal file of interest.
+	equivalent_sidegroup_roles : dict.
+		These are the sidegroup roles (see remove_aliphatic_sidegroups) of the equivalent molecule.
+	mapping : dict.
+		This maps the indices of the atoms in the equivalent molecule to the indices of the atoms in this molecule.
+	leave_as_ethyls : bool.
+		If False, all sidegroups will be left as methyl. If true, they will be given as ethyl (to their beta carbon).
+	add_hydrogens_to_alpha_carbons : bool.
+		If True, add any missing hydrogens to the sp3 carbons at the end of the sidegroups that have been shortened, so that these carbons have four neighbours. Default: False.
 
-	# Seventh, determine which atoms in the molecule are involved in branches
-	atoms_in_rings_and_between_rings = tuple(sorted(set(atoms_in_any_ring + atoms_between_rings)))
-	atoms_in_branches = tuple(sorted(set(range(len(molecule))) - set(atoms_in_rings_and_between_rings)))
+	Returns
+	-------
+	molecule : ase.Atoms
+		This is the molecule with aliphatic carbons removed
+	molecule_graph : networkx.Graph
+		This is the modified graph of this molecule.
+	"""
+
+	# Preliminary Step: the molecule and graph do not need to be copied, as remove_atoms_from_molecule makes a new molecule and graph.
+	molecule       = original_molecule
+	molecule_graph = original_molecule_graph
+
+	# Preliminary Step: obtain the compact form of the molecule, which is used to determine which atoms to remove from the molecule.
+	with time_stage('Compact_Molecule'):
+		compact_molecule = Compact_Molecule(molecule, molecule_graph)
+
+	# First, map the rings from the equivalent molecule onto this molecule, and check these rings for hydrogens.
+	with time_stage('map_rings_from_equivalent_molecule'):
+		rings_in_molecule = [[mapping[index] for index in ring] for ring in equivalent_sidegroup_roles['rings_in_molecule']]
+		hydrogen_in_ring_error_checking(rings_in_molecule, compact_molecule, filepath)
 
-	# Eighth, determine the alpha atoms. These are the atoms in atoms_in_branches are directly attached to a ring atom or a atom between rings.
-	alpha_atoms, beta_atoms, gamma_atoms, beta_alpha_atoms, gamma_beta_atoms = get_alpha_beta_and_gamma_atoms(atoms_in_branches, atoms_in_rings_and_between_rings, molecule_graph)
+	# Second, determine which carbons are sp3 in this molecule.
+	with time_stage('get_sp3_carbons'):
+		sp3_carbons = get_sp3_carbons(compact_molecule)
+
+	# Third, determine the atoms to remove from the molecule, and the atoms to turn into hydrogens.
+	if sorted(sp3_carbons) == sorted(mapping[index] for index in equivalent_sidegroup_roles['sp3_carbons']):
+
+		# 3.1: The sp3 carbons are the same as in the equivalent molecule, so the same atoms will be removed and turned into hydrogens.
+		atoms_to_remove = sorted(mapping[index] for index in equivalent_sidegroup_roles['atoms_to_remove'])
+		atoms_to_turn_into_hydrogens = [(mapping[outer_index], mapping[inner_index]) for outer_index, inner_index in equivalent_sidegroup_roles['atoms_to_turn_into_hydrogens']]
 
-	# Ninth, determine branch atoms to remove from the molecules
-	if leave_as_ethyls:
-		check_branches_have_atoms(atoms_in_branches, alpha_atoms + beta_atoms + gamma_atoms)
-		atoms_to_remove = sorted(set(atoms_in_branches) - set(alpha_atoms) - set(beta_atoms) - set(gamma_atoms))
-		atoms_to_turn_into_hydrogens = gamma_beta_atoms
 	else:
-		check_branches_have_atoms(atoms_in_branches, alpha_atoms + beta_atoms)
-		atoms_to_remove = sorted(set(atoms_in_branches) - set(alpha_atoms) - set(beta_atoms))
-		atoms_to_turn_into_hydrogens = beta_alpha_atoms
 
-	# Tenth, remove the branch atoms from the molecule. Hydrogens will be added in-place of any side-chains that have been removed by this method
-	molecule, molecule_graph, branch_atoms_indices = remove_atoms_from_molecule(molecule, molecule_graph, atoms_to_remove, atoms_to_turn_into_hydrogens, remove_non_H_leaf_atoms=False, return_new_branch_indices=True)
+		# 3.2: The geometry of this molecule gives different sp3 carbons to the equivalent molecule, so determine the atoms to remove for this molecule.
+		with time_stage('get_atoms_to_remove_from_molecule'):
+			atoms_to_remove, atoms_to_turn_into_hydrogens = get_atoms_to_remove_from_molecule(compact_molecule, rings_in_molecule, sp3_carbons, leave_as_ethyls=leave_as_ethyls)
 
-	# Eleventh, add any missing hydrogens to sp3 carbons. Not all sp3 carbons may have all the required number of hydrogens bound to them due to Xray crystallography issues with sp3 carbons. 
-	# molecule, molecule_graph = add_hydrogens_to_alpha_carbons_method(molecule, molecule_graph, new_alpha_atoms_indices)
+	# Fourth, remove the branch atoms from the molecule. Hydrogens will be added in-place of any side-chains that have been removed by this method
+	with time_stage('remove_atoms_from_molecule'):
+		molecule, molecule_graph, branch_atoms_indices = remove_atoms_from_molecule(molecule, molecule_graph, atoms_to_remove, atoms_to_turn_into_hydrogens, remove_non_H_leaf_atoms=False, return_new_branch_indices=True)
 
-	# Eleventh, return the molecule without the side chains, and the molecule graph that is associated to this main component of the molecule
+	# Fifth, add any missing hydrogens to sp3 carbons. Not all sp3 carbons may have all the required number of hydrogens bound to them due to Xray crystallography issues with sp3 carbons.
+	if add_hydrogens_to_alpha_carbons:
+		with time_stage('add_hydrogens_to_alpha_carbons'):
+			sp3_branch_atoms_indices = get_sp3_branch_atoms_indices(atoms_to_turn_into_hydrogens, branch_atoms_indices, sp3_carbons)
+			molecule, molecule_graph = add_hydrogens_to_alpha_carbons_method(molecule, molecule_graph, sp3_branch_atoms_indices, in_place=True)
+	add_sidegroup_counts(rings_in_molecule, sp3_carbons, atoms_to_remove, atoms_to_turn_into_hydrogens)
+
+	# Sixth, return the molecule without the side chains, and the molecule graph that is associated to this main component of the molecule
 	return molecule, molecule_graph
 
-# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - 
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
 
-def check_branches_have_atoms(original_atoms_in_branches, atoms_to_check_are_in_the_branches):
+def add_sidegroup_counts(rings_in_molecule, sp3_carbons, atoms_to_remove, atoms_to_turn_into_hydrogens):
 	"""
-	This method is designed to check if the atoms in atoms_to_check_are_in_the_branches are in atoms_in_branches
+	This method is designed to record the number of rings, sp3 carbons, atoms removed, and atoms turned into hydrogens in a molecule, if stage times are being recorded.
 
 	Parameters
 	----------
-	original_atoms_in_branches : list
-		This list contain all the atoms in the branch
-	atoms_to_check_are_in_the_branches : list
-		This list contains a set of indices that we expect to be in original_atoms_in_branches
+	rings_in_molecule : list of list of ints
+		These are the rings in the molecule.
+	sp3_carbons : list of ints
+		These are the sp3 carbons in the molecule.
+	atoms_to_remove : list of ints
+		These are the atoms that were removed from the molecule.
+	atoms_to_turn_into_hydrogens : list of (int, int)
+		These are the atoms that were turned into hydrogens.
 	"""
+	add_stage_count('molecules')
+	add_stage_count('rings', len(rings_in_molecule))
+	add_stage_count('sp3_carbons', len(sp3_carbons))
+	add_stage_count('atoms_removed', len(atoms_to_remove))
+	add_stage_count('atoms_turned_into_hydrogens', len(atoms_to_turn_into_hydrogens))
 
-	# First, make a copy of atoms_in_branches
-	atoms_in_branches = sorted(set(deepcopy(original_atoms_in_branches)))
-
-	# Second, initialise a list to contain all the indices in atoms_to_check_are_in_the_branches that were not found in original_atoms_in_branches.
-	problematic_indices = []
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
 
-	# Third, checck that the indices in atoms_to_check_are_in_the_branches are in atoms_in_branches.
-	for atom_index in set(atoms_to_check_are_in_the_branches):
-
-		# 3.1: If atom_index is not in atoms_in_branches, there is a problem, so record this index.
-		if atom_index not in atoms_in_branches:
-
-			# 3.2: atom_index was not found in atoms_in_branches, so record it in problematic_indices.
-			problematic_indices.append(atom_index)
+def get_sp3_branch_atoms_indices(atoms_to_turn_into_hydrogens, branch_atoms_indices, sp3_carbons):
+	"""
+	This method is designed to obtain the indices of the branch atoms that were sp3 carbons, in the molecule that sidegroups have been removed from.
 
-	# Fourth, if there are indices in problematic_indices, report them as an Exception:
-	if len(problematic_indices) > 0:
-		to_string  = 'Error: Some of the index expected in atoms_in_branches were not found.\n'
-		to_string += f'Indices not found in atoms_in_branches: {problematic_indices}\n'
-		to_string += f'atoms_in_branches: {atoms_in_branches}\n'
-		to_string += 'Check this'
-		raise Exception(to_string)
+	Parameters
+	----------
+	atoms_to_turn_into_hydrogens : list of (int, int)
+		These are the (outer, inner) atoms that were turned into hydrogens, as indices in the original molecule.
+	branch_atoms_indices : list of ints
+		These are the indices of the inner atoms in the molecule that sidegroups have been removed from, as given by remove_atoms_from_molecule.
+	sp3_carbons : list of ints
+		These are the sp3 carbons in the original molecule.
 
-# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - 
+	Returns
+	-------
+	sp3_branch_atoms_indices : list of ints
+		These are the indices of the branch atoms that were sp3 carbons, in the molecule that sidegroups have been removed from.
+	"""
 
+	# First, obtain the inner atoms in the original molecule. 
+	#        * Removing atoms does not change the order of the atoms that are kept, so these are in the same order as branch_atoms_indices.
+	original_branch_atoms_indices = sorted(set(inner_index for outer_index, inner_index in atoms_to_turn_into_hydrogens))
 
+	# Second, only return the branch atoms that were sp3 carbons.
+	sp3_carbons = set(sp3_carbons)
+	return [new_index for original_index, new_index in zip(original_branch_atoms_indices, branch_atoms_indices) if (original_index in sp3_carbons)]
 
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
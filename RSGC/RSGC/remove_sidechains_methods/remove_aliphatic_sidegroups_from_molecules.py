@@ -0,0 +1,361 @@
+"""
+remove_aliphatic_sidegroups_from_molecules.py, Geoffrey Weal, 17/10/26
+
+This script is designed to remove the aliphatic sidegroups from all the non-solvent molecules in a crystal, either one at a time or in parallel.
+"""
+import tracemalloc
+from functools       import partial
+from multiprocessing import Pool, current_process
+
+from RSGC.RSGC.remove_sidechains_methods.remove_aliphatic_sidegroups import remove_aliphatic_sidegroups, remove_aliphatic_sidegroups_using_equivalent_molecule
+from RSGC.RSGC.remove_sidechains_methods.get_equivalent_molecules    import get_equivalent_molecules
+from RSGC.RSGC.remove_sidechains_methods.Sidegroup_Roles_Memo        import Sidegroup_Roles_Memo
+from RSGC.RSGC.RSGC_methods.Stage_Timer                              import Stage_Timer, get_active_stage_timer, set_active_stage_timer
+from RSGC.RSGC.RSGC_methods.Diagnostics_Sink                         import Diagnostics_Sink, diagnose_molecule, get_active_diagnostics_sink, set_active_diagnostics_sink
+
+def remove_aliphatic_sidegroups_from_molecules(molecules, molecule_graphs, solvent_components, filepath, leave_as_ethyls=False, add_hydrogens_to_alpha_carbons=False, no_of_cpus=1, process_equivalent_molecules_once=False, sidegroup_roles_memo_filepath=None, save_molecule=None, release_molecules=False):
+	"""
+	This method is designed to remove the aliphatic sidegroups from all the non-solvent molecules in a crystal.
+
+	The molecules and graphs given are not modified. New molecules and graphs are made for the non-solvent molecules as their sidegroups are removed, and solvents are not copied at all, 
+	so the solvents in updated_molecules are the same objects as in molecules.
+
+	To use less memory with large crystals, release_molecules can be set to True so that each non-solvent molecule (and its graph) is removed from molecules (and molecule_graphs) as
+	soon as its sidegroups have been removed, and save_molecule can be given so that each molecule is saved as soon as it has been made, rather than at the end.
+
+	Parameters
+	----------
+	molecules : dict. of ase.Atoms
+		This is the dict. of molecules in the crystal.
+	molecule_graphs : dict. of networkx.Graph
+		This is the dict that contains the graph of each molecule in the molecules dictionary.
+	solvent_components : list of int.
+		This list contains the names of all the solvents in the molecules dictionary. Solvents are not modified.
+	filepath : str.
+		This is the path to the crystal file.
+	leave_as_ethyls : bool.
+		If False, all sidegroups will be left as methyl. If true, they will be given as ethyl (to their beta carbon). Default: False.
+	add_hydrogens_to_alpha_carbons : bool.
+		If True, add any missing hydrogens to the sp3 carbons at the end of the sidegroups that have been shortened. Default: False.
+	no_of_cpus : int.
+		This is the number of processes to remove sidegroups from the molecules of this crystal with. Default: 1.
+	process_equivalent_molecules_once : bool.
+		If True, molecules that are equivalent to each other (such as symmetric copies of the same molecule) are only fully processed once. The result is then reused for the other equivalent molecules. Default: False.
+	sidegroup_roles_memo_filepath : str. or None
+		This is the path to a sqlite database file that records the sidegroup roles of molecules, so that they can be reused for the same molecule in other crystals. See Sidegroup_Roles_Memo for more information. If None, no memo is used. Default: None.
+	save_molecule : function or None
+		If given, this is called as save_molecule(molecule_name, updated_molecule, updated_molecule_graph) for each molecule (including solvents) as soon as it has been made. Default: None.
+	release_molecules : bool.
+		If True, each non-solvent molecule and its graph are removed from molecules and molecule_graphs as soon as they are no longer needed. Default: False.
+
+	Returns
+	-------
+	updated_molecules : dict. of ase.Atoms
+		This is the dict. of molecules in the crystal with aliphatic sidegroups removed.
+	updated_molecule_graphs : dict. of networkx.Graph
+		This is the dict that contains the graph of each molecule in the updated_molecules dictionary.
+	"""
+
+	# First, initialise the dictionary and lists to store updated information on.
+	updated_molecules       = {}
+	updated_molecule_graphs = {}
+
+	# Second, keep solvents in updated_molecules. These are left unchanged, so they do not need to be copied.
+	for molecule_name in sorted(molecules.keys()):
+		if molecule_name in solvent_components:
+			updated_molecules[molecule_name]       = molecules[molecule_name]
+			updated_molecule_graphs[molecule_name] = molecule_graphs[molecule_name]
+			if save_molecule is not None:
+				save_molecule(molecule_name, updated_molecules[molecule_name], updated_molecule_graphs[molecule_name])
+
+	# Third, obtain the names of the non-solvent molecules to remove sidegroups from.
+	molecule_names = [molecule_name for molecule_name in sorted(molecules.keys()) if (molecule_name not in solvent_components)]
+
+	# Fourth, processes created by multiprocessing.Pool are not able to create their own processes.
+	#         * This happens if RSGC is being run by run_RSGC_on_database over a number of cpus. Remove sidegroups in serial if this is the case.
+	if (no_of_cpus > 1) and current_process().daemon:
+		print('Note: Molecules will be processed in serial, as this crystal is already being processed in a separate process.')
+		no_of_cpus = 1
+
+	# Fifth, group the molecules that are equivalent to each other. Only the representative molecule of each group is fully processed.
+	if process_equivalent_molecules_once:
+		equivalent_molecules = get_equivalent_molecules(molecules, molecule_graphs, molecule_names)
+		print(f'Found {len(equivalent_molecules)} unique molecule(s) out of {len(molecule_names)} non-solvent molecule(s).')
+	else:
+		equivalent_molecules = {molecule_name: [] for molecule_name in molecule_names}
+
+	# Sixth, look up the sidegroup roles of the representative molecules in the memo, if one is being used.
+	sidegroup_roles_memo = Sidegroup_Roles_Memo(sidegroup_roles_memo_filepath) if (sidegroup_roles_memo_filepath is not None) else None
+	memo_sidegroup_roles_and_mappings = {}
+	if sidegroup_roles_memo is not None:
+		for molecule_name in sorted(equivalent_molecules.keys()):
+			memo_sidegroup_roles, memo_mapping = sidegroup_roles_memo.lookup(molecules[molecule_name], molecule_graphs[molecule_name], leave_as_ethyls)
+			if memo_sidegroup_roles is not None:
+				memo_sidegroup_roles_and_mappings[molecule_name] = (memo_sidegroup_roles, memo_mapping)
+		print(f'Found {len(memo_sidegroup_roles_and_mappings)} out of {len(equivalent_molecules)} unique molecule(s) in the sidegroup roles memo.')
+
+	# Seventh, set up what to do with each molecule as soon as its sidegroups have been removed.
+	#          * Representative molecules that will be saved into the memo are kept until they have been saved into the memo.
+	#          * The tasks below are given as generators, so that they do not keep the molecules in memory if the molecules are being released.
+	molecules_to_keep = set(equivalent_molecules.keys()) - set(memo_sidegroup_roles_and_mappings.keys()) if (sidegroup_roles_memo is not None) else set()
+	def molecule_updated(molecule_name):
+		if save_molecule is not None:
+			save_molecule(molecule_name, updated_molecules[molecule_name], updated_molecule_graphs[molecule_name])
+		if release_molecules and (molecule_name not in molecules_to_keep):
+			del molecules[molecule_name], molecule_graphs[molecule_name]
+
+	# Eighth, remove the aliphatic sidegroups from the representative molecule of each group.
+	#          * Representative molecules found in the memo reuse the sidegroup roles from the memo.
+	tasks = ((molecule_name, molecules[molecule_name], molecule_graphs[molecule_name], filepath, leave_as_ethyls, add_hydrogens_to_alpha_carbons) + memo_sidegroup_roles_and_mappings.get(molecule_name, (None, None)) for molecule_name in sorted(equivalent_molecules.keys()))
+	all_sidegroup_roles = run_tasks(tasks, len(equivalent_molecules), updated_molecules, updated_molecule_graphs, no_of_cpus, molecule_updated=molecule_updated)
+
+	# Ninth, record the sidegroup roles of the representative molecules that were not in the memo, and obtain the sidegroup roles of those that were.
+	for molecule_name, (memo_sidegroup_roles, memo_mapping) in memo_sidegroup_roles_and_mappings.items():
+		all_sidegroup_roles[molecule_name] = map_sidegroup_roles(memo_sidegroup_roles, memo_mapping)
+	if sidegroup_roles_memo is not None:
+		for molecule_name in sorted(equivalent_molecules.keys()):
+			if molecule_name not in memo_sidegroup_roles_and_mappings:
+				sidegroup_roles_memo.save(molecules[molecule_name], molecule_graphs[molecule_name], leave_as_ethyls, all_sidegroup_roles[molecule_name])
+				if release_molecules:
+					del molecules[molecule_name], molecule_graphs[molecule_name]
+
+	# Tenth, remove the aliphatic sidegroups from the other molecules in each group, reusing the sidegroup roles of the representative molecule.
+	no_of_tasks = sum(len(equivalents) for equivalents in equivalent_molecules.values())
+	tasks = ((molecule_name, molecules[molecule_name], molecule_graphs[molecule_name], filepath, leave_as_ethyls, add_hydrogens_to_alpha_carbons, all_sidegroup_roles[representative_name], mapping) for representative_name, equivalents in equivalent_molecules.items() for molecule_name, mapping in equivalents)
+	if no_of_tasks > 0:
+		run_tasks(tasks, no_of_tasks, updated_molecules, updated_molecule_graphs, no_of_cpus, molecule_updated=molecule_updated)
+
+	# Eleventh, return the updated molecules and their graphs, in the order of their names.
+	updated_molecules       = {molecule_name: updated_molecules[molecule_name]       for molecule_name in sorted(updated_molecules.keys())}
+	updated_molecule_graphs = {molecule_name: updated_molecule_graphs[molecule_name] for molecule_name in sorted(updated_molecule_graphs.keys())}
+	return updated_molecules, updated_molecule_graphs
+
+def run_tasks(tasks, no_of_tasks, updated_molecules, updated_molecule_graphs, no_of_cpus=1, molecule_updated=None):
+	"""
+	This method is designed to remove the aliphatic sidegroups from the molecules given in tasks, either one at a time or in parallel.
+
+	Parameters
+	----------
+	tasks : iterable of tuples
+		These are the inputs for each molecule. See remove_aliphatic_sidegroups_from_molecule for more information.
+	no_of_tasks : int
+		This is the number of tasks.
+	updated_molecules : dict. of ase.Atoms
+		This is the dict. to add the molecules with aliphatic sidegroups removed to.
+	updated_molecule_graphs : dict. of networkx.Graph
+		This is the dict. to add the graphs of the molecules with aliphatic sidegroups removed to.
+	no_of_cpus : int.
+		This is the number of processes to remove sidegroups from the molecules with. Default: 1.
+	molecule_updated : function or None
+		If given, this is called as molecule_updated(molecule_name) as soon as each molecule has been added to updated_molecules. Default: None.
+
+	Returns
+	-------
+	all_sidegroup_roles : dict.
+		These are the sidegroup roles of each molecule that was fully processed.
+	"""
+
+	# First, initialise the dictionary to record the sidegroup roles of each molecule.
+	all_sidegroup_roles = {}
+
+	# Second, remove the aliphatic sidegroups from the molecules.
+	#         * imap gives the results in the same order as tasks, so molecules are given in the same order no matter how many cpus are used.
+	#         * tqdm is only imported here, so that it is not imported unless molecules are being processed.
+	from tqdm import tqdm
+	if (no_of_cpus == 1) or (no_of_tasks <= 1):
+		results = (remove_aliphatic_sidegroups_from_molecule(task) for task in tasks)
+		for molecule_name, updated_molecule, updated_molecule_graph, sidegroup_roles in tqdm(results, total=no_of_tasks, unit='molecules'):
+			updated_molecules[molecule_name]       = updated_molecule
+			updated_molecule_graphs[molecule_name] = updated_molecule_graph
+			all_sidegroup_roles[molecule_name]     = sidegroup_roles
+			if molecule_updated is not None:
+				molecule_updated(molecule_name)
+	else:
+		with Pool(processes=min(no_of_cpus, no_of_tasks)) as pool:
+			# 2.1: If stage times are being recorded, each process records the stage times of its molecules, and these are added to the stage times of this crystal.
+			stage_timer = get_active_stage_timer()
+			remove_method = remove_aliphatic_sidegroups_from_molecule if (stage_timer is None) else partial(remove_aliphatic_sidegroups_from_molecule_recording_stage_times, record_memory=stage_timer.record_memory)
+			# 2.2: If diagnostics are being recorded, each process records the diagnostics of its molecules, and these are added to the diagnostics of this crystal.
+			diagnostics_sink = get_active_diagnostics_sink()
+			if diagnostics_sink is not None:
+				remove_method = partial(remove_aliphatic_sidegroups_from_molecule_recording_diagnostics, remove_method=remove_method)
+			results = pool.imap(remove_method, tasks, chunksize=1)
+			if diagnostics_sink is not None:
+				results = merge_diagnostics(results, diagnostics_sink)
+			if stage_timer is not None:
+				results = merge_stage_times(results, stage_timer)
+			for molecule_name, updated_molecule, updated_molecule_graph, sidegroup_roles in tqdm(results, total=no_of_tasks, unit='molecules'):
+				updated_molecules[molecule_name]       = updated_molecule
+				updated_molecule_graphs[molecule_name] = updated_molecule_graph
+				all_sidegroup_roles[molecule_name]     = sidegroup_roles
+				if molecule_updated is not None:
+					molecule_updated(molecule_name)
+
+	# Third, return the sidegroup roles of each molecule.
+	return all_sidegroup_roles
+
+def map_sidegroup_roles(sidegroup_roles, mapping):
+	"""
+	This method is designed to map the sidegroup roles of a molecule onto an equivalent molecule.
+
+	Parameters
+	----------
+	sidegroup_roles : dict.
+		These are the rings, sp3 carbons, atoms to remove, and atoms to turn into hydrogens of a molecule.
+	mapping : dict.
+		This maps the atom indices of the molecule to the atom indices of the equivalent molecule.
+
+	Returns
+	-------
+	mapped_sidegroup_roles : dict.
+		These are the rings, sp3 carbons, atoms to remove, and atoms to turn into hydrogens, given as the atom indices of the equivalent molecule.
+	"""
+	mapped_sidegroup_roles = {}
+	mapped_sidegroup_roles['rings_in_molecule']            = [[mapping[index] for index in ring] for ring in sidegroup_roles['rings_in_molecule']]
+	mapped_sidegroup_roles['sp3_carbons']                  = sorted(mapping[index] for index in sidegroup_roles['sp3_carbons'])
+	mapped_sidegroup_roles['atoms_to_remove']              = sorted(mapping[index] for index in sidegroup_roles['atoms_to_remove'])
+	mapped_sidegroup_roles['atoms_to_turn_into_hydrogens'] = [(mapping[outer_index], mapping[inner_index]) for outer_index, inner_index in sidegroup_roles['atoms_to_turn_into_hydrogens']]
+	return mapped_sidegroup_roles
+
+def remove_aliphatic_sidegroups_from_molecule(task):
+	"""
+	This method is designed to remove the aliphatic sidegroups from a single molecule.
+
+	The inputs are given together as a tuple so this method can be used by multiprocessing.Pool.imap.
+
+	Parameters
+	----------
+	task : tuple of (int, ase.Atoms, networkx.Graph, str., bool., bool., dict. or None, dict. or None)
+		This contains the name of the molecule, the molecule, the graph of the molecule, the path to the crystal file, the leave_as_ethyls and add_hydrogens_to_alpha_carbons settings, and the sidegroup roles of an equivalent molecule along with the mapping of the atoms in the equivalent molecule to this molecule (None if there is no equivalent molecule).
+
+	Returns
+	-------
+	molecule_name : int
+		This is the name of the molecule.
+	updated_molecule : ase.Atoms
+		This is the molecule with aliphatic sidegroups removed.
+	updated_molecule_graph : networkx.Graph
+		This is the modified graph of this molecule.
+	sidegroup_roles : dict. or None
+		These are the sidegroup roles of this molecule. None if the sidegroup roles of an equivalent molecule were used.
+	"""
+
+	# First, obtain the inputs for this molecule.
+	molecule_name, molecule, molecule_graph, filepath, leave_as_ethyls, add_hydrogens_to_alpha_carbons, equivalent_sidegroup_roles, mapping = task
+
+	# Second, remove the aliphatic sidechains from this molecule. Any diagnostics found are recorded as belonging to this molecule.
+	with diagnose_molecule(molecule_name):
+		if equivalent_sidegroup_roles is None:
+			updated_molecule, updated_molecule_graph, sidegroup_roles = remove_aliphatic_sidegroups(molecule, molecule_graph, filepath, leave_as_ethyls=leave_as_ethyls, add_hydrogens_to_alpha_carbons=add_hydrogens_to_alpha_carbons, return_sidegroup_roles=True)
+		else:
+			updated_molecule, updated_molecule_graph = remove_aliphatic_sidegroups_using_equivalent_molecule(molecule, molecule_graph, filepath, equivalent_sidegroup_roles, mapping, leave_as_ethyls=leave_as_ethyls, add_hydrogens_to_alpha_carbons=add_hydrogens_to_alpha_carbons)
+			sidegroup_roles = None
+
+	# Third, return the updated molecule and its graph.
+	return molecule_name, updated_molecule, updated_molecule_graph, sidegroup_roles
+
+def remove_aliphatic_sidegroups_from_molecule_recording_stage_times(task, record_memory=False):
+	"""
+	This method is designed to remove the aliphatic sidegroups from a single molecule in another process, while recording the stage times.
+
+	Parameters
+	----------
+	task : tuple
+		These are the inputs for this molecule. See remove_aliphatic_sidegroups_from_molecule for more information.
+	record_memory : bool.
+		If True, also record the peak memory used during each stage in this process. Default: False.
+
+	Returns
+	-------
+	result : tuple
+		This is the result given by remove_aliphatic_sidegroups_from_molecule.
+	stage_times : dict.
+		These are the stage times and counts recorded for this molecule. See Stage_Timer for more information.
+	"""
+	started_tracemalloc = record_memory and (not tracemalloc.is_tracing())
+	if started_tracemalloc:
+		tracemalloc.start()
+	stage_timer = Stage_Timer(record_memory=record_memory)
+	previous_stage_timer = set_active_stage_timer(stage_timer)
+	try:
+		result = remove_aliphatic_sidegroups_from_molecule(task)
+	finally:
+		set_active_stage_timer(previous_stage_timer)
+		if started_tracemalloc:
+			tracemalloc.stop()
+	return result, stage_timer.get_stage_times()
+
+def merge_stage_times(results_and_stage_times, stage_timer):
+	"""
+	This method is designed to add the stage times recorded for each molecule in other processes to the stage times of this crystal.
+
+	Parameters
+	----------
+	results_and_stage_times : iterable of (tuple, dict.)
+		These are the results and stage times given by remove_aliphatic_sidegroups_from_molecule_recording_stage_times.
+	stage_timer : Stage_Timer
+		This is the Stage_Timer recording the stage times of this crystal.
+
+	Returns
+	-------
+	results : generator of tuples
+		These are the results given by remove_aliphatic_sidegroups_from_molecule, in the same order.
+	"""
+	for result, stage_times in results_and_stage_times:
+		stage_timer.merge(stage_times)
+		yield result
+
+def remove_aliphatic_sidegroups_from_molecule_recording_diagnostics(task, remove_method=remove_aliphatic_sidegroups_from_molecule):
+	"""
+	This method is designed to remove the aliphatic sidegroups from a single molecule in another process, while recording the diagnostics found.
+
+	If an issue stops this molecule from being processed, the diagnostics recorded are given with the exception as exception.diagnostics, so they are not lost.
+
+	Parameters
+	----------
+	task : tuple
+		These are the inputs for this molecule. See remove_aliphatic_sidegroups_from_molecule for more information.
+	remove_method : function
+		This is the method used to remove the aliphatic sidegroups from the molecule. Default: remove_aliphatic_sidegroups_from_molecule.
+
+	Returns
+	-------
+	result : tuple
+		This is the result given by remove_method.
+	records : list of dict.
+		These are the diagnostics recorded for this molecule. See Diagnostics_Sink for more information.
+	"""
+	diagnostics_sink = Diagnostics_Sink()
+	previous_diagnostics_sink = set_active_diagnostics_sink(diagnostics_sink)
+	try:
+		result = remove_method(task)
+	except BaseException as exception:
+		exception.diagnostics = diagnostics_sink.records
+		raise
+	finally:
+		set_active_diagnostics_sink(previous_diagnostics_sink)
+	return result, diagnostics_sink.records
+
+def merge_diagnostics(results_and_diagnostics, diagnostics_sink):
+	"""
+	This method is designed to add the diagnostics recorded for each molecule in other processes to the diagnostics of this crystal.
+
+	Parameters
+	----------
+	results_and_diagnostics : iterable of (tuple, list of dict.)
+		These are the results and diagnostics given by remove_aliphatic_sidegroups_from_molecule_recording_diagnostics.
+	diagnostics_sink : Diagnostics_Sink
+		This is the Diagnostics_Sink recording the diagnostics of this crystal.
+
+	Returns
+	-------
+	results : generator of tuples
+		These are the results given by remove_aliphatic_sidegroups_from_molecule_recording_diagnostics, in the same order.
+	"""
+	try:
+		for result, records in results_and_diagnostics:
+			diagnostics_sink.merge(records)
+			yield result
+	except BaseException as exception:
+		diagnostics_sink.merge(getattr(exception, 'diagnostics', []))
+		raise
@@ -0,0 +1,125 @@
+"""
+Compact_Molecule.py, Geoffrey Weal, 17/10/26
+
+This class is designed to hold the elements, positions, and bonding of a molecule in a few compact arrays, so that the sidegroups of the molecule can be quickly analysed.
+"""
+import numpy as np
+
+class Compact_Molecule:
+	"""
+	This class is designed to hold the elements, positions, and bonding of a molecule in a few compact arrays.
+
+	This is built once for each molecule, and is used to determine the rings, sp3 carbons, and atoms to remove from the molecule. Obtaining the symbol or neighbours
+	of an atom from this class does not create a new ase.Atom or networkx view each time.
+
+	Groups of atoms (such as the atoms in rings, the sp3 carbons, or the atoms to keep) can be given as masks with get_mask, so that checking if an atom is in a group
+	takes the same time no matter how big the group or molecule is.
+
+	The neighbours of each atom are stored in compressed sparse row (CSR) form. The neighbours of atom index are given by indices[indptr[index]:indptr[index+1]],
+	in the same order as they are given in molecule_graph[index].
+
+	Parameters
+	----------
+	molecule : ase.Atoms
+		This is the molecule.
+	molecule_graph : networkx.Graph
+		This is the graph of this molecule.
+
+	Attributes
+	----------
+	numbers : numpy.array of ints
+		These are the atomic numbers of the atoms in the molecule.
+	symbols : list of str.
+		These are the elements of the atoms in the molecule.
+	positions : numpy.array of floats
+		These are the positions of the atoms in the molecule.
+	cell : ase.cell.Cell
+		This is the cell of the molecule.
+	pbc : numpy.array of bools
+		These are the periodic boundary conditions of the molecule.
+	indptr : numpy.array of ints
+		These indicate where the neighbours of each atom start and end in indices.
+	indices : numpy.array of ints
+		These are the neighbours of all the atoms in the molecule.
+	"""
+	__slots__ = ('numbers', 'symbols', 'positions', 'cell', 'pbc', 'indptr', 'indices')
+
+	def __init__(self, molecule, molecule_graph):
+
+		# First, obtain the elements and positions of the atoms in the molecule.
+		self.numbers   = molecule.get_atomic_numbers()
+		self.symbols   = molecule.get_chemical_symbols()
+		self.positions = molecule.get_positions()
+		self.cell      = molecule.get_cell()
+		self.pbc       = molecule.get_pbc()
+
+		# Second, obtain the neighbours of each atom in CSR form.
+		neighbours = [list(molecule_graph[index]) for index in range(len(molecule))]
+		self.indptr  = np.cumsum([0] + [len(neighbours_of_atom) for neighbours_of_atom in neighbours])
+		self.indices = np.array([neighbour_index for neighbours_of_atom in neighbours for neighbour_index in neighbours_of_atom], dtype=int)
+
+	def __len__(self):
+		"""
+		This method will give the number of atoms in the molecule.
+		"""
+		return len(self.numbers)
+
+	def get_neighbours(self, index):
+		"""
+		This method will give the neighbours of an atom in the molecule.
+
+		Parameters
+		----------
+		index : int
+			This is the index of the atom to obtain the neighbours of.
+
+		Returns
+		-------
+		neighbours : list of ints
+			These are the indices of the atoms bonded to this atom.
+		"""
+		return self.indices[self.indptr[index]:self.indptr[index+1]].tolist()
+
+	def get_degrees(self):
+		"""
+		This method will give the number of neighbours of every atom in the molecule.
+
+		Returns
+		-------
+		degrees : numpy.array of ints
+			These are the number of atoms bonded to each atom in the molecule.
+		"""
+		return np.diff(self.indptr)
+
+	def get_mask(self, indices):
+		"""
+		This method will give a mask that indicates which atoms in the molecule are in indices.
+
+		Parameters
+		----------
+		indices : iterable of ints
+			These are the indices of the atoms in the group.
+
+		Returns
+		-------
+		mask : list of bools
+			This is True for each atom in indices, and False for every other atom in the molecule. This is a list rather than a numpy array, as this is faster to check one atom at a time.
+		"""
+		mask = [False] * len(self)
+		for index in indices:
+			mask[index] = True
+		return mask
+
+	def get_bonds(self):
+		"""
+		This method will give every bond in the molecule once, as (index1, index2) where index1 < index2.
+
+		Returns
+		-------
+		bonds : list of (int, int)
+			These are the bonds in the molecule.
+		"""
+		first_indices = np.repeat(np.arange(len(self)), self.get_degrees())
+		is_first = first_indices < self.indices
+		return list(zip(first_indices[is_first].tolist(), self.indices[is_first].tolist()))
+
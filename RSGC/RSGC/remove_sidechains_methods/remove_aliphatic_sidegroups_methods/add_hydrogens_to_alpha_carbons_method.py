@@ -3,10 +3,9 @@ add_hydrogens_to_alpha_carbons_method.py, Geoffrey Weal, 19/2/22
 
 This script is designed to add hydrogens to your alpha carbon atoms
 """
-from copy import deepcopy
-from RSGC.RSGC.remove_sidechains_methods.remove_aliphatic_sidegroups_methods.add_hydrogens_to_carbon import add_hydrogens_to_carbon
+from RSGC.RSGC.remove_sidechains_methods.remove_aliphatic_sidegroups_methods.add_hydrogens_to_carbon import add_hydrogens_to_carbons
 
-def add_hydrogens_to_alpha_carbons_method(molecule, molecule_graph, alpha_indices):
+def add_hydrogens_to_alpha_carbons_method(molecule, molecule_graph, alpha_indices, in_place=False):
 	"""
 	This script is designed to add hydrogens to your alpha carbon atoms.
 
@@ -16,6 +15,10 @@ def add_hydrogens_to_alpha_carbons_method(molecule, molecule_graph, alpha_indice
 		This is the molecule you to add hydrogens to.
 	molecule_graph : networkx.Graph
 		This is the graph associated with molecule.
+	alpha_indices : list of ints
+		These are the indices of the alpha atoms to add hydrogens to.
+	in_place : bool.
+		If True, hydrogens are added to the molecule and graph given, rather than to copies of them. Only use this if nothing else needs the molecule and graph given. Default: False.
 
 	Returns
 	-------
@@ -25,14 +28,14 @@ def add_hydrogens_to_alpha_carbons_method(molecule, molecule_graph, alpha_indice
 		This is the graph associated with molecule_copy		
 	"""
 	
-	# First, make a copy of the molecule and it's associated graph.
-	molecule_copy = molecule.copy()
-	molecule_graph_copy = deepcopy(molecule_graph)
+	# First, make a copy of the molecule and it's associated graph, unless we can modify the molecule and graph given.
+	molecule_copy       = molecule       if in_place else molecule.copy()
+	molecule_graph_copy = molecule_graph if in_place else molecule_graph.copy()
 
-	# Second, add hydrogens to each carbon that is sp3 so that it contains the correct number of bonds for sp3 carbons (4 neighbours). 
-	for index in alpha_indices:
-		if molecule[index].symbol == 'C':
-			add_hydrogens_to_carbon(molecule_copy, molecule_graph_copy, index)
+	# Second, add hydrogens to each alpha carbon so that it contains the correct number of bonds for sp3 carbons (4 neighbours). 
+	#         * The hydrogens for all the alpha carbons are added at once.
+	symbols = molecule_copy.get_chemical_symbols()
+	add_hydrogens_to_carbons(molecule_copy, molecule_graph_copy, [index for index in alpha_indices if (symbols[index] == 'C')])
 
 	# Third, return molecule_copy and molecule_graph_copy
 	return molecule_copy, molecule_graph_copy
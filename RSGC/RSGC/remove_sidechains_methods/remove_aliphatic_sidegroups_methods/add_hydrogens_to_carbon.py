@@ -1,77 +1,49 @@
 """
 add_hydrogens_to_carbon.py, Geoffrey Weal, 17/2/22
 
-This script allows the user to easily add hydrogens to carbon atoms in your molecule model. 
+This script allows the user to easily add hydrogens to carbon atoms in your molecule model.
 """
 import numpy as np
-from ase import Atom
-from SUMELF import get_unit_vector, rotate_vector_around_axis, get_distance
+from ase import Atoms
+
+from RSGC.RSGC.Unexpected_Coordination_Exception import Unexpected_Coordination_Exception
+
+C_to_H_bond_length = 0.97 # Å
+H_C_H_bond_angle = np.radians(109.5)
 
 def add_hydrogens_to_carbon(molecule, molecule_graph, carbon_index):
 	"""
-	This method will add hydrogens to your carbons to make them sp3.
+	This method will add hydrogens to your carbon to make it sp3.
+
+	See add_hydrogens_to_carbons for more information.
 
 	Parameters
 	----------
 	molecule : ase.Atoms
-		This is the molecule you want to centre as close to the middle of the unit cell as possible.
+		This is the molecule you want to add hydrogens to. This is modified in place.
 	molecule_graph : networkx.Graph
-		This is the graph of this molecule.
+		This is the graph of this molecule. This is modified in place.
 	carbon_index : int
 		This is the index of the carbon in your molecule that you want to add hydrogens to.
 	"""
+	add_hydrogens_to_carbons(molecule, molecule_graph, [carbon_index])
 
-	# First, determine how many neighbours your carbon atom is bonded to.
-	neighbouring_indices = list(molecule_graph[carbon_index])
-	no_of_neighbouring_atoms = len(neighbouring_indices)
-	if not (1 <= no_of_neighbouring_atoms <= 4):
-		print('Error in def add_hydrogens_to_carbon, in modify_aliphatic_sidegroups.py')
-		print('The number of atoms neighbouring carbon (index: '+str(carbon_index)+') is '+str(no_of_neighbouring_atoms))
-		print('This should be between 1 and 4')
-		print('Check this out')
-		import pdb; pdb.set_trace()
-		exit('This program with finish without completing')
-
-	# Second, hydrogen will be added to the end of the molecule, so any future additions of hydrogens 
-	# to other carbons should not affect those carbons carbon_index
-	
-	# 2.1: Add the first hydrogen if it doesnt exist. 
-	if no_of_neighbouring_atoms == 1:
-		add_hydrogen_to_carbon_with_1_neighbour(molecule, molecule_graph, carbon_index, neighbouring_indices)
-		neighbouring_indices = list(molecule_graph[carbon_index])
-		no_of_neighbouring_atoms = len(neighbouring_indices)
-
-	# 2.2: Add the second hydrogen if it doesnt exist.
-	if no_of_neighbouring_atoms == 2:
-		add_hydrogen_to_carbon_with_2_neighbour(molecule, molecule_graph, carbon_index, neighbouring_indices)
-		neighbouring_indices = list(molecule_graph[carbon_index])
-		no_of_neighbouring_atoms = len(neighbouring_indices)
-
-	# 2.3: Add the third hydrogen if it doesnt exist.
-	if no_of_neighbouring_atoms == 3:
-		add_hydrogen_to_carbon_with_3_neighbour(molecule, molecule_graph, carbon_index, neighbouring_indices)
-		neighbouring_indices = list(molecule_graph[carbon_index])
-		no_of_neighbouring_atoms = len(neighbouring_indices)
-
-# ----------------------------------------------------------------------------------------------------------------------------------
-# ----------------------------------------------------------------------------------------------------------------------------------
-
-C_to_H_bond_length = 0.97 # Å
-H_C_H_bond_angle = np.radians(109.5)
-def add_hydrogen_to_carbon_with_1_neighbour(molecule, molecule_graph, carbon_index, neighbouring_indices):
+def add_hydrogens_to_carbons(molecule, molecule_graph, carbon_indices):
 	"""
-	This method will add a hydrogen to a carbon tha currently only has one neighbour.
+	This method will add hydrogens to your carbons to make them sp3.
+
+	The positions of the hydrogens are obtained for all the carbons at once, in up to three rounds. Carbons with one neighbour are given a hydrogen in the first round,
+	carbons with two neighbours (including the hydrogen from the first round) are given a hydrogen in the second round, and carbons with three neighbours are given
+	a hydrogen in the third round. The hydrogens are then added to the end of the molecule in one go, ordered by carbon (in the order given in carbon_indices) and then by round.
 
 	Parameters
 	----------
 	molecule : ase.Atoms
-		This is the molecule you want to centre as close to the middle of the unit cell as possible.
+		This is the molecule you want to add hydrogens to. This is modified in place.
 	molecule_graph : networkx.Graph
-		This is the graph of this molecule.
-	carbon_index : int
-		This is the index of the carbon in your molecule that you want to add hydrogens to.
-	neighbouring_indices : list
-		This is a list containing all the indices of the neighbours bound to this carbon atom.
+		This is the graph of this molecule. This is modified in place.
+	carbon_indices : list of ints
+		These are the indices of the carbons in your molecule that you want to add hydrogens to.
 
 	Attributes
 	----------
@@ -81,168 +53,268 @@ def add_hydrogen_to_carbon_with_1_neighbour(molecule, molecule_graph, carbon_ind
 		This is the diangle between H-C-H if a sp3 carbon currently has only 1 or two bonds about it.
 	"""
 
-	# First, get the index of the neighbouring atom. This will be a carbon atom in a benzene ring.
-	n_atom_index = neighbouring_indices[0]
-
-	# Second, get another carbon that is in the benzene ring. Have chosen for this carbon to be closest to the centre of mass.
-	centre_of_mass = molecule.get_center_of_mass()
-	nn_index = None
-	smallest_distance_from_CM = float('inf')
-	for nn_index_temp in molecule_graph[n_atom_index]:
-		if molecule[nn_index_temp].symbol in ['C','N','O','S']:
-			distance_from_CM = get_distance(molecule[nn_index_temp].position,centre_of_mass)
-			if distance_from_CM < smallest_distance_from_CM:
-				smallest_distance_from_CM = distance_from_CM
-				nn_index = nn_index_temp
-	if nn_index is None:
-		print('Error in def add_hydrogen_to_carbon_with_1_neighbour, in modify_aliphatic_sidegroups.py')
-		print('Could not find a neighbouring atom to the neighbouring carbon atom that was not a C, N, O, or S atom')
-		print('Neighbouring Carbon index: '+str(n_atom_index))
-		print("Neighbouring Carbon's neighbours indices: '+str(molecule_graph[n_atom_index])")
-		print('The molecule will now appear in the ASE GUI')
-		from ase.visualize import view
-		view(molecule)
-		print('Check this out')
-		import pdb; pdb.set_trace()
-		exit('This program with finish without completing')
-
-	# Third, make the carbon to add a hydrogen to the origin.
-	centre_point = molecule[carbon_index].position
-
-	# Fourth, get the normal vector of the plane that the benzene ring lies in.
-	unit_vector_1 = get_unit_vector(molecule[n_atom_index].position - centre_point)
-	unit_vector_2 = get_unit_vector(molecule[nn_index].position     - centre_point)
-	normal_unit_vector = get_unit_vector(np.cross(unit_vector_1,unit_vector_2))
-	
-	# Fifth, rotate unit_vector_1 in the plane with normal normal_unit_vector by an angle of H_C_H_bond_angle
-	rotated_unit_vector_1 = rotate_vector_around_axis(unit_vector_1, H_C_H_bond_angle, normal_unit_vector)
-	hydrogen_position_1   = centre_point + C_to_H_bond_length*rotated_unit_vector_1
-	rotated_unit_vector_2 = rotate_vector_around_axis(unit_vector_1, -H_C_H_bond_angle, normal_unit_vector)
-	hydrogen_position_2   = centre_point + C_to_H_bond_length*rotated_unit_vector_2
-	
-	# Sixth, select the rotation that will add a hydrogen to a point closest to the molecules centre of mass.
-	hydrogen_position = hydrogen_position_1 if (get_distance(hydrogen_position_1,centre_point) < get_distance(hydrogen_position_2,centre_point)) else hydrogen_position_2
-
-	# Seventh, add the hydrogen to the molecule.
-	add_hydrogen_to_molecule(molecule, molecule_graph, hydrogen_position, carbon_index)
+	# First, determine how many neighbours each carbon atom is bonded to.
+	carbon_indices = list(dict.fromkeys(carbon_indices))
+	neighbouring_indices = {carbon_index: list(molecule_graph[carbon_index]) for carbon_index in carbon_indices}
+	for carbon_index in carbon_indices:
+		no_of_neighbouring_atoms = len(neighbouring_indices[carbon_index])
+		if not (1 <= no_of_neighbouring_atoms <= 4):
+			to_string  = 'Error in def add_hydrogens_to_carbons, in add_hydrogens_to_carbon.py\n'
+			to_string += 'The number of atoms neighbouring carbon (index: '+str(carbon_index)+') is '+str(no_of_neighbouring_atoms)+'\n'
+			to_string += 'This should be between 1 and 4\n'
+			to_string += 'Check this out'
+			raise Unexpected_Coordination_Exception(to_string)
+
+	# Second, obtain the positions and elements of the neighbours of each carbon. Hydrogens will be added to these lists as their positions are found.
+	positions = molecule.get_positions()
+	symbols   = molecule.get_chemical_symbols()
+	neighbouring_positions = {carbon_index: [positions[index] for index in neighbouring_indices[carbon_index]] for carbon_index in carbon_indices}
+	neighbouring_symbols   = {carbon_index: [symbols[index]   for index in neighbouring_indices[carbon_index]] for carbon_index in carbon_indices}
+	new_hydrogen_positions = {carbon_index: [] for carbon_index in carbon_indices}
+
+	# Third, obtain the centre of mass of the molecule. This is only needed for carbons with one neighbour.
+	if any((len(neighbouring_indices[carbon_index]) == 1) for carbon_index in carbon_indices):
+		centre_of_mass = molecule.get_center_of_mass()
+
+	# Fourth, obtain the positions of the hydrogens to add to the carbons, one round at a time.
+	for no_of_neighbouring_atoms in (1, 2, 3):
+
+		# 4.1: Obtain the carbons that have this number of neighbours.
+		carbons_in_round = [carbon_index for carbon_index in carbon_indices if (len(neighbouring_positions[carbon_index]) == no_of_neighbouring_atoms)]
+		if len(carbons_in_round) == 0:
+			continue
+
+		# 4.2: Obtain the positions of the hydrogens to add to these carbons.
+		if no_of_neighbouring_atoms == 1:
+			hydrogen_positions = get_hydrogen_positions_for_carbons_with_1_neighbour(positions, symbols, molecule_graph, carbons_in_round, neighbouring_indices, centre_of_mass)
+		elif no_of_neighbouring_atoms == 2:
+			hydrogen_positions = get_hydrogen_positions_for_carbons_with_2_neighbours(positions, carbons_in_round, neighbouring_positions, neighbouring_symbols)
+		else:
+			hydrogen_positions = get_hydrogen_positions_for_carbons_with_3_neighbours(positions, carbons_in_round, neighbouring_positions)
+
+		# 4.3: Record these hydrogens as neighbours of their carbons.
+		for carbon_index, hydrogen_position in zip(carbons_in_round, hydrogen_positions):
+			neighbouring_positions[carbon_index].append(hydrogen_position)
+			neighbouring_symbols[carbon_index].append('H')
+			new_hydrogen_positions[carbon_index].append(hydrogen_position)
+
+	# Fifth, add all the hydrogens to the molecule and its graph at once.
+	add_hydrogens_to_molecule(molecule, molecule_graph, [(carbon_index, hydrogen_position) for carbon_index in carbon_indices for hydrogen_position in new_hydrogen_positions[carbon_index]])
 
 # ----------------------------------------------------------------------------------------------------------------------------------
+# ----------------------------------------------------------------------------------------------------------------------------------
 
-def add_hydrogen_to_carbon_with_2_neighbour(molecule, molecule_graph, carbon_index, neighbouring_indices):
+def get_hydrogen_positions_for_carbons_with_1_neighbour(positions, symbols, molecule_graph, carbon_indices, neighbouring_indices, centre_of_mass):
 	"""
-	This method will add a hydrogen to a carbon tha currently only has two neighbour.
+	This method will obtain the positions of the hydrogens to add to carbons that currently only have one neighbour.
 
 	Parameters
 	----------
-	molecule : ase.Atoms
-		This is the molecule you want to centre as close to the middle of the unit cell as possible.
+	positions : numpy.array
+		These are the positions of the atoms in the molecule.
+	symbols : list of str.
+		These are the elements of the atoms in the molecule.
 	molecule_graph : networkx.Graph
 		This is the graph of this molecule.
-	carbon_index : int
-		This is the index of the carbon in your molecule that you want to add hydrogens to.
-	neighbouring_indices : list
-		This is a list containing all the indices of the neighbours bound to this carbon atom.
+	carbon_indices : list of ints
+		These are the indices of the carbons in your molecule that you want to add a hydrogen to.
+	neighbouring_indices : dict. of lists of ints
+		These are the indices of the neighbours bound to each carbon atom.
+	centre_of_mass : numpy.array
+		This is the centre of mass of the molecule.
+
+	Returns
+	-------
+	hydrogen_positions : numpy.array
+		These are the positions of the hydrogen to add to each carbon.
+	"""
 
-	Attributes
+	# First, for each carbon, get the neighbouring atom (this will be a carbon atom in a benzene ring), and another atom bound to the neighbouring atom
+	#        that is in the benzene ring. Have chosen for this other atom to be closest to the centre of mass.
+	n_atom_indices = []
+	nn_atom_indices = []
+	for carbon_index in carbon_indices:
+		n_atom_index = neighbouring_indices[carbon_index][0]
+		nn_index = None
+		smallest_distance_from_CM = float('inf')
+		for nn_index_temp in molecule_graph[n_atom_index]:
+			if symbols[nn_index_temp] in ['C','N','O','S']:
+				distance_from_CM = np.linalg.norm(positions[nn_index_temp] - centre_of_mass)
+				if distance_from_CM < smallest_distance_from_CM:
+					smallest_distance_from_CM = distance_from_CM
+					nn_index = nn_index_temp
+		if nn_index is None:
+			to_string  = 'Error in def get_hydrogen_positions_for_carbons_with_1_neighbour, in add_hydrogens_to_carbon.py\n'
+			to_string += 'Could not find a neighbouring atom to the neighbouring carbon atom that was a C, N, O, or S atom\n'
+			to_string += 'Neighbouring Carbon index: '+str(n_atom_index)+'\n'
+			to_string += "Neighbouring Carbon's neighbours indices: "+str(list(molecule_graph[n_atom_index]))+'\n'
+			to_string += 'Check this out'
+			raise Unexpected_Coordination_Exception(to_string)
+		n_atom_indices.append(n_atom_index)
+		nn_atom_indices.append(nn_index)
+
+	# Second, make each carbon to add a hydrogen to the origin.
+	centre_points = positions[carbon_indices]
+
+	# Third, get the normal vector of the plane that each benzene ring lies in.
+	unit_vectors_1 = get_unit_vectors(positions[n_atom_indices]  - centre_points)
+	unit_vectors_2 = get_unit_vectors(positions[nn_atom_indices] - centre_points)
+	normal_unit_vectors = get_unit_vectors(np.cross(unit_vectors_1, unit_vectors_2))
+
+	# Fourth, rotate unit_vectors_1 in the plane with normal normal_unit_vectors by an angle of H_C_H_bond_angle, in both directions.
+	hydrogen_positions_1 = centre_points + C_to_H_bond_length*rotate_vectors_around_axes(unit_vectors_1,  H_C_H_bond_angle, normal_unit_vectors)
+	hydrogen_positions_2 = centre_points + C_to_H_bond_length*rotate_vectors_around_axes(unit_vectors_1, -H_C_H_bond_angle, normal_unit_vectors)
+
+	# Fifth, select the rotation that will add a hydrogen to a point closest to the molecules centre of mass.
+	is_closer_1 = np.linalg.norm(hydrogen_positions_1 - centre_of_mass, axis=1) < np.linalg.norm(hydrogen_positions_2 - centre_of_mass, axis=1)
+	return np.where(is_closer_1[:,np.newaxis], hydrogen_positions_1, hydrogen_positions_2)
+
+def get_hydrogen_positions_for_carbons_with_2_neighbours(positions, carbon_indices, neighbouring_positions, neighbouring_symbols):
+	"""
+	This method will obtain the positions of the hydrogens to add to carbons that currently only have two neighbours.
+
+	Parameters
 	----------
-	C_to_H_bond_length : float
-		This is the C to H bond distance for binding new hydrogens to carbon atoms.
+	positions : numpy.array
+		These are the positions of the atoms in the molecule.
+	carbon_indices : list of ints
+		These are the indices of the carbons in your molecule that you want to add a hydrogen to.
+	neighbouring_positions : dict. of lists of numpy.array
+		These are the positions of the neighbours bound to each carbon atom.
+	neighbouring_symbols : dict. of lists of str.
+		These are the elements of the neighbours bound to each carbon atom.
+
+	Returns
+	-------
+	hydrogen_positions : numpy.array
+		These are the positions of the hydrogen to add to each carbon.
 	"""
-	
-	# First, get the index of the neighbouring atoms. We will set the C to index1 and the H to index2.
-	neighbouring_atom_index1, neighbouring_atom_index2 = neighbouring_indices if molecule[neighbouring_indices[0]].symbol == 'C' else neighbouring_indices[::-1]
 
-	# Second, make the carbon to add a hydrogen to the origin.
-	centre_point = molecule[carbon_index].position
+	# First, get the positions of the neighbouring atoms. We will set the C to neighbour 1 and the other atom to neighbour 2.
+	positions_1 = []
+	positions_2 = []
+	for carbon_index in carbon_indices:
+		position_1, position_2 = neighbouring_positions[carbon_index] if (neighbouring_symbols[carbon_index][0] == 'C') else neighbouring_positions[carbon_index][::-1]
+		positions_1.append(position_1)
+		positions_2.append(position_2)
 
-	# Third, get the unit vectors that point from your carbon atom to each of its neighbours. 
-	position_1 = molecule[neighbouring_atom_index1].position
-	position_2 = molecule[neighbouring_atom_index2].position
-	unit_vector_1 = get_unit_vector(position_1 - centre_point)
-	unit_vector_2 = get_unit_vector(position_2 - centre_point)
+	# Second, make each carbon to add a hydrogen to the origin.
+	centre_points = positions[carbon_indices]
 
-	# Fourth, we will rotate the non-benzene related bond vector about line_to_rotate_about by 120 degrees. 
-	# This will give us the new position for the bond to add our next hydrogen to.
-	line_to_rotate_about = -unit_vector_1
-	rotated_unit_vector_2 = rotate_vector_around_axis(unit_vector_2, np.radians(120), line_to_rotate_about)
+	# Third, get the unit vectors that point from each carbon atom to each of its neighbours.
+	unit_vectors_1 = get_unit_vectors(np.array(positions_1) - centre_points)
+	unit_vectors_2 = get_unit_vectors(np.array(positions_2) - centre_points)
 
-	# Fifth, add the hydrogen to the molecule
-	hydrogen_position = centre_point + C_to_H_bond_length*rotated_unit_vector_2
-	add_hydrogen_to_molecule(molecule, molecule_graph, hydrogen_position, carbon_index)
+	# Fourth, we will rotate the non-benzene related bond vector about the line from the benzene neighbour by 120 degrees.
+	# This will give us the new position for the bond to add our next hydrogen to.
+	rotated_unit_vectors_2 = rotate_vectors_around_axes(unit_vectors_2, np.radians(120), -unit_vectors_1)
 
-# ----------------------------------------------------------------------------------------------------------------------------------
+	# Fifth, return the positions of the hydrogens.
+	return centre_points + C_to_H_bond_length*rotated_unit_vectors_2
 
-def add_hydrogen_to_carbon_with_3_neighbour(molecule, molecule_graph, carbon_index, neighbouring_indices):
+def get_hydrogen_positions_for_carbons_with_3_neighbours(positions, carbon_indices, neighbouring_positions):
 	"""
-	This method will add a hydrogen to a carbon tha currently only has three neighbour.
+	This method will obtain the positions of the hydrogens to add to carbons that currently only have three neighbours.
 
 	Parameters
 	----------
-	molecule : ase.Atoms
-		This is the molecule you want to centre as close to the middle of the unit cell as possible.
-	molecule_graph : networkx.Graph
-		This is the graph of this molecule.
-	carbon_index : int
-		This is the index of the carbon in your molecule that you want to add hydrogens to.
-	neighbouring_indices : list
-		This is a list containing all the indices of the neighbours bound to this carbon atom.
-
-	Attributes
-	----------
-	C_to_H_bond_length : float
-		This is the C to H bond distance for binding new hydrogens to carbon atoms.
+	positions : numpy.array
+		These are the positions of the atoms in the molecule.
+	carbon_indices : list of ints
+		These are the indices of the carbons in your molecule that you want to add a hydrogen to.
+	neighbouring_positions : dict. of lists of numpy.array
+		These are the positions of the neighbours bound to each carbon atom.
+
+	Returns
+	-------
+	hydrogen_positions : numpy.array
+		These are the positions of the hydrogen to add to each carbon.
 	"""
 
-	# First, get the index of the neighbouring atoms. 
-	neighbouring_atom_index1, neighbouring_atom_index2, neighbouring_atom_index3 = neighbouring_indices
+	# First, make each carbon to add a hydrogen to the origin.
+	centre_points = positions[carbon_indices]
 
-	# Second, make the carbon to add a hydrogen to the origin.
-	centre_point = molecule[carbon_index].position
+	# Second, get each of the unit vectors from each carbon atom to each of it's neighbours
+	all_neighbouring_positions = np.array([neighbouring_positions[carbon_index] for carbon_index in carbon_indices])
+	unit_vectors = get_unit_vectors(all_neighbouring_positions - centre_points[:,np.newaxis,:])
 
-	# Third, get each of the unit vectors from the carbon atom to each of it's neighbours
-	unit_vector_1 = get_unit_vector(molecule[neighbouring_atom_index1].position - centre_point)
-	unit_vector_2 = get_unit_vector(molecule[neighbouring_atom_index2].position - centre_point)
-	unit_vector_3 = get_unit_vector(molecule[neighbouring_atom_index3].position - centre_point)
+	# Third, get the unit vector to place the next hydrogen as the negative of the sum of each unit vector.
+	bond_unit_vectors = -get_unit_vectors(unit_vectors.sum(axis=1))
 
-	# Fourth, get the unit vector to plane the next hydrogen as the negative of the sum of each unit vector.
-	bond_unit_vector = -get_unit_vector(unit_vector_1 + unit_vector_2 + unit_vector_3)
-
-	# Fifth, add the hydrogen to the molecule
-	hydrogen_position = centre_point + C_to_H_bond_length*bond_unit_vector
-	add_hydrogen_to_molecule(molecule, molecule_graph, hydrogen_position, carbon_index)
+	# Fourth, return the positions of the hydrogens.
+	return centre_points + C_to_H_bond_length*bond_unit_vectors
 
 # ----------------------------------------------------------------------------------------------------------------------------------
 # ----------------------------------------------------------------------------------------------------------------------------------
 
-def add_hydrogen_to_molecule(molecule, molecule_graph, position, carbon_index):
+def get_unit_vectors(vectors):
 	"""
-	This method will add a hydrogen to your molecule
+	This method will give the unit vectors of many vectors at once.
 
 	Parameters
 	----------
-	molecule : ase.Atoms
-		This is the molecule you want to centre as close to the middle of the unit cell as possible.
-	molecule_graph : networkx.Graph
-		This is the graph of this molecule.
-	position : np.array
-		This is the position that you want to place your hydrogen at in.
-	carbon_index : int
-		This is the index of the carbon in your molecule that you want to add hydrogens to.
+	vectors : numpy.array
+		These are the vectors, given along the last axis of the array.
+
+	Returns
+	-------
+	unit_vectors : numpy.array
+		These are the unit vectors of each vector.
 	"""
-	# First, make the hydrogen atom.
-	hydrogen_atom = Atom(symbol='H',position=position)
+	return vectors / np.linalg.norm(vectors, axis=-1)[...,np.newaxis]
 
-	# Second, add the hydrogen atom to your molecule.
-	molecule.append(hydrogen_atom)
+def rotate_vectors_around_axes(vectors, angle, axes):
+	"""
+	This method will rotate many vectors at once, each around its own axis, using the Rodrigues' rotation formula.
 
-	# Third, add the hydrogen atom to the molecule's graph.
-	hydrogen_index = len(molecule)-1
-	molecule_graph.add_node(hydrogen_index, E=molecule[hydrogen_index].symbol) # molecule[hydrogen_index].symbol should be a H
-	molecule_graph.add_edge(carbon_index,hydrogen_index)
+	Parameters
+	----------
+	vectors : numpy.array
+		These are the vectors to rotate.
+	angle : float
+		This is the angle to rotate each vector by (in radians). A positive angle rotates the vector anticlockwise about its axis.
+	axes : numpy.array
+		These are the axes to rotate each vector around.
+
+	Returns
+	-------
+	rotated_vectors : numpy.array
+		These are the rotated vectors.
+	"""
+	axes = get_unit_vectors(axes)
+	axis_dot_vectors = np.einsum('ij,ij->i', axes, vectors)[:,np.newaxis]
+	return vectors*np.cos(angle) + np.cross(axes, vectors)*np.sin(angle) + axes*axis_dot_vectors*(1.0 - np.cos(angle))
 
 # ----------------------------------------------------------------------------------------------------------------------------------
 # ----------------------------------------------------------------------------------------------------------------------------------
 
+def add_hydrogens_to_molecule(molecule, molecule_graph, carbons_and_hydrogen_positions):
+	"""
+	This method will add hydrogens to your molecule in one go.
+
+	Parameters
+	----------
+	molecule : ase.Atoms
+		This is the molecule you want to add hydrogens to. This is modified in place.
+	molecule_graph : networkx.Graph
+		This is the graph of this molecule. This is modified in place.
+	carbons_and_hydrogen_positions : list of (int, numpy.array)
+		These are the indices of the carbons to add hydrogens to, along with the position of each hydrogen.
+	"""
+
+	# First, if there are no hydrogens to add, there is nothing to do.
+	if len(carbons_and_hydrogen_positions) == 0:
+		return
+
+	# Second, add all the hydrogen atoms to your molecule.
+	first_hydrogen_index = len(molecule)
+	molecule.extend(Atoms('H'*len(carbons_and_hydrogen_positions), positions=[position for _, position in carbons_and_hydrogen_positions]))
 
+	# Third, add the hydrogen atoms to the molecule's graph.
+	hydrogen_indices = range(first_hydrogen_index, len(molecule))
+	molecule_graph.add_nodes_from((hydrogen_index, {'E': 'H'}) for hydrogen_index in hydrogen_indices)
+	molecule_graph.add_edges_from((carbon_index, hydrogen_index) for (carbon_index, _), hydrogen_index in zip(carbons_and_hydrogen_positions, hydrogen_indices))
 
+# ----------------------------------------------------------------------------------------------------------------------------------
+# ----------------------------------------------------------------------------------------------------------------------------------
 
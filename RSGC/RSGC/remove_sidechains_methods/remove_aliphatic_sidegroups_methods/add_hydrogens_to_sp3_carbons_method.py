@@ -3,12 +3,11 @@ add_hydrogens_to_sp3_carbons_method.py, Geoffrey Weal, 7/8/22
 
 This script will add hydrogens to a list of carbon atoms given so they are sp3 (i.e. have four atoms surrounding them).
 """
-from copy import deepcopy
-
+from RSGC.RSGC.remove_sidechains_methods.remove_aliphatic_sidegroups_methods.Compact_Molecule        import Compact_Molecule
 from RSGC.RSGC.remove_sidechains_methods.remove_aliphatic_sidegroups_methods.get_sp3_carbons         import get_sp3_carbons
-from RSGC.RSGC.remove_sidechains_methods.remove_aliphatic_sidegroups_methods.add_hydrogens_to_carbon import add_hydrogens_to_carbon
+from RSGC.RSGC.remove_sidechains_methods.remove_aliphatic_sidegroups_methods.add_hydrogens_to_carbon import add_hydrogens_to_carbons
 
-def add_hydrogens_to_sp3_carbons_method(molecule, molecule_graph):
+def add_hydrogens_to_sp3_carbons_method(molecule, molecule_graph, in_place=False):
 	"""
 	This method will add hydrogens to a list of carbon atoms given so they are sp3 (i.e. have four atoms surrounding them).
 
@@ -18,6 +17,8 @@ def add_hydrogens_to_sp3_carbons_method(molecule, molecule_graph):
 		This is the molecule you to add hydrogens to.
 	molecule_graph : networkx.Graph
 		This is the graph associated with molecule.
+	in_place : bool.
+		If True, hydrogens are added to the molecule and graph given, rather than to copies of them. Only use this if nothing else needs the molecule and graph given. Default: False.
 
 	Returns
 	-------
@@ -28,16 +29,15 @@ def add_hydrogens_to_sp3_carbons_method(molecule, molecule_graph):
 	"""
 
 	# First, obtain all the indices of the aliphatic carbons in the molecule (that are sp3). 
-	aliphatic_carbon_indices = get_sp3_carbons(molecule, molecule_graph)
-	import pdb; pdb.set_trace()
+	aliphatic_carbon_indices = get_sp3_carbons(Compact_Molecule(molecule, molecule_graph))
 
-	# Second, make a copy of the molecule and it's associated graph.
-	molecule_copy = molecule.copy()
-	molecule_graph_copy = deepcopy(molecule_graph)
+	# Second, make a copy of the molecule and it's associated graph, unless we can modify the molecule and graph given.
+	molecule_copy       = molecule       if in_place else molecule.copy()
+	molecule_graph_copy = molecule_graph if in_place else molecule_graph.copy()
 
 	# Third, add hydrogens to each carbon that is sp3 so that it contains the correct number of bonds for sp3 carbons (4 neighbours). 
-	for carbon_index in aliphatic_carbon_indices:
-		add_hydrogens_to_carbon(molecule_copy, molecule_graph_copy, carbon_index)
+	#        * The hydrogens for all the sp3 carbons are added at once.
+	add_hydrogens_to_carbons(molecule_copy, molecule_graph_copy, aliphatic_carbon_indices)
 
 	# Fourth, return molecule_copy and molecule_graph_copy
 	return molecule_copy, molecule_graph_copy
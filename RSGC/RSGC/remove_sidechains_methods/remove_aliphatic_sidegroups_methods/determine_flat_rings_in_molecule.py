@@ -3,9 +3,10 @@ determine_flat_rings_in_molecule.py, Geoffrey Weal, 9/6/22
 
 This script is designed to determine which rings are flattish in the molecule. 
 """
+from RSGC.RSGC.remove_sidechains_methods.remove_aliphatic_sidegroups_methods.get_angles_in_molecule import get_internal_ring_angles
 
 tolerance_angle = 20.0 
-def determine_flat_rings_in_molecule(rings_in_molecule, molecule):
+def determine_flat_rings_in_molecule(rings_in_molecule, compact_molecule):
 	"""
 	This method will determine which rings are flattish in the molecule. 
 
@@ -15,7 +16,7 @@ def determine_flat_rings_in_molecule(rings_in_molecule, molecule):
 	----------
 	rings_in_molecule : list of lists of ints
 		This is a list of ints in rings in the molecule.
-	molecule : ase.Atoms
+	compact_molecule : Compact_Molecule
 		This is the molecule you want to remove the aliphatic carbons to.
 
 	Returns
@@ -27,24 +28,27 @@ def determine_flat_rings_in_molecule(rings_in_molecule, molecule):
 	# First, set up a variable for recording flat rings in the molecule.
 	flat_rings_in_molecule = []
 
-	# Second, check each ring to see if it is flat or not.
-	for ring in rings_in_molecule:
+	# Second, obtain the internal angles of all the rings at once.
+	internal_ring_angles = get_internal_ring_angles(compact_molecule, rings_in_molecule, mic=True)
 
-		# 2.1: Do a simple check and see if the angles add up to the flat shape (within tolerance).
+	# Third, check each ring to see if it is flat or not.
+	for ring, internal_angles in zip(rings_in_molecule, internal_ring_angles):
 
-		# 2.1.1: What should the total internal angle be for a ring to be flat
+		# 3.1: Do a simple check and see if the angles add up to the flat shape (within tolerance).
+
+		# 3.1.1: What should the total internal angle be for a ring to be flat
 		total_internal_angle_for_flat_moiety = (len(ring) - 2.0) * 180.0
 
-		# 2.1.2: What is the total angle between atoms in the ring
+		# 3.1.2: What is the total angle between atoms in the ring
 		total_angle = 0.0
-		for index1, index2, index3 in zip(ring, ring[1::]+ring[:1:], ring[2::]+ring[:2:]): 
-			total_angle += molecule.get_angle(index1, index2, index3, mic=True)
+		for internal_angle in internal_angles: 
+			total_angle += internal_angle
 
-		# 2.1.3: Is the ring within tolerance of being flat
+		# 3.1.3: Is the ring within tolerance of being flat
 		if (total_internal_angle_for_flat_moiety - tolerance_angle) <= total_angle <= (total_internal_angle_for_flat_moiety + tolerance_angle):
 			flat_rings_in_molecule.append(ring)
 
-	# Third, return the flat rings
+	# Fourth, return the flat rings
 	return flat_rings_in_molecule
 
 
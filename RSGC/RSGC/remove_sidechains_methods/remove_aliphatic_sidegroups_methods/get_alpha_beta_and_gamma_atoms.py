@@ -3,7 +3,7 @@ get_alpha_beta_and_gamma_atoms.py, Geoffrey Weal, 9/6/22
 
 This script is designed to obtain the alpha, beta, and gamma atoms that are attached to atoms in rings or between rings.
 """
-def get_alpha_beta_and_gamma_atoms(atoms_in_branches, atoms_in_rings_and_between_rings, molecule_graph):
+def get_alpha_beta_and_gamma_atoms(atoms_in_branches, atoms_in_rings_and_between_rings, compact_molecule):
 	"""
 	This script is designed to obtain the alpha, beta, and gamma atoms that are attached to atoms in rings or between rings.
 
@@ -13,8 +13,8 @@ def get_alpha_beta_and_gamma_atoms(atoms_in_branches, atoms_in_rings_and_between
 		These are the atoms that are in branches in the molecule.
 	atoms_in_rings_and_between_rings : tuple of ints
 		These are the atoms that are rings or between rings in the molecule.
-	molecule_graph : networkx.Graph
-		This is the graph of this molecule.
+	compact_molecule : Compact_Molecule
+		This is the molecule, including its bonding.
 
 	Returns
 	-------
@@ -26,20 +26,24 @@ def get_alpha_beta_and_gamma_atoms(atoms_in_branches, atoms_in_rings_and_between
 		These are all the beta atoms in the molecule and the alpha atoms they are bound to (relative to the atoms in rings or atoms between rings).
 	"""
 
+	# Preliminary Step: obtain the atoms in rings or between rings as a mask, so that checking if an atom is in a ring or between rings takes the same time for any size of molecule.
+	is_in_rings_and_between_rings = compact_molecule.get_mask(atoms_in_rings_and_between_rings)
+
 	# First, determine the alpha atoms. These are the atoms in atoms_in_branches are directly attached to a ring atom or a atom between rings.
 	alpha_atoms = []
 	for index_in_branch in atoms_in_branches:
-		for neighbouring_index in molecule_graph[index_in_branch]:
-			if neighbouring_index in atoms_in_rings_and_between_rings:
+		for neighbouring_index in compact_molecule.get_neighbours(index_in_branch):
+			if is_in_rings_and_between_rings[neighbouring_index]:
 				alpha_atoms.append(index_in_branch)
 	alpha_atoms = sorted(set(alpha_atoms))
+	is_alpha_atom = compact_molecule.get_mask(alpha_atoms)
 
 	# Second, determine the beta atoms. These are atoms that are bound to the alpha atoms that are not in the atoms_in_rings_and_between_rings list.
 	beta_atoms = []
 	beta_alpha_atoms = []
 	for alpha_index in alpha_atoms:
-		for neighbouring_index in molecule_graph[alpha_index]: 
-			if neighbouring_index in atoms_in_rings_and_between_rings:
+		for neighbouring_index in compact_molecule.get_neighbours(alpha_index): 
+			if is_in_rings_and_between_rings[neighbouring_index]:
 				continue
 			beta_atoms.append(neighbouring_index)
 			beta_alpha_atoms.append((neighbouring_index, alpha_index))
@@ -49,10 +53,10 @@ def get_alpha_beta_and_gamma_atoms(atoms_in_branches, atoms_in_rings_and_between
 	gamma_atoms = []
 	gamma_beta_atoms = []
 	for beta_index in beta_atoms:
-		for neighbouring_index in molecule_graph[beta_index]: 
-			if neighbouring_index in atoms_in_rings_and_between_rings:
+		for neighbouring_index in compact_molecule.get_neighbours(beta_index): 
+			if is_in_rings_and_between_rings[neighbouring_index]:
 				continue
-			if neighbouring_index in alpha_atoms:
+			if is_alpha_atom[neighbouring_index]:
 				continue
 			gamma_atoms.append(neighbouring_index)
 			gamma_beta_atoms.append((neighbouring_index, beta_index))
@@ -0,0 +1,110 @@
+"""
+get_angles_in_molecule.py, Geoffrey Weal, 17/10/26
+
+This script is designed to obtain many angles in a molecule at once, rather than obtaining each angle one at a time with molecule.get_angle.
+"""
+import numpy as np
+from ase.geometry import get_angles
+
+def get_angles_in_molecule(molecule, angle_indices, mic=False):
+	"""
+	This method is designed to obtain the angles for many groups of three atoms in the molecule at once.
+
+	This gives the same angles as calling molecule.get_angle(index1, index2, index3, mic=mic) for each group of three atoms.
+
+	Parameters
+	----------
+	molecule : ase.Atoms or Compact_Molecule
+		This is the molecule.
+	angle_indices : list of (int, int, int)
+		These are the indices of the three atoms for each angle. The second atom in each group is the atom at the centre of the angle.
+	mic : bool.
+		If True, use the minimum image convention to obtain the angles. Default: False.
+
+	Returns
+	-------
+	angles : numpy.array of floats
+		These are the angles (in degrees) for each group of three atoms.
+	"""
+
+	# First, if there are no angles to obtain, return an empty array.
+	angle_indices = np.array(angle_indices, dtype=int).reshape(-1, 3)
+	if len(angle_indices) == 0:
+		return np.zeros(0)
+
+	# Second, obtain the vectors from the centre atom to the other two atoms of each angle.
+	positions = molecule.positions
+	vectors_12 = positions[angle_indices[:,0]] - positions[angle_indices[:,1]]
+	vectors_32 = positions[angle_indices[:,2]] - positions[angle_indices[:,1]]
+
+	# Third, obtain the angles between these vectors, using the minimum image convention if desired.
+	cell, pbc = (molecule.cell, molecule.pbc) if mic else (None, None)
+	return get_angles(vectors_12, vectors_32, cell=cell, pbc=pbc)
+
+# ===============================================================================================================================
+
+def get_neighbour_pair_angles(compact_molecule, centre_indices, mic=False):
+	"""
+	This method is designed to obtain the angles between every pair of neighbours around each of the given atoms.
+
+	Parameters
+	----------
+	compact_molecule : Compact_Molecule
+		This is the molecule, including its bonding.
+	centre_indices : list of ints
+		These are the indices of the atoms to obtain the angles around.
+	mic : bool.
+		If True, use the minimum image convention to obtain the angles. Default: False.
+
+	Returns
+	-------
+	neighbour_pair_angles : dict. of numpy.array of floats
+		These are the angles (in degrees) around each atom in centre_indices. The angles are given in the same order as the neighbour pairs (i1 < i2) of compact_molecule.get_neighbours(centre_index).
+	"""
+
+	# First, obtain the three atoms for every angle around every centre atom.
+	angle_indices = []
+	no_of_angles = []
+	for centre_index in centre_indices:
+		neighbour_indices = compact_molecule.get_neighbours(centre_index)
+		angles_around_centre = [(neighbour_indices[i1], centre_index, neighbour_indices[i2]) for i1 in range(len(neighbour_indices)) for i2 in range(i1+1,len(neighbour_indices))]
+		angle_indices += angles_around_centre
+		no_of_angles.append(len(angles_around_centre))
+
+	# Second, obtain all the angles at once.
+	angles = get_angles_in_molecule(compact_molecule, angle_indices, mic=mic)
+
+	# Third, split the angles up into the angles around each centre atom.
+	split_angles = np.split(angles, np.cumsum(no_of_angles)[:-1]) if (len(no_of_angles) > 0) else []
+	return {centre_index: angles_around_centre for centre_index, angles_around_centre in zip(centre_indices, split_angles)}
+
+def get_internal_ring_angles(compact_molecule, rings, mic=True):
+	"""
+	This method is designed to obtain the internal angles of each ring.
+
+	Parameters
+	----------
+	compact_molecule : Compact_Molecule
+		This is the molecule.
+	rings : list of lists of ints
+		These are the rings to obtain the internal angles of. Each ring is given in the order that the atoms are bonded around the ring.
+	mic : bool.
+		If True, use the minimum image convention to obtain the angles. Default: True.
+
+	Returns
+	-------
+	internal_ring_angles : list of numpy.array of floats
+		These are the internal angles (in degrees) of each ring. The angle centred on ring[n+1] is given n-th in each array.
+	"""
+
+	# First, obtain the three atoms for every internal angle of every ring.
+	angle_indices = [(index1, index2, index3) for ring in rings for index1, index2, index3 in zip(ring, ring[1::]+ring[:1:], ring[2::]+ring[:2:])]
+
+	# Second, obtain all the angles at once.
+	angles = get_angles_in_molecule(compact_molecule, angle_indices, mic=mic)
+
+	# Third, split the angles up into the angles of each ring.
+	return np.split(angles, np.cumsum([len(ring) for ring in rings])[:-1]) if (len(rings) > 0) else []
+
+# ===============================================================================================================================
+
@@ -0,0 +1,107 @@
+"""
+get_atoms_to_remove_from_molecule.py, Geoffrey Weal, 17/10/26
+
+This script is designed to determine which atoms should be removed from the molecule, and which atoms should be turned into hydrogens, given the rings and sp3 carbons in the molecule.
+"""
+from RSGC.RSGC.remove_sidechains_methods.remove_aliphatic_sidegroups_methods.determine_atoms_between_moieties_to_keep import determine_atoms_between_moieties_to_keep
+from RSGC.RSGC.remove_sidechains_methods.remove_aliphatic_sidegroups_methods.get_alpha_beta_and_gamma_atoms           import get_alpha_beta_and_gamma_atoms
+from RSGC.RSGC.RSGC_methods.Stage_Timer                                                                           import time_stage
+
+def get_atoms_to_remove_from_molecule(compact_molecule, rings_in_molecule, sp3_carbons, leave_as_ethyls=False):
+	"""
+	This method is designed to determine which atoms should be removed from the molecule, and which atoms should be turned into hydrogens.
+
+	Given the rings and the sp3 carbons in the molecule, this method only depends on the elements and the bonding of the molecule.
+
+	Parameters
+	----------
+	compact_molecule : Compact_Molecule
+		This is the molecule you want to remove the aliphatic carbons from, including its bonding.
+	rings_in_molecule : list of list of ints
+		This is the list of atoms that are involved in rings that are 7 atoms or less in size.
+	sp3_carbons : list of ints
+		These are the indices of the carbons that are likely to be sp3.
+	leave_as_ethyls : bool.
+		If False, all sidegroups will be left as methyl. If true, they will be given as ethyl (to their beta carbon).
+
+	Returns
+	-------
+	atoms_to_remove : list of ints
+		These are the indices of the atoms to remove from the molecule.
+	atoms_to_turn_into_hydrogens : list of (int, int)
+		These are the indices of the atoms to turn into hydrogens, along with the atom they are bound to that is being kept.
+	"""
+
+	# First, obtain the atoms in rings and the sp3 carbons as masks, so that checking if an atom is in a ring or is an sp3 carbon takes the same time for any size of molecule.
+	is_in_ring      = compact_molecule.get_mask(index for ring in rings_in_molecule for index in ring)
+	is_sp3_carbon   = compact_molecule.get_mask(sp3_carbons)
+
+	# Second, determine all the atoms in the molecule that should be kept. These are the atoms in rings, atoms that are not hydrogens or carbons, and carbons that are not sp3.
+	keep_mask = [(is_in_ring[index] or (symbol not in ['H', 'D', 'T', 'C']) or ((symbol == 'C') and (not is_sp3_carbon[index]))) for index, symbol in enumerate(compact_molecule.symbols)]
+
+	# Third, obtain the indices of the atoms in the molecule that should be kept.
+	all_atom_of_moieties_to_keep = tuple(index for index, keep in enumerate(keep_mask) if keep)
+
+	# Fourth, determine all the unique paths between the rings in your molecule
+	with time_stage('determine_atoms_between_moieties_to_keep'):
+		atoms_in_any_ring, atoms_between_rings = determine_atoms_between_moieties_to_keep(compact_molecule, all_atom_of_moieties_to_keep)
+
+	# Fifth, determine which atoms in the molecule are involved in branches
+	is_in_rings_and_between_rings = compact_molecule.get_mask(atoms_in_any_ring + atoms_between_rings)
+	atoms_in_rings_and_between_rings = tuple(index for index, in_rings_or_between_rings in enumerate(is_in_rings_and_between_rings) if in_rings_or_between_rings)
+	atoms_in_branches = tuple(index for index, in_rings_or_between_rings in enumerate(is_in_rings_and_between_rings) if (not in_rings_or_between_rings))
+
+	# Sixth, determine the alpha atoms. These are the atoms in atoms_in_branches are directly attached to a ring atom or a atom between rings.
+	alpha_atoms, beta_atoms, gamma_atoms, beta_alpha_atoms, gamma_beta_atoms = get_alpha_beta_and_gamma_atoms(atoms_in_branches, atoms_in_rings_and_between_rings, compact_molecule)
+
+	# Seventh, determine branch atoms to remove from the molecules
+	if leave_as_ethyls:
+		check_branches_have_atoms(atoms_in_branches, alpha_atoms + beta_atoms + gamma_atoms)
+		atoms_to_remove = sorted(set(atoms_in_branches) - set(alpha_atoms) - set(beta_atoms) - set(gamma_atoms))
+		atoms_to_turn_into_hydrogens = gamma_beta_atoms
+	else:
+		check_branches_have_atoms(atoms_in_branches, alpha_atoms + beta_atoms)
+		atoms_to_remove = sorted(set(atoms_in_branches) - set(alpha_atoms) - set(beta_atoms))
+		atoms_to_turn_into_hydrogens = beta_alpha_atoms
+
+	# Eighth, return the atoms to remove and the atoms to turn into hydrogens.
+	return atoms_to_remove, atoms_to_turn_into_hydrogens
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+def check_branches_have_atoms(original_atoms_in_branches, atoms_to_check_are_in_the_branches):
+	"""
+	This method is designed to check if the atoms in atoms_to_check_are_in_the_branches are in atoms_in_branches
+
+	Parameters
+	----------
+	original_atoms_in_branches : list
+		This list contain all the atoms in the branch
+	atoms_to_check_are_in_the_branches : list
+		This list contains a set of indices that we expect to be in original_atoms_in_branches
+	"""
+
+	# First, make a set of atoms_in_branches, so that checking if an atom is in a branch takes the same time for any size of branch.
+	atoms_in_branches = set(original_atoms_in_branches)
+
+	# Second, initialise a list to contain all the indices in atoms_to_check_are_in_the_branches that were not found in original_atoms_in_branches.
+	problematic_indices = []
+
+	# Third, checck that the indices in atoms_to_check_are_in_the_branches are in atoms_in_branches.
+	for atom_index in set(atoms_to_check_are_in_the_branches):
+
+		# 3.1: If atom_index is not in atoms_in_branches, there is a problem, so record this index.
+		if atom_index not in atoms_in_branches:
+
+			# 3.2: atom_index was not found in atoms_in_branches, so record it in problematic_indices.
+			problematic_indices.append(atom_index)
+
+	# Fourth, if there are indices in problematic_indices, report them as an Exception:
+	if len(problematic_indices) > 0:
+		to_string  = 'Error: Some of the index expected in atoms_in_branches were not found.\n'
+		to_string += f'Indices not found in atoms_in_branches: {problematic_indices}\n'
+		to_string += f'atoms_in_branches: {sorted(atoms_in_branches)}\n'
+		to_string += 'Check this'
+		raise Exception(to_string)
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
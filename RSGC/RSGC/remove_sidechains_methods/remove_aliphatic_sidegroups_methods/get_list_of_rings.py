@@ -5,21 +5,21 @@ This script is designed to get all the atoms in rings that are less than or equa
 """
 import warnings
 
-from copy import deepcopy
+from RSGC.RSGC.Hydrogen_in_Ring_Exception      import Hydrogen_in_Ring_Exception
+from RSGC.RSGC.RSGC_methods.Stage_Timer      import add_stage_count
+from RSGC.RSGC.RSGC_methods.Diagnostics_Sink import record_diagnostic
 
-from RSGC.RSGC.Hydrogen_in_Ring_Exception import Hydrogen_in_Ring_Exception
-from RSGC.RSGC.remove_sidechains_methods.remove_aliphatic_sidegroups_methods.general_methods import is_list_in_another_list_of_lists_sorted
-
-def get_list_of_rings(molecule, molecule_graph, filepath):
+max_ring_size = 7
+def get_list_of_rings(compact_molecule, filepath):
 	"""
 	Get a list of all the atoms in rings that are less than or equal to 7.
 
 	Parameters
 	----------
-	molecule : ase.Atoms
-		This is the molecule.
-	molecule_graph : networkx.Graph
-		This is the graph of this molecule.
+	compact_molecule : Compact_Molecule
+		This is the molecule, including its bonding.
+	filepath : str.
+		This is the path to the crystal file.
 
 	Returns
 	-------
@@ -27,88 +27,143 @@ def get_list_of_rings(molecule, molecule_graph, filepath):
 		This is the list of atoms that are inolved in rings
 	"""
 
-	# First, create the rings_in_molecule list to store rings
+	# First, create the rings_in_molecule list to store rings, and the set to record the atoms in each ring that has been found.
 	rings_in_molecule = [] 
+	found_rings = set()
 
 	# Second, look through the entire molecule for rings, beginning from each atom in the molecule.
-	for atom_index in range(len(molecule)):
-		traverse_rings_method(atom_index, molecule, molecule_graph, [], rings_in_molecule)
+	#         * Every ring is found from the lowest index atom in the ring, so only atoms with higher indices than atom_index need to be explored.
+	#         * The number of paths explored is recorded if stage times are being recorded (see Stage_Timer).
+	no_of_paths_explored = 0
+	for atom_index in range(len(compact_molecule)):
+		distances_to_start = get_distances_to_start(atom_index, compact_molecule)
+		no_of_paths_explored += traverse_rings_method(atom_index, compact_molecule, [atom_index], distances_to_start, rings_in_molecule, found_rings)
+	add_stage_count('ring_paths_explored', no_of_paths_explored)
 
 	# Third, warnthe user if their are hydrogens in the rings found in the given crystal. 
-	hydrogen_in_ring_error_checking(rings_in_molecule, molecule, molecule_graph, filepath)
+	hydrogen_in_ring_error_checking(rings_in_molecule, compact_molecule, filepath)
 	
 	# Fourth, return all the rings in the molecule. The order of the ring list is in order of the atoms to following to follow the ring around
 	return rings_in_molecule
 
-def traverse_rings_method(atom_index, molecule, molecule_graph, currently_travelled_path, rings_in_molecule):
+def get_distances_to_start(start_index, compact_molecule):
+	"""
+	This method will obtain the number of bonds between start_index and the atoms around it that could be in a ring with start_index.
+
+	Only atoms with indices greater than start_index are included. Atoms that are more than 3 bonds away from start_index can not be in a ring of 7 atoms or less with start_index, so these are also not included.
+
+	Parameters
+	----------
+	start_index : int
+		This is the atom index that rings are being searched for from.
+	compact_molecule : Compact_Molecule
+		This is the molecule, including its bonding.
+
+	Returns
+	-------
+	distances_to_start : dict.
+		This contains the number of bonds between start_index and each atom that could be in a ring with start_index.
+	"""
+
+	# First, perform a breadth-first search from start_index.
+	distances_to_start = {start_index: 0}
+	current_shell = [start_index]
+	for distance in range(1, max_ring_size//2+1):
+		next_shell = []
+		for atom_index in current_shell:
+			for next_atom_index in compact_molecule.get_neighbours(atom_index):
+				if (next_atom_index > start_index) and (next_atom_index not in distances_to_start):
+					distances_to_start[next_atom_index] = distance
+					next_shell.append(next_atom_index)
+		current_shell = next_shell
+
+	# Second, return the distances of atoms to start_index
+	return distances_to_start
+
+def traverse_rings_method(atom_index, compact_molecule, currently_travelled_path, distances_to_start, rings_in_molecule, found_rings):
 	"""
 	This is a recursive method for finding rings that are 7 atoms long or less. 
 
-	Method being performed is a Depth-First Search (DFS) algorithm.
+	Method being performed is a Depth-First Search (DFS) algorithm. The path is only extended to atoms that can still make a ring of 7 atoms or less 
+	back to the start of the path, so the number of paths explored scales with the number of rings in the molecule rather than with the number of paths in it.
 
 	Parameters
 	----------
 	atom_index : int
-		This is the atom index to explore from.
-	molecule : ase.Atoms
-		This is the molecule.
-	molecule_graph : networkx.Graph
-		This is the graph of this molecule.
+		This is the atom index to explore from. This is the last atom in currently_travelled_path.
+	compact_molecule : Compact_Molecule
+		This is the molecule, including its bonding.
 	currently_travelled_path : list
-		This is the list of ints that has currently been followed
+		This is the list of ints that has currently been followed. This list is extended and shrunk in place as the search progresses.
+	distances_to_start : dict.
+		This contains the number of bonds between the first atom in currently_travelled_path and the atoms that could be in a ring with it.
 	rings_in_molecule : list
 		This is the list of rings found in the molecule. Rings found with the recursive algorithm will be stored in this list.
-	"""
+	found_rings : set of frozensets
+		This contains the atoms in each ring in rings_in_molecule. This is used to quickly determine if a ring has already been found.
 
-	# First, add the atom_index to the currently_travelled_path list
-	currently_travelled_path.append(atom_index)
+	Returns
+	-------
+	no_of_paths_explored : int
+		This is the number of paths explored from currently_travelled_path, including currently_travelled_path itself.
+	"""
 
-	# Second, look at each nieghbour to atom_index and determine how to traverse next about the molecule, if you have found a ring, or if you have reached the max traversal length we want to travel.
-	for next_atom_index in molecule_graph[atom_index]:
+	# First, look at each nieghbour to atom_index and determine how to traverse next about the molecule, if you have found a ring, or if you have reached the max traversal length we want to travel.
+	no_of_paths_explored = 1
+	for next_atom_index in compact_molecule.get_neighbours(atom_index):
 
 		if (next_atom_index == currently_travelled_path[0]) and (len(currently_travelled_path) > 2):
-			# 2.1: We have found a ring.
-			if not is_list_in_another_list_of_lists_sorted(currently_travelled_path, rings_in_molecule):
-				# 2.1.1: If currently_travelled_path is not already in rings_in_molecule, add currently_travelled_path to the rings_in_molecule list
-				rings_in_molecule.append(deepcopy(currently_travelled_path))
+			# 1.1: We have found a ring.
+			ring_key = frozenset(currently_travelled_path)
+			if ring_key not in found_rings:
+				# 1.1.1: If currently_travelled_path is not already in rings_in_molecule, add currently_travelled_path to the rings_in_molecule list
+				found_rings.add(ring_key)
+				rings_in_molecule.append(list(currently_travelled_path))
+
+		elif next_atom_index not in distances_to_start:
+			# 1.2: next_atom_index has a lower index than the start of the path, or is too far away from the start of the path to be in a ring of 7 atoms or less with it.
+			pass
 
 		elif next_atom_index in currently_travelled_path: 
-			# 2.2: We have already looked at next_atom_index in this path, so we dont want to traverse the path from here anymore.
+			# 1.3: We have already looked at next_atom_index in this path, so we dont want to traverse the path from here anymore.
 			pass
 
-		elif len(currently_travelled_path) == 7:
-			# 2.3: We have already traverse through 7 atoms in this path, so we dont want to traverse the path from here anymore.
+		elif len(currently_travelled_path) + distances_to_start[next_atom_index] > max_ring_size:
+			# 1.4: A ring continuing through next_atom_index would contain more than 7 atoms, so we dont want to traverse the path from here anymore.
 			pass
 			
 		else:
-			# 2.4: We want to continue to traverse through the molecule, continuing from next_atom_index. 
-			traverse_rings_method(next_atom_index, molecule, molecule_graph, deepcopy(currently_travelled_path), rings_in_molecule)
+			# 1.5: We want to continue to traverse through the molecule, continuing from next_atom_index. 
+			currently_travelled_path.append(next_atom_index)
+			no_of_paths_explored += traverse_rings_method(next_atom_index, compact_molecule, currently_travelled_path, distances_to_start, rings_in_molecule, found_rings)
+			currently_travelled_path.pop()
 
-def hydrogen_in_ring_error_checking(rings_in_molecule, molecule, molecule_graph, filepath):
+	# Second, return the number of paths that were explored.
+	return no_of_paths_explored
+
+def hydrogen_in_ring_error_checking(rings_in_molecule, compact_molecule, filepath):
 	"""
 	This method is designed to check if a ring contains a hydrogen, and if so warn the user in a txt file. 
 
+	The warning is recorded as a diagnostic, which is written to file at the end of the crystal (see Diagnostics_Sink).
+
 	Parameters
 	----------
 	rings_in_molecule : list
 		This is the list of rings found in the molecule. Rings found with the recursive algorithm will be stored in this list.
-	molecule : ase.Atoms
-		This is the molecule.
-	molecule_graph : networkx.Graph
-		This is the graph of this molecule.
+	compact_molecule : Compact_Molecule
+		This is the molecule, including its bonding.
 	filepath : str.
 		This is the path to the crystal file.
 	"""
 	for flat_ring in rings_in_molecule:
 		hydrogen_found = False
 		for atom_index in flat_ring:
-			if molecule[atom_index].symbol in ['H', 'D']:
-				if any((molecule[neighbour_index].symbol in ['O', 'N']) for neighbour_index in molecule_graph[atom_index]):
-					with open('Rings_with_hydrogens_in_them.txt','a+') as fileTXT:
-						fileTXT.write(str(filepath)+' (Ring may have hydrogen bonding in it.)\n')
+			if compact_molecule.symbols[atom_index] in ['H', 'D']:
+				if any((compact_molecule.symbols[neighbour_index] in ['O', 'N']) for neighbour_index in compact_molecule.get_neighbours(atom_index)):
+					record_diagnostic(filepath, 'hydrogen_bonding_in_ring', ring=flat_ring)
 				else:
-					with open('Rings_with_hydrogens_in_them.txt','a+') as fileTXT:
-						fileTXT.write(str(filepath)+'\n')
+					record_diagnostic(filepath, 'hydrogen_in_ring', ring=flat_ring)
 					raise Hydrogen_in_Ring_Exception('Hydrogen Found in Ring, this is weird, check out this crystal manually.')
 				hydrogen_found = True
 				break
@@ -3,42 +3,53 @@ get_sp3_atoms.py, Geoffrey Weal, 19/2/22
 
 This script is designed to modify the aliphatic sidegroups of your OPV molecule. 
 """
+import numpy as np
 
-def get_sp3_carbons(molecule, molecule_graph):
+from RSGC.RSGC.remove_sidechains_methods.remove_aliphatic_sidegroups_methods.get_angles_in_molecule import get_neighbour_pair_angles
+
+def get_sp3_carbons(compact_molecule):
 	"""
 	This method will determine which carbons are likely to be sp3.
 
 	Parameters
 	----------
-	molecule : ase.Atoms
-		This is the molecule.
-	molecule_graph : networkx.Graph
-		This is the graph of this molecule.
+	compact_molecule : Compact_Molecule
+		This is the molecule, including its bonding.
 
 	Returns
 	-------
 	aliphatic_carbon_indices : list
 		This is a list of the atoms that are likely sp3 carbons.
 	"""
+
+	# First, obtain the carbons in the molecule.
+	carbon_indices = [index for index, symbol in enumerate(compact_molecule.symbols) if (symbol == 'C')]
+
+	# Second, obtain the angles around all the carbons that need them at once, rather than one angle at a time.
+	degrees = compact_molecule.get_degrees()
+	carbons_needing_angles = [index for index in carbon_indices if (degrees[index] >= 2) and (degrees[index] != 4)]
+	neighbour_pair_angles = get_neighbour_pair_angles(compact_molecule, carbons_needing_angles, mic=False)
+
+	# Third, determine which carbons are sp3.
 	aliphatic_carbon_indices = []
-	for index in range(len(molecule)):
-		if molecule[index].symbol == 'C' and is_sp3(molecule, molecule_graph, index):
+	for index in carbon_indices:
+		if is_sp3(compact_molecule, index, angles=neighbour_pair_angles.get(index, None)):
 			aliphatic_carbon_indices.append(index)
 	return aliphatic_carbon_indices
 
 
-def is_sp3(molecule, molecule_graph, index):
+def is_sp3(compact_molecule, index, angles=None):
 	"""
 	This method will determine which carbons are likely to be sp3.
 
 	Parameters
 	----------
-	molecule : ase.Atoms
-		This is the molecule.
-	molecule_graph : networkx.Graph
-		This is the graph of this molecule.
+	compact_molecule : Compact_Molecule
+		This is the molecule, including its bonding.
 	index : int
 		This is the index of the atom you want to determine if it is sp3. 
+	angles : list of floats or None
+		These are the angles between each pair of neighbours around this atom, as given by get_neighbour_pair_angles. If None, these are obtained here. Default: None.
 
 	Returns
 	-------
@@ -46,7 +57,7 @@ def is_sp3(molecule, molecule_graph, index):
 	"""
 
 	# First, get the indices of the neighbours
-	neighbour_indices = list(molecule_graph[index])
+	neighbour_indices = compact_molecule.get_neighbours(index)
 
 	# Second, depending on the number of neighbours
 	if len(neighbour_indices) == 4:
@@ -60,13 +71,8 @@ def is_sp3(molecule, molecule_graph, index):
 		# We assume here that an sp3 carbon is one where all the angles between neighbouring atoms are less than ~115.0 degrees in angle
 
 		# Get the angles between the central atom and other neighbouring atoms.
-		angles = []
-		for i1 in range(len(neighbour_indices)):
-			neighbour_index_1 = neighbour_indices[i1]
-			for i2 in range(i1+1,len(neighbour_indices)):
-				neighbour_index_2 = neighbour_indices[i2]
-				angle = molecule.get_angle(neighbour_index_1, index, neighbour_index_2, mic=False)
-				angles.append(angle)
+		if angles is None:
+			angles = get_neighbour_pair_angles(compact_molecule, [index], mic=False)[index]
 
 		# If all angles are less than 115.0 degrees, we assume the atom is sp3
 		if all([angle < 115.0 for angle in angles]):
@@ -78,7 +84,7 @@ def is_sp3(molecule, molecule_graph, index):
 		# Will check the bond length to see if it is the length of a single bond, or if it is short enough to indicate a double or triple bond.
 
 		neighbour_index_1 = neighbour_indices[0]
-		bond_length = molecule.get_distance(index,neighbour_index_1)
+		bond_length = np.sqrt(np.add.reduce((compact_molecule.positions[neighbour_index_1] - compact_molecule.positions[index])**2))
 		if bond_length >= 1.3: #A
 			return True
 
@@ -3,14 +3,17 @@ remove_atoms_from_molecule.py, Geoffrey Weal, 19/2/22
 
 This script is designed to remove the given atoms from the molecule and the graph associated with the molecule.
 """
-from copy     import deepcopy
-from networkx import relabel_nodes
+import numpy as np
+from networkx import Graph
 from SUMELF   import get_unit_vector
 
 def remove_atoms_from_molecule(molecule, molecule_graph, atoms_to_delete_indices, atoms_to_turn_into_hydrogens, remove_non_H_leaf_atoms=True, return_new_branch_indices=True):
 	"""
 	This method will remove the given atoms from the molecule and the graph associated with the molecule.
 
+	All the atoms are removed at once using a mask of the atoms to keep, so the molecule and graph given are not modified. 
+	A new molecule and graph are made that only contain the atoms that are kept.
+
 	Parameters
 	----------
 	molecule : ase.Atoms
@@ -37,37 +40,31 @@ def remove_atoms_from_molecule(molecule, molecule_graph, atoms_to_delete_indices
 	"""
 
 	# First, get all the atom indices to remove. Include non-hydrogen atoms attached to leaf atoms (that are not alpha atoms) if remove_non_H_leaf_atoms == True
+	symbols = molecule.get_chemical_symbols()
 	if remove_non_H_leaf_atoms:
-		final_atoms_to_delete_indices = sorted(set(deepcopy(atoms_to_delete_indices) + [outer_index for outer_index, inner_index in sorted(atoms_to_turn_into_hydrogens) if (not molecule[outer_index].symbol in ['H', 'D', 'T'])]))
+		final_atoms_to_delete_indices = sorted(set(list(atoms_to_delete_indices) + [outer_index for outer_index, inner_index in sorted(atoms_to_turn_into_hydrogens) if (not symbols[outer_index] in ['H', 'D', 'T'])]))
 	else:
-		final_atoms_to_delete_indices = deepcopy(sorted(set(atoms_to_delete_indices)))
+		final_atoms_to_delete_indices = sorted(set(atoms_to_delete_indices))
 
-	# Second, get the original indices of atoms in the molecules before atoms were deleted.
-	original_atom_indices = list(range(len(molecule)))
+	# Second, obtain the mask of the atoms to keep, and the new index of each atom that is kept (-1 for atoms that are removed).
+	keep_mask = np.ones(len(molecule), dtype=bool)
+	keep_mask[np.array(final_atoms_to_delete_indices, dtype=int)] = False
+	original_to_new_indices = np.full(len(molecule), -1, dtype=int)
+	original_to_new_indices[keep_mask] = np.arange(int(keep_mask.sum()))
 
-	# Third, remove all atoms involved in the aliphatic side chains.
-	for index in sorted(final_atoms_to_delete_indices, reverse=True):
-		del molecule[index]
-		del original_atom_indices[index]
+	# Third, remove all atoms involved in the aliphatic side chains. This slices all the per-atom arrays of the molecule once.
+	molecule = molecule[keep_mask]
 
-	# Fourth, modify the molecule_graph so that is properly reflect this now modified molecule with the aliphatic side chains removed.
-	molecule_graph.remove_nodes_from(final_atoms_to_delete_indices)
-	mapping = {original_index: new_index for new_index, original_index in enumerate(original_atom_indices)}
-	molecule_graph = relabel_nodes(molecule_graph, mapping)
+	# Fourth, make the graph for this now modified molecule with the aliphatic side chains removed.
+	molecule_graph = get_graph_of_kept_atoms(molecule_graph, keep_mask, original_to_new_indices)
 
 	# Fifth, check if leaf atoms are hydrogens. 
 	#        * If they are not, turn them into hydrogen atoms with appropriate bond length to the alpha atom.
 	if not remove_non_H_leaf_atoms:
-		for outer_index, inner_index in sorted(atoms_to_turn_into_hydrogens, reverse=True):
-			new_inner_index = mapping[inner_index]
-			new_outer_index = mapping[outer_index]
-			if not (molecule[new_outer_index].symbol in ['H', 'D', 'T']):
-				position = readjust_for_hydrogen(molecule, new_outer_index, new_inner_index)
-				molecule[new_outer_index].symbol = 'H' 
-				molecule[new_outer_index].position = position
+		turn_leaf_atoms_into_hydrogens(molecule, atoms_to_turn_into_hydrogens, original_to_new_indices)
 
 	# Sixth, get the indices of the atoms at the end of branches for this molecule.
-	branch_atoms_indices = sorted(set([mapping[inner_index] for outer_index, inner_index in atoms_to_turn_into_hydrogens]))
+	branch_atoms_indices = sorted(set([int(original_to_new_indices[inner_index]) for outer_index, inner_index in atoms_to_turn_into_hydrogens]))
 
 	# Seventh, return the updated molecules and molecule_graph without sidegroups.
 	if return_new_branch_indices:
@@ -75,6 +72,89 @@ def remove_atoms_from_molecule(molecule, molecule_graph, atoms_to_delete_indices
 	else:
 		return molecule, molecule_graph
 
+def get_graph_of_kept_atoms(molecule_graph, keep_mask, original_to_new_indices):
+	"""
+	This method will make a new graph that only contains the atoms that are kept, relabelled with their new indices.
+
+	The nodes and edges are added in the same order as they are found in molecule_graph, and their properties are copied. molecule_graph is not modified.
+
+	Parameters
+	----------
+	molecule_graph : networkx.Graph
+		This is the graph of the molecule before atoms were removed.
+	keep_mask : numpy.array of bools
+		This indicates which atoms in the original molecule are kept.
+	original_to_new_indices : numpy.array of ints
+		This gives the new index of each atom in the original molecule that is kept.
+
+	Returns
+	-------
+	new_molecule_graph : networkx.Graph
+		This is the graph of the molecule with only the atoms that are kept.
+	"""
+
+	# First, obtain the nodes and edges of the original graph, along with their properties.
+	nodes = list(molecule_graph.nodes(data=True))
+	edges = list(molecule_graph.edges(data=True))
+
+	# Second, determine which nodes and edges are kept, and obtain their new indices.
+	node_indices = np.array([index for index, _ in nodes], dtype=int)
+	edge_indices = np.array([(index1, index2) for index1, index2, _ in edges], dtype=int).reshape(-1, 2)
+	is_node_kept = keep_mask[node_indices]
+	is_edge_kept = keep_mask[edge_indices[:,0]] & keep_mask[edge_indices[:,1]]
+	new_node_indices = original_to_new_indices[node_indices].tolist()
+	new_edge_indices = original_to_new_indices[edge_indices].tolist()
+
+	# Third, make the new graph.
+	new_molecule_graph = Graph()
+	new_molecule_graph.graph.update(molecule_graph.graph)
+	new_molecule_graph.add_nodes_from((new_index, node_properties.copy()) for new_index, (_, node_properties), is_kept in zip(new_node_indices, nodes, is_node_kept) if is_kept)
+	new_molecule_graph.add_edges_from((new_index1, new_index2, edge_properties.copy()) for (new_index1, new_index2), (_, _, edge_properties), is_kept in zip(new_edge_indices, edges, is_edge_kept) if is_kept)
+	return new_molecule_graph
+
+def turn_leaf_atoms_into_hydrogens(molecule, atoms_to_turn_into_hydrogens, original_to_new_indices):
+	"""
+	This method will turn the leaf atoms into hydrogens, placing them at an appropriate bond length from the atom they are bound to.
+
+	If a leaf atom is given more than once, it is moved along the bond to the atom given with it in the last (outer_index, inner_index) pair in sorted order.
+
+	Parameters
+	----------
+	molecule : ase.Atoms
+		This is the molecule with atoms removed. This is modified in place.
+	atoms_to_turn_into_hydrogens : list of (int, int)
+		This is the list of indices (in the original molecule) to be turned into hydrogen atoms (if they are not already hydrogen atoms), along with the atom they are bound to.
+	original_to_new_indices : numpy.array of ints
+		This gives the new index of each atom in the original molecule that is kept.
+	"""
+
+	# First, obtain the leaf atoms to turn into hydrogens, and the atoms they are bound to, in the molecule with atoms removed.
+	symbols = molecule.get_chemical_symbols()
+	outer_indices = []
+	inner_indices = []
+	outer_indices_found = set()
+	for outer_index, inner_index in sorted(atoms_to_turn_into_hydrogens, reverse=True):
+		new_outer_index = int(original_to_new_indices[outer_index])
+		if (new_outer_index in outer_indices_found) or (symbols[new_outer_index] in ['H', 'D', 'T']):
+			continue
+		outer_indices_found.add(new_outer_index)
+		outer_indices.append(new_outer_index)
+		inner_indices.append(int(original_to_new_indices[inner_index]))
+	if len(outer_indices) == 0:
+		return
+
+	# Second, if a leaf atom is also bound to another leaf atom being turned into a hydrogen, move the leaf atoms one at a time, as the position of one depends on the other.
+	if len(set(outer_indices) & set(inner_indices)) > 0:
+		for new_outer_index, new_inner_index in zip(outer_indices, inner_indices):
+			position = readjust_for_hydrogen(molecule, new_outer_index, new_inner_index)
+			molecule[new_outer_index].symbol = 'H' 
+			molecule[new_outer_index].position = position
+		return
+
+	# Third, move all the leaf atoms to their hydrogen positions at once, and turn them into hydrogens.
+	molecule.positions[outer_indices] = readjust_for_hydrogens(molecule.positions[outer_indices], molecule.positions[inner_indices])
+	molecule.numbers[outer_indices] = 1
+
 atom_to_H_bond_length = 0.97 # Å
 def readjust_for_hydrogen(molecule, beta_index, alpha_index):
 	"""
@@ -108,4 +188,28 @@ def readjust_for_hydrogen(molecule, beta_index, alpha_index):
 	# Fourth, return the new position for the beta atom.
 	return new_beta_point
 
+def readjust_for_hydrogens(beta_points, alpha_points):
+	"""
+	This method will give the positions to place many beta atoms in for the beta atoms to be turned into hydrogen atoms.
+
+	This does the same as readjust_for_hydrogen, but for many beta atoms at once.
+
+	Parameters
+	----------
+	beta_points : numpy.array
+		These are the positions of the beta atoms that will be changed to hydrogen atoms.
+	alpha_points : numpy.array
+		These are the positions of the alpha atoms that are attached to each beta atom. 
+
+	Returns
+	-------
+	new_beta_points : numpy.array
+		These are the positions to place the beta atoms in so they have the right lengths for H atoms from the alpha atoms.
+	"""
+
+	# First, get the unit vectors for the directions from the alpha atoms to the beta atoms.
+	vectors = beta_points - alpha_points
+	unit_vectors = vectors / np.linalg.norm(vectors, axis=1)[:,np.newaxis]
 
+	# Second, return the new positions for the beta atoms.
+	return atom_to_H_bond_length*unit_vectors + alpha_points
@@ -0,0 +1,288 @@
+"""
+run_RSGC_on_database.py, Geoffrey Weal, 17/10/26
+
+This program will run the RSGC program on all the crystals in a crystal database, using as many cpus as you give it.
+"""
+import os, time, shutil
+from multiprocessing import Pool
+
+from RSGC                                                         import __version__
+
+from RSGC.RSGC.run_RSGC_on_database_methods.get_crystal_filepaths import get_crystal_filepaths
+from RSGC.RSGC.run_RSGC_on_database_methods.run_RSGC_on_crystal   import run_RSGC_on_crystal
+from RSGC.RSGC.run_RSGC_on_database_methods.RSGC_Manifest         import RSGC_Manifest
+from RSGC.RSGC.run_RSGC_on_database_methods.run_RSGC_on_crystals_with_budgets import run_RSGC_on_crystals_with_budgets
+from RSGC.RSGC.run_RSGC_on_database_methods.aggregate_stage_times             import aggregate_stage_times
+from RSGC.RSGC.RSGC_methods.Diagnostics_Sink                                  import save_diagnostics, write_file, diagnostics_txt_filename
+
+def run_RSGC_on_database(crystal_database_dirname, repaired_crystal_database_dirname=None, exclude_identifiers=[], save_crystal_folderpath=None, make_molecule_method='component_assembly_approach', leave_as_ethyls=False, add_hydrogens_to_alpha_carbons=False, save_molecules_individually=False, wrap=False, process_equivalent_molecules_once=False, sidegroup_roles_memo_filepath=None, problematic_molecules_policy='skip_crystal', quarantine_folderpath=None, no_of_cpus=1, issues_filepath='RSGC_issues.txt', cache_folderpath=None, cache_max_size_MB=1000.0, manifest_filepath=None, watch=False, watch_interval=60.0, max_time_per_crystal=None, max_memory_per_crystal_MB=None, output_database_filepath=None, stage_times_folderpath=None, record_stage_memory=False, low_memory=False, diagnostics_folderpath=None, use_embedded_graph=False, check_embedded_graph=False, bonding_method='obtain_graph'):
+	"""
+	This method is designed to remove aliphatic sidechains from all the crystals in a crystal database.
+
+	Crystals are processed in parallel over no_of_cpus processes. Any issues found for a crystal are recorded and do not stop the other crystals from being processed.
+
+	If manifest_filepath is given, the outcome of each crystal is recorded in this manifest as soon as it has been processed. If the manifest already exists, the previous run is resumed: 
+	crystals that were processed successfully are skipped, and only crystals that had issues, crystals that are new, and crystals whose file or settings have changed are processed.
+	If watch is True, crystals that had issues are only processed again while watching if their file changes, so a crystal that keeps failing is not processed every watch_interval.
+
+	If max_time_per_crystal or max_memory_per_crystal_MB is given, each crystal is processed in its own process. If a crystal goes over its time or memory budget, its process is stopped
+	and the crystal is recorded as 'timed_out' or 'out_of_memory', so that one crystal can not freeze or take down the whole run.
+
+	The diagnostics found for each crystal (such as rings that contain hydrogens) are kept by each process and recorded in the manifest. The issues file and the diagnostics files are
+	emptied when a new run is started (but not when a previous run is resumed). After each pass over the crystal database, these files are written again from the manifest, in the same
+	order as the crystal files, so they give the latest outcome of each crystal. Each file is replaced in one go so that it is never left half-written. Runs at the same time should be
+	given their own issues_filepath and diagnostics_folderpath.
+
+	Parameters
+	----------
+	crystal_database_dirname : str.
+		This is the path to the folder that contains the crystal database you want to remove sidegroups from.
+	repaired_crystal_database_dirname : str. or None
+		This is the path to the folder that contains the repaired crystals obtained from the ReCrystals program. If a crystal is found in this folder, it will be used instead of the crystal in crystal_database_dirname. Default: None.
+	exclude_identifiers : list of str.
+		These are the identifiers of the crystals you do not want to remove sidegroups from. Default: [].
+	save_crystal_folderpath : str. or None
+		This is the folder path to save the crystals with sidegroups removed into. If None, this is set to crystal_database_dirname+'_with_removed_sidegroups'. Default: None.
+	make_molecule_method : str.
+		This is the name of the method you want to use to create the molecule. See https://github.com/geoffreyweal/ECCP for more information. Default: 'component_assembly_approach'.
+	leave_as_ethyls : bool.
+		If False, all sidegroups will be left as methyl. If true, they will be given as ethyl (to their beta carbon). Default: False.
+	add_hydrogens_to_alpha_carbons : bool.
+		If True, add any missing hydrogens to the sp3 carbons at the end of the sidegroups that have been shortened. Default: False.
+	save_molecules_individually : bool.
+		This tag indicates if you also want to save the molecules in the crystal individual. Default: False.
+	wrap : bool.
+		If true, wrap the molecule in the unit cell. If false, keep the molecule in its connected form. Default: False.
+	process_equivalent_molecules_once : bool.
+		If True, molecules in a crystal that are equivalent to each other are only fully processed once, and the result is reused for the other equivalent molecules. Default: False.
+	sidegroup_roles_memo_filepath : str. or None
+		This is the path to a sqlite database file that records the sidegroup roles of molecules, so that they can be reused for the same molecule in other crystals and in later runs. If None, no memo is used. Default: None.
+	problematic_molecules_policy : str.
+		This is what to do if a molecule in the crystal has no atoms in it, either 'interactive', 'skip_molecule', 'skip_crystal', or 'fail'. See check_molecules for more information. 'interactive' should not be used when no_of_cpus is more than 1. Default: 'skip_crystal'.
+	quarantine_folderpath : str. or None
+		This is the path to the folder to save problematic molecules into, along with the reason they are problematic. If None, problematic molecules are not saved. Default: None.
+	no_of_cpus : int.
+		This is the number of processes to remove sidegroups from crystals with. Default: 1.
+	issues_filepath : str.
+		This is the path to the file to record the issues found while running the RSGC program. Default: 'RSGC_issues.txt'.
+	cache_folderpath : str. or None
+		This is the path to the folder to cache the files made by the RSGC program in. Crystals that have already been processed with the same settings are restored from this cache rather than processed again. If None, no cache is used. Default: None.
+	cache_max_size_MB : float or None
+		This is the largest size (in MB) that the cache can be. If None, the cache has no size limit. Default: 1000.0.
+	manifest_filepath : str. or None
+		This is the path to the json lines file that records the outcome of each crystal. If this file exists, the previous run is resumed rather than started again. If None, no manifest file is written. Default: None.
+	watch : bool.
+		If True, keep checking the crystal database for new or changed crystal files every watch_interval seconds, and process them, until this program is stopped with Ctrl+C. Default: False.
+	watch_interval : float
+		This is the time (in seconds) to wait between checking the crystal database for new or changed crystal files if watch is True. Default: 60.0.
+	max_time_per_crystal : float or None
+		This is the longest time (in seconds) that a crystal can take to be processed before it is stopped. If None, there is no time budget. Default: None.
+	max_memory_per_crystal_MB : float or None
+		This is the most memory (in MB) that the process for a crystal can use before it is stopped. This is only used on Linux. If None, there is no memory budget. Default: None.
+	output_database_filepath : str. or None
+		This is the path to an ASE database file to save all the crystals (and their molecules if save_molecules_individually is True) into, rather than saving many xyz files into save_crystal_folderpath. This can not be used with cache_folderpath. If None, xyz files are saved. Default: None.
+	stage_times_folderpath : str. or None
+		This is the path to the folder to save the time taken by each stage of the RSGC program (and counts such as the number of rings found) for each crystal into. These are also gathered into "stage_times.csv" in this folder, with one row for each stage of each crystal. If None, stage times are not recorded. Default: None.
+	record_stage_memory : bool.
+		If True, also record the peak memory used by each stage in the stage times. This makes the RSGC program slower. Only used if stage_times_folderpath is given. Default: False.
+	low_memory : bool.
+		If True, use less memory for each crystal by releasing the original crystal and molecules as soon as they are no longer needed, and by saving each molecule as soon as it has been made. Default: False.
+	diagnostics_folderpath : str. or None
+		This is the path to the folder to write the diagnostics found for all the crystals into ("Rings_with_hydrogens_in_them.txt" and "RSGC_diagnostics.jsonl"). If None, these are written into the current working directory. Default: None.
+	use_embedded_graph : bool.
+		If True and a crystal file already contains the graph of the crystal (such as those made by ReCrystals and ACSD), the graph is obtained from the crystal file rather than with obtain_graph. Default: False.
+	check_embedded_graph : bool.
+		If True, check that some of the bonds in the graph given in the crystal file are not much longer than a covalent bond before using it. Only used if use_embedded_graph is True. Default: False.
+	bonding_method : str.
+		This is the method used to obtain the graph of the crystal, either 'obtain_graph' (from SUMELF) or 'cell_list', which finds the bonds between atoms closer than 1.2 times the sum of their covalent radii using a KD-tree (if scipy is installed) or the cell list of ASE. 'cell_list' is faster for large unit cells, but only gives the element of each atom in the graph. See get_cell_list_graph for more information. Default: 'obtain_graph'.
+
+	Returns
+	-------
+	results : list of (str., str., str. or None)
+		These are the results for each crystal processed in this run, given in the same order as the crystal files. Each result contains the path to the crystal, the outcome ('successful', 'Hydrogen_in_Ring_Exception', 'Problematic_Molecules_Exception', 'Unexpected_Coordination_Exception', 'timed_out', 'out_of_memory', or 'failed') and the issue message (None if successful).
+	"""
+
+	# First, check that no_of_cpus is a sensible value.
+	if not (isinstance(no_of_cpus, int) and (no_of_cpus >= 1)):
+		raise Exception(f'Error: no_of_cpus must be an integer that is 1 or greater. no_of_cpus = {no_of_cpus}')
+
+	# Second, get the paths to the crystals you want to remove sidegroups from.
+	filepath_names = get_crystal_filepaths(crystal_database_dirname, repaired_crystal_database_dirname=repaired_crystal_database_dirname, exclude_identifiers=exclude_identifiers)
+
+	# Third, determine the folder to save crystals to.
+	if save_crystal_folderpath is None:
+		save_crystal_folderpath = f'{crystal_database_dirname.rstrip("/")}_with_removed_sidegroups'
+
+	# Fourth, reset the RSGC files from previous RSGC runs, unless a previous run is being resumed from its manifest.
+	resume = (manifest_filepath is not None) and os.path.exists(manifest_filepath)
+	if resume:
+		print(f'Resuming the previous run recorded in {manifest_filepath}')
+	else:
+
+		# 4.1: Remove the folders that we will place crystals and molecules in that we will remove sidegroups from.
+		for folderpath in [save_crystal_folderpath, save_crystal_folderpath+'_molecules']:
+			if os.path.exists(folderpath):
+				shutil.rmtree(folderpath)
+
+		# 4.2: Remove the database that we will place crystals and molecules in.
+		if (output_database_filepath is not None) and os.path.exists(output_database_filepath):
+			os.remove(output_database_filepath)
+
+		# 4.3: Empty the issues file and the diagnostics files (such as which rings contain hydrogens in them) written by previous RSGC runs.
+		write_file(issues_filepath, '')
+		save_diagnostics([], diagnostics_folderpath)
+
+		# 4.4: Remove the stage times recorded in previous RSGC runs.
+		if (stage_times_folderpath is not None) and os.path.exists(stage_times_folderpath):
+			shutil.rmtree(stage_times_folderpath)
+
+	# Fifth, set up the inputs to give to each RSGC process, and the manifest to record the outcome of each crystal in.
+	#         * The manifest records the settings that change the files made by the RSGC program, so that crystals are processed again if these are changed.
+	RSGC_settings = {'save_crystal_folderpath': save_crystal_folderpath, 'make_molecule_method': make_molecule_method, 'leave_as_ethyls': leave_as_ethyls, 'add_hydrogens_to_alpha_carbons': add_hydrogens_to_alpha_carbons, 'save_molecules_individually': save_molecules_individually, 'wrap': wrap, 'process_equivalent_molecules_once': process_equivalent_molecules_once, 'sidegroup_roles_memo_filepath': sidegroup_roles_memo_filepath, 'problematic_molecules_policy': problematic_molecules_policy, 'quarantine_folderpath': quarantine_folderpath, 'cache_folderpath': cache_folderpath, 'cache_max_size_MB': cache_max_size_MB, 'output_database_filepath': output_database_filepath, 'stage_times_folderpath': stage_times_folderpath, 'record_stage_memory': record_stage_memory, 'low_memory': low_memory, 'use_embedded_graph': use_embedded_graph, 'check_embedded_graph': check_embedded_graph, 'bonding_method': bonding_method}
+	manifest_settings = {'save_crystal_folderpath': save_crystal_folderpath, 'make_molecule_method': make_molecule_method, 'leave_as_ethyls': leave_as_ethyls, 'add_hydrogens_to_alpha_carbons': add_hydrogens_to_alpha_carbons, 'save_molecules_individually': save_molecules_individually, 'wrap': wrap, 'problematic_molecules_policy': problematic_molecules_policy, 'output_database_filepath': output_database_filepath, 'use_embedded_graph': use_embedded_graph, 'check_embedded_graph': check_embedded_graph, 'bonding_method': bonding_method, 'version': __version__}
+	manifest = RSGC_Manifest(manifest_filepath)
+
+	# Sixth, run the RSGC program on the crystals, checking the crystal database again every watch_interval seconds if watch is True.
+	#         * Crystals that were not processed successfully are processed again once when the run starts. After this, only crystals that are new or have been changed are processed.
+	results = []
+	retry_failed = True
+	try:
+		while True:
+
+			# 6.1: Determine which of the crystals need to be processed.
+			filepath_names_to_process = manifest.get_crystals_to_process(filepath_names, manifest_settings, retry_failed=retry_failed)
+			retry_failed = False
+			if (len(filepath_names_to_process) < len(filepath_names)) and ((not watch) or (len(filepath_names_to_process) > 0)):
+				print(f'Skipping {len(filepath_names) - len(filepath_names_to_process)} crystal(s) that have already been processed.')
+
+			# 6.2: Run the RSGC program on the crystals that need to be processed, recording the outcome of each crystal in the manifest.
+			#      * The issues and diagnostics of all the crystals in the crystal database are then written from the manifest, in the same order as the crystal files.
+			#        This is also done if the run is stopped part way through, so the crystals that had finished are included.
+			try:
+				new_results = run_RSGC_on_crystals(filepath_names_to_process, RSGC_settings, manifest, manifest_settings, no_of_cpus, max_time_per_crystal=max_time_per_crystal, max_memory_per_crystal_MB=max_memory_per_crystal_MB)
+				results += new_results
+			finally:
+				issues, diagnostics = write_issues_and_diagnostics(manifest, filepath_names, issues_filepath, diagnostics_folderpath)
+
+			# 6.3: Gather the stage times recorded for each crystal into a single csv file.
+			if (stage_times_folderpath is not None) and os.path.exists(stage_times_folderpath):
+				aggregate_stage_times(stage_times_folderpath, filepath_names)
+
+			# 6.4: Report the number of successful executions.
+			if (not watch) or (len(new_results) > 0):
+				print('========================')
+				print('Number of successfuls: '+str(len(filepath_names) - len(issues))+' out of '+str(len(filepath_names)))
+				print('Number of issues: '+str(len(issues))+(f' (see {issues_filepath})' if (len(issues) > 0) else ''))
+				if len(diagnostics) > 0:
+					print('Number of diagnostics: '+str(len(diagnostics))+' (see '+os.path.join('.' if (diagnostics_folderpath is None) else diagnostics_folderpath, diagnostics_txt_filename)+')')
+
+			# 6.5: If not watching the crystal database, the run is finished. Otherwise, wait and then get the paths to the crystals in the crystal database again.
+			if not watch:
+				break
+			time.sleep(watch_interval)
+			filepath_names = get_crystal_filepaths(crystal_database_dirname, repaired_crystal_database_dirname=repaired_crystal_database_dirname, exclude_identifiers=exclude_identifiers)
+
+	except KeyboardInterrupt:
+		# 6.6: Stop watching the crystal database if the user presses Ctrl+C.
+		if not watch:
+			raise
+		print('Stopped watching '+str(crystal_database_dirname))
+
+	# Seventh, return the results for each crystal processed in this run.
+	return results
+
+def write_issues_and_diagnostics(manifest, filepath_names, issues_filepath='RSGC_issues.txt', diagnostics_folderpath=None):
+	"""
+	This method is designed to write the issues and diagnostics recorded in the manifest for the crystals given into the issues file and the diagnostics files.
+
+	Each file is replaced in one go (by writing a temporary file and then renaming it), so it is never left half-written. If there are no issues or diagnostics, the file is left empty.
+
+	Parameters
+	----------
+	manifest : RSGC_Manifest
+		This is the manifest that the outcome of each crystal is recorded in.
+	filepath_names : list of str.
+		These are the paths to the crystals to write the issues and diagnostics of, in the order to write them.
+	issues_filepath : str.
+		This is the path to the file to record the issues found while running the RSGC program. Default: 'RSGC_issues.txt'.
+	diagnostics_folderpath : str. or None
+		This is the path to the folder containing the diagnostics files. If None, these are in the current working directory. Default: None.
+
+	Returns
+	-------
+	issues : list of (str., str.)
+		These are the issues written, given as the path to the crystal and the issue message.
+	diagnostics : list of dict.
+		These are the diagnostics written. See Diagnostics_Sink for more information.
+	"""
+
+	# First, write the issues found for these crystals into the issues file.
+	issues = manifest.get_issues(filepath_names)
+	write_file(issues_filepath, ''.join(filepath+': '+str(message)+'\n' for filepath, message in issues))
+
+	# Second, write the diagnostics found for these crystals into the diagnostics files.
+	diagnostics = manifest.get_diagnostics(filepath_names)
+	save_diagnostics(diagnostics, diagnostics_folderpath)
+
+	# Third, return the issues and diagnostics written.
+	return issues, diagnostics
+
+def run_RSGC_on_crystals(filepath_names, RSGC_settings, manifest, manifest_settings, no_of_cpus=1, max_time_per_crystal=None, max_memory_per_crystal_MB=None):
+	"""
+	This method is designed to run the RSGC program on the crystals given, recording the outcome of each crystal in the manifest as soon as it has been processed.
+
+	Parameters
+	----------
+	filepath_names : list of str.
+		These are the paths to the crystals to remove sidegroups from.
+	RSGC_settings : dict.
+		These are the settings to give to the RSGC program.
+	manifest : RSGC_Manifest
+		This is the manifest to record the outcome of each crystal in.
+	manifest_settings : dict.
+		These are the settings that change the files made by the RSGC program, to record in the manifest.
+	no_of_cpus : int.
+		This is the number of processes to remove sidegroups from crystals with. Default: 1.
+	max_time_per_crystal : float or None
+		This is the longest time (in seconds) that a crystal can take to be processed before it is stopped. If None, there is no time budget. Default: None.
+	max_memory_per_crystal_MB : float or None
+		This is the most memory (in MB) that the process for a crystal can use before it is stopped. If None, there is no memory budget. Default: None.
+
+	Returns
+	-------
+	results : list of (str., str., str. or None)
+		These are the results for each crystal, given in the same order as filepath_names.
+	"""
+
+	# First, set up the inputs to give to each RSGC process.
+	tasks = [(filepath, RSGC_settings) for filepath in filepath_names]
+
+	# Second, run the RSGC program on all the crystals.
+	#         * imap returns the results in the same order as tasks, so the results are deterministic no matter how many cpus are used.
+	total_no_of_crystals = str(len(tasks))
+	results = []
+	if (max_time_per_crystal is not None) or (max_memory_per_crystal_MB is not None):
+		# 2.1: Each crystal is processed in its own process so that it can be stopped if it goes over its budget. Crystals are given in the order they finish, so are put back into order afterwards.
+		crystal_order = {filepath: index for index, filepath in enumerate(filepath_names)}
+		crystal_results = run_RSGC_on_crystals_with_budgets(tasks, no_of_cpus=no_of_cpus, max_time_per_crystal=max_time_per_crystal, max_memory_per_crystal_MB=max_memory_per_crystal_MB)
+		for counter, (filepath, outcome, message, duration, diagnostics) in enumerate(crystal_results, start=1):
+			manifest.record(filepath, manifest_settings, outcome, message, duration, diagnostics)
+			results.append((filepath, outcome, message))
+			print('Processed crystal: '+str(counter)+' out of '+total_no_of_crystals)
+		results.sort(key=lambda result: crystal_order[result[0]])
+	elif (no_of_cpus == 1) or (len(tasks) <= 1):
+		crystal_results = (run_RSGC_on_crystal(task) for task in tasks)
+		for counter, (filepath, outcome, message, duration, diagnostics) in enumerate(crystal_results, start=1):
+			manifest.record(filepath, manifest_settings, outcome, message, duration, diagnostics)
+			results.append((filepath, outcome, message))
+			print('Processed crystal: '+str(counter)+' out of '+total_no_of_crystals)
+	else:
+		with Pool(processes=min(no_of_cpus, len(tasks))) as pool:
+			for counter, (filepath, outcome, message, duration, diagnostics) in enumerate(pool.imap(run_RSGC_on_crystal, tasks, chunksize=1), start=1):
+				manifest.record(filepath, manifest_settings, outcome, message, duration, diagnostics)
+				results.append((filepath, outcome, message))
+				print('Processed crystal: '+str(counter)+' out of '+total_no_of_crystals)
+
+	# Third, return the results for each crystal.
+	return results
+
@@ -0,0 +1,289 @@
+"""
+RSGC_Manifest.py, Geoffrey Weal, 17/10/26
+
+This class is designed to record the status of each crystal in a crystal database run, so that a run that was stopped can be restarted without processing the finished crystals again.
+"""
+import os, json, time, tempfile
+
+from RSGC.RSGC.RSGC_methods.get_file_hash import get_file_hash
+
+class RSGC_Manifest:
+	"""
+	This class is designed to record the status of each crystal in a crystal database run, so that a run that was stopped can be restarted without processing the finished crystals again.
+
+	For each crystal, the manifest records the hash of the crystal file, the settings it was processed with, the outcome of running the RSGC program on it, and how long this took.
+	A crystal needs to be processed if it is not in the manifest, if its crystal file or the settings have changed since it was processed, or (if retry_failed is True) if it was
+	not processed successfully.
+
+	The manifest is saved as a json lines file, where each line is the record of a crystal. The record of each crystal is added to the end of the file as soon as it has been
+	processed, so that recording a crystal does not take longer as the manifest gets bigger. When the manifest is loaded, the last record of each crystal is used, and the manifest
+	file is rewritten with only these records (by writing a temporary file and then renaming it, so that the manifest file is never left half-written). A line that was only
+	half-written when a run was stopped is ignored.
+
+	Parameters
+	----------
+	manifest_filepath : str. or None
+		This is the path to the json lines file to record the manifest in. If this file exists, the manifest in this file is loaded. If None, the manifest is only kept in memory. Default: None.
+
+	Attributes
+	----------
+	manifest_filepath : str. or None
+		This is the path to the json lines file to record the manifest in.
+	crystals : dict.
+		This is the record of each crystal, given by the path to the crystal file.
+	"""
+	def __init__(self, manifest_filepath=None):
+
+		# First, record the path to the manifest file.
+		self.manifest_filepath = manifest_filepath
+
+		# Second, load the manifest from the manifest file if it exists, and rewrite the manifest file with only the last record of each crystal.
+		self.crystals = {}
+		if (self.manifest_filepath is not None) and os.path.exists(self.manifest_filepath):
+			self.crystals = self.load()
+			self.save()
+
+	def get_crystals_to_process(self, filepath_names, settings, retry_failed=True):
+		"""
+		This method will give the crystals that need to be processed.
+
+		Parameters
+		----------
+		filepath_names : list of str.
+			These are the paths to the crystal files in the crystal database.
+		settings : dict.
+			These are the settings that change the files made by the RSGC program.
+		retry_failed : bool.
+			If True, crystals that were not processed successfully are processed again. If False, these are only processed again if their crystal file or the settings have changed. Default: True.
+
+		Returns
+		-------
+		filepath_names_to_process : list of str.
+			These are the paths to the crystal files that need to be processed, in the same order as in filepath_names.
+		"""
+
+		# First, go through each crystal in the crystal database.
+		filepath_names_to_process = []
+		for filepath in filepath_names:
+
+			# 1.1: Obtain the record of this crystal.
+			record = self.crystals.get(filepath, None)
+
+			# 1.2: Determine if this crystal has been processed (successfully, unless retry_failed is False) with the same crystal file and settings.
+			if (record is not None) and ((record['outcome'] == 'successful') or (not retry_failed)) and (record['settings'] == settings) and self.is_unchanged(filepath):
+				continue
+
+			# 1.3: This crystal needs to be processed.
+			filepath_names_to_process.append(filepath)
+
+		# Second, return the crystals that need to be processed.
+		return filepath_names_to_process
+
+	def record(self, filepath, settings, outcome, message, duration, diagnostics=[]):
+		"""
+		This method will record the outcome of running the RSGC program on a crystal, and add this record to the end of the manifest file.
+
+		Parameters
+		----------
+		filepath : str.
+			This is the path to the crystal file.
+		settings : dict.
+			These are the settings that change the files made by the RSGC program.
+		outcome : str.
+			This is the outcome of running the RSGC program on this crystal.
+		message : str. or None
+			This is the issue that was found when running the RSGC program on this crystal. None if the RSGC program was successful.
+		duration : float
+			This is the time (in seconds) it took to run the RSGC program on this crystal.
+		diagnostics : list of dict.
+			These are the diagnostics found for this crystal. See Diagnostics_Sink for more information. Default: [].
+		"""
+		file_stat = os.stat(filepath)
+		self.crystals[filepath] = {'input_hash': self.get_input_hash(filepath), 'file_size': file_stat.st_size, 'file_mtime_ns': file_stat.st_mtime_ns, 'settings': settings, 'outcome': outcome, 'message': message, 'finished_at': time.time(), 'duration': duration, 'diagnostics': list(diagnostics)}
+		self.append(filepath)
+
+	def get_issues(self, filepath_names):
+		"""
+		This method will give the issues recorded for the crystals given.
+
+		Parameters
+		----------
+		filepath_names : list of str.
+			These are the paths to the crystal files to give issues for.
+
+		Returns
+		-------
+		issues : list of (str., str.)
+			These are the path to each crystal file that was not processed successfully, along with its issue, in the same order as in filepath_names.
+		"""
+		return [(filepath, self.crystals[filepath]['message']) for filepath in filepath_names if ((filepath in self.crystals) and (self.crystals[filepath]['outcome'] != 'successful'))]
+
+	def get_diagnostics(self, filepath_names):
+		"""
+		This method will give the diagnostics recorded for the crystals given.
+
+		Parameters
+		----------
+		filepath_names : list of str.
+			These are the paths to the crystal files to give diagnostics for.
+
+		Returns
+		-------
+		diagnostics : list of dict.
+			These are the diagnostics recorded for these crystals, in the same order as in filepath_names. See Diagnostics_Sink for more information.
+		"""
+		return [record for filepath in filepath_names if (filepath in self.crystals) for record in self.crystals[filepath].get('diagnostics', [])]
+
+	def load(self):
+		"""
+		This method will load the manifest from the manifest file.
+
+		Manifest files written by older versions of the RSGC program (a single json object with the records of all the crystals in "crystals") can also be loaded.
+
+		Returns
+		-------
+		crystals : dict.
+			This is the record of each crystal, given by the path to the crystal file.
+		"""
+
+		# First, read the manifest file.
+		with open(self.manifest_filepath) as manifest_file:
+			manifest_text = manifest_file.read()
+
+		# Second, load manifest files written by older versions of the RSGC program.
+		try:
+			manifest = json.loads(manifest_text)
+		except ValueError:
+			manifest = None
+		if isinstance(manifest, dict) and ('crystals' in manifest):
+			return manifest['crystals']
+
+		# Third, load the record of each crystal from each line. Later records of a crystal replace earlier records, and lines that were only half-written are ignored.
+		crystals = {}
+		for line in manifest_text.splitlines():
+			try:
+				record = json.loads(line)
+			except ValueError:
+				continue
+			if isinstance(record, dict) and ('filepath' in record):
+				crystals[record.pop('filepath')] = record
+		return crystals
+
+	def append(self, filepath):
+		"""
+		This method will add the record of a crystal to the end of the manifest file.
+
+		Parameters
+		----------
+		filepath : str.
+			This is the path to the crystal file.
+		"""
+
+		# First, if there is no manifest file, the manifest is only kept in memory.
+		if self.manifest_filepath is None:
+			return
+
+		# Second, add the record of this crystal to the end of the manifest file as a single line.
+		with open(self.manifest_filepath, 'a') as manifest_file:
+			manifest_file.write(self.get_line(filepath))
+			manifest_file.flush()
+			os.fsync(manifest_file.fileno())
+
+	def save(self):
+		"""
+		This method will save the manifest to the manifest file, with one line for each crystal.
+		"""
+
+		# First, if there is no manifest file, the manifest is only kept in memory.
+		if self.manifest_filepath is None:
+			return
+
+		# Second, write the manifest to a temporary file, and then rename the temporary file to the manifest file.
+		manifest_folderpath = os.path.dirname(os.path.abspath(self.manifest_filepath))
+		file_descriptor, temporary_filepath = tempfile.mkstemp(prefix='.manifest_', suffix='.jsonl', dir=manifest_folderpath)
+		try:
+			with os.fdopen(file_descriptor, 'w') as manifest_file:
+				manifest_file.write(''.join(self.get_line(filepath) for filepath in self.crystals.keys()))
+				manifest_file.flush()
+				os.fsync(manifest_file.fileno())
+			os.replace(temporary_filepath, self.manifest_filepath)
+		except BaseException:
+			if os.path.exists(temporary_filepath):
+				os.remove(temporary_filepath)
+			raise
+
+	# -----------------------------------------------------------------------------------------------------------------------------
+
+	def get_line(self, filepath):
+		"""
+		This method will give the line to write into the manifest file for a crystal.
+
+		Parameters
+		----------
+		filepath : str.
+			This is the path to the crystal file.
+
+		Returns
+		-------
+		line : str.
+			This is the record of this crystal as json, ending with a new line.
+		"""
+		return json.dumps(dict(self.crystals[filepath], filepath=filepath), sort_keys=True)+'\n'
+
+	def is_unchanged(self, filepath):
+		"""
+		This method will determine if a crystal file is the same as when it was recorded.
+
+		The size and modification time of the crystal file are compared first, and the crystal file is only hashed if these are different. If the crystal file has the same hash
+		(such as if it was only touched), the new size and modification time are recorded, so that the crystal file is not hashed again next time.
+
+		Parameters
+		----------
+		filepath : str.
+			This is the path to the crystal file.
+
+		Returns
+		-------
+		is_unchanged : bool.
+			True if the crystal file is the same as when it was recorded.
+		"""
+
+		# First, if the size and modification time of the crystal file have not changed, the crystal file has not changed.
+		record = self.crystals[filepath]
+		file_stat = os.stat(filepath)
+		if (record.get('file_size', None) == file_stat.st_size) and (record.get('file_mtime_ns', None) == file_stat.st_mtime_ns):
+			return True
+
+		# Second, hash the crystal file to determine if it has changed.
+		if get_file_hash(filepath) != record['input_hash']:
+			return False
+
+		# Third, the crystal file has not changed, so record its new size and modification time.
+		record['file_size'] = file_stat.st_size
+		record['file_mtime_ns'] = file_stat.st_mtime_ns
+		self.append(filepath)
+		return True
+
+	def get_input_hash(self, filepath):
+		"""
+		This method will give the hash of a crystal file.
+
+		If the size and modification time of the crystal file have not changed since it was recorded, the recorded hash is used rather than reading the crystal file again.
+
+		Parameters
+		----------
+		filepath : str.
+			This is the path to the crystal file.
+
+		Returns
+		-------
+		input_hash : str.
+			This is the sha256 hash of the crystal file.
+		"""
+		record = self.crystals.get(filepath, None)
+		file_stat = os.stat(filepath)
+		if (record is not None) and (record.get('file_size', None) == file_stat.st_size) and (record.get('file_mtime_ns', None) == file_stat.st_mtime_ns):
+			return record['input_hash']
+		return get_file_hash(filepath)
+
+# -----------------------------------------------------------------------------------------------------------------------------
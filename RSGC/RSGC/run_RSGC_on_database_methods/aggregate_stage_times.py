@@ -0,0 +1,53 @@
+"""
+aggregate_stage_times.py, Geoffrey Weal, 17/10/26
+
+This script is designed to gather the stage times recorded for each crystal in a database run into a single csv file.
+"""
+import os, csv, json
+
+def aggregate_stage_times(stage_times_folderpath, filepath_names, stage_times_csv_filename='stage_times.csv'):
+	"""
+	This method is designed to gather the stage times recorded for each crystal in a database run into a single csv file.
+
+	Each row of the csv file gives one stage, count, or peak memory (in MB) for one crystal, so the csv file can be easily sorted and summed (such as with a spreadsheet or pandas) to find
+	the stages and crystals that take the most time.
+
+	Parameters
+	----------
+	stage_times_folderpath : str.
+		This is the path to the folder that contains the "<crystal_name>_stage_times.json" files made by the RSGC program.
+	filepath_names : list of str.
+		These are the paths to the crystals in the database run. Only the stage times of these crystals are gathered, in this order.
+	stage_times_csv_filename : str.
+		This is the name of the csv file to write in stage_times_folderpath. Default: 'stage_times.csv'.
+
+	Returns
+	-------
+	stage_times_csv_filepath : str.
+		This is the path to the csv file that was written.
+	"""
+
+	# First, gather the stage times and counts for each crystal. Crystals that have no stage times (such as crystals that were stopped for going over their budget) are skipped.
+	rows = []
+	for filepath in filepath_names:
+		crystal_name = '.'.join(filepath.split('.')[:-1]).split('/')[-1]
+		stage_times_filepath = stage_times_folderpath+'/'+crystal_name+'_stage_times.json'
+		if not os.path.exists(stage_times_filepath):
+			continue
+		with open(stage_times_filepath) as stage_times_file:
+			report = json.load(stage_times_file)
+		rows.append([crystal_name, report['completed'], 'total', '', report['total_time'], 1])
+		for stage_name, stage in sorted(report['stages'].items()):
+			rows.append([crystal_name, report['completed'], 'stage', stage_name, stage['time'], stage['calls']])
+		for count_name, value in sorted(report['counts'].items()):
+			rows.append([crystal_name, report['completed'], 'count', count_name, value, ''])
+
+	# Second, write the stage times and counts into the csv file.
+	stage_times_csv_filepath = stage_times_folderpath+'/'+stage_times_csv_filename
+	with open(stage_times_csv_filepath, 'w', newline='') as stage_times_csv_file:
+		writer = csv.writer(stage_times_csv_file)
+		writer.writerow(['crystal_name', 'completed', 'type', 'name', 'value', 'calls'])
+		writer.writerows(rows)
+
+	# Third, return the path to the csv file.
+	return stage_times_csv_filepath
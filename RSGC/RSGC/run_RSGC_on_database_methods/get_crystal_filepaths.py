@@ -0,0 +1,66 @@
+"""
+get_crystal_filepaths.py, Geoffrey Weal, 17/10/26
+
+This script is designed to obtain the paths to all the crystals in a crystal database that you want to remove sidegroups from.
+"""
+import os
+
+def get_crystal_filepaths(crystal_database_dirname, repaired_crystal_database_dirname=None, exclude_identifiers=[]):
+	"""
+	This method is designed to obtain the paths to all the crystals in a crystal database that you want to remove sidegroups from.
+
+	If a crystal is also found in the repaired crystal database, the repaired version of the crystal will be used instead of the original version.
+
+	Parameters
+	----------
+	crystal_database_dirname : str.
+		This is the path to the folder that contains the crystal database you want to remove sidegroups from.
+	repaired_crystal_database_dirname : str. or None
+		This is the path to the folder that contains the repaired crystals obtained from the ReCrystals program. If None, no repaired crystals are used. Default: None.
+	exclude_identifiers : list of str.
+		These are the identifiers of the crystals you do not want to remove sidegroups from. Default: [].
+
+	Returns
+	-------
+	filepath_names : list of str.
+		These are the paths to the crystals to remove sidegroups from, sorted by the name of the crystal file.
+	"""
+
+	# First, check that the crystal database you gave exists. 
+	if not os.path.exists(crystal_database_dirname):
+		raise Exception(f'Error: {crystal_database_dirname} does not exist in {os.getcwd()}')
+
+	# Second, check that the crystal database holding repaired crystals you gave exists.
+	if (repaired_crystal_database_dirname is not None) and (not os.path.exists(repaired_crystal_database_dirname)):
+		raise Exception(f'Error: {repaired_crystal_database_dirname} does not exist in {os.getcwd()}')
+
+	# Third, get the names of the files contained in the crystal database folder.
+	crystal_database_filenames = sorted(os.listdir(crystal_database_dirname))
+
+	# Fourth, get the names of the files contained in the repaired crystal database folder.
+	repaired_crystal_database_filenames = set(os.listdir(repaired_crystal_database_dirname)) if (repaired_crystal_database_dirname is not None) else set()
+
+	# Fifth, obtain all the paths to the crystals to remove sidegroups from.
+	filepath_names = []
+	for crystal_database_filename in crystal_database_filenames:
+
+		# 5.1: Make sure that the file ends with ".xyz"
+		if not crystal_database_filename.endswith('.xyz'):
+			continue
+
+		# 5.2: Get the name of the identifier for this crystal. 
+		crystal_identifier = crystal_database_filename.replace('.xyz','')
+
+		# 5.3: If the crystal is in the exclude_identifiers list, don't process it.
+		if crystal_identifier in exclude_identifiers:
+			continue
+
+		# 5.4: Check if the crystal is in the repaired crystal database folder. 
+		#      * If it is, take the crystal from the repaired folder rather than the original folder. 
+		crystal_folder_name = repaired_crystal_database_dirname if (crystal_database_filename in repaired_crystal_database_filenames) else crystal_database_dirname
+
+		# 5.5: Add the path to the crystal file to the filepath_names list.
+		filepath_names.append(crystal_folder_name+'/'+crystal_database_filename)
+
+	# Sixth, return the paths to the crystals.
+	return filepath_names
@@ -0,0 +1,63 @@
+"""
+run_RSGC_on_crystal.py, Geoffrey Weal, 17/10/26
+
+This script is designed to run the RSGC program on a single crystal, recording any issues rather than stopping the database run.
+"""
+import time, traceback
+
+from RSGC.RSGC.RSGC                       import RSGC
+from RSGC.RSGC.Hydrogen_in_Ring_Exception import Hydrogen_in_Ring_Exception
+from RSGC.RSGC.Problematic_Molecules_Exception import Problematic_Molecules_Exception
+from RSGC.RSGC.Unexpected_Coordination_Exception import Unexpected_Coordination_Exception
+from RSGC.RSGC.RSGC_methods.Diagnostics_Sink     import Diagnostics_Sink, set_active_diagnostics_sink
+
+def run_RSGC_on_crystal(filepath_and_RSGC_settings):
+	"""
+	This method is designed to run the RSGC program on a single crystal. 
+
+	Any exceptions raised by the RSGC program are caught and returned so that a single problematic crystal does not stop all the other crystals in the database from being processed.
+
+	The diagnostics found for this crystal (such as rings that contain hydrogens) are kept in memory and returned, rather than written to file by this process, so that
+	run_RSGC_on_database can write the diagnostics of all the crystals at once.
+
+	Parameters
+	----------
+	filepath_and_RSGC_settings : tuple of (str., dict.)
+		This contains the path to the crystal file and the settings to give to the RSGC program. These are given together so this method can be used by multiprocessing.Pool.imap.
+
+	Returns
+	-------
+	filepath : str.
+		This is the path to the crystal file.
+	outcome : str.
+		This is the outcome of running the RSGC program on this crystal. This is either 'successful', 'Hydrogen_in_Ring_Exception', 'Problematic_Molecules_Exception', 'Unexpected_Coordination_Exception', or 'failed'. 
+	message : str. or None
+		This is the issue that was found when running the RSGC program on this crystal. None if the RSGC program was successful. 
+	duration : float
+		This is the time (in seconds) it took to run the RSGC program on this crystal.
+	diagnostics : list of dict.
+		These are the diagnostics found for this crystal. See Diagnostics_Sink for more information.
+	"""
+
+	# First, obtain the path to the crystal and the settings for the RSGC program.
+	filepath, RSGC_settings = filepath_and_RSGC_settings
+
+	# Second, run the RSGC program, recording any issues and diagnostics that were found.
+	diagnostics_sink = Diagnostics_Sink()
+	previous_diagnostics_sink = set_active_diagnostics_sink(diagnostics_sink)
+	start_time = time.perf_counter()
+	try:
+		RSGC(filepath, **RSGC_settings)
+	except Hydrogen_in_Ring_Exception as exception_message:
+		return filepath, 'Hydrogen_in_Ring_Exception', str(exception_message), time.perf_counter() - start_time, diagnostics_sink.records
+	except Problematic_Molecules_Exception as exception_message:
+		return filepath, 'Problematic_Molecules_Exception', str(exception_message), time.perf_counter() - start_time, diagnostics_sink.records
+	except Unexpected_Coordination_Exception as exception_message:
+		return filepath, 'Unexpected_Coordination_Exception', str(exception_message), time.perf_counter() - start_time, diagnostics_sink.records
+	except Exception as exception_message:
+		return filepath, 'failed', str(exception_message)+'\n'+traceback.format_exc(), time.perf_counter() - start_time, diagnostics_sink.records
+	finally:
+		set_active_diagnostics_sink(previous_diagnostics_sink)
+
+	# Third, the RSGC program was run successfully on this crystal.
+	return filepath, 'successful', None, time.perf_counter() - start_time, diagnostics_sink.records
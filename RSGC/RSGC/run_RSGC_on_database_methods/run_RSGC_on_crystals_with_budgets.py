@@ -0,0 +1,203 @@
+"""
+run_RSGC_on_crystals_with_budgets.py, Geoffrey Weal, 17/10/26
+
+This script is designed to run the RSGC program on crystals, where each crystal is given a budget of time and memory it can use.
+"""
+import os, time, shutil
+from multiprocessing            import Process, Pipe
+from multiprocessing.connection import wait
+
+from RSGC.RSGC.run_RSGC_on_database_methods.run_RSGC_on_crystal import run_RSGC_on_crystal
+
+def run_RSGC_on_crystals_with_budgets(tasks, no_of_cpus=1, max_time_per_crystal=None, max_memory_per_crystal_MB=None, check_interval=0.1):
+	"""
+	This method is designed to run the RSGC program on crystals, where each crystal is given a budget of time and memory it can use.
+
+	Each crystal is processed in its own process, and up to no_of_cpus crystals are processed at the same time. If a crystal takes longer than max_time_per_crystal, or the
+	memory (resident set size) used by its process becomes bigger than max_memory_per_crystal_MB, its process is stopped and the crystal is recorded as 'timed_out' or
+	'out_of_memory'. This means that one crystal can not freeze or take down the whole database run.
+
+	A process that is stopped can not clean up after itself, so any files it had already written for its crystal (such as a half-written crystal file, or the molecules saved
+	so far in low-memory mode) are removed once it has stopped (see remove_crystal_files). This is also done if the process stopped unexpectedly. Before a crystal is stopped,
+	it is checked again whether it has finished (as it may have finished just as it went over its budget), so that a crystal that has finished is never stopped.
+
+	The memory used by each process is read from /proc, so the memory budget is only used on Linux.
+
+	Parameters
+	----------
+	tasks : list of (str., dict.)
+		These are the path to each crystal file and the settings to give to the RSGC program.
+	no_of_cpus : int.
+		This is the number of crystals to process at the same time. Default: 1.
+	max_time_per_crystal : float or None
+		This is the longest time (in seconds) that a crystal can take to be processed. If None, there is no time budget. Default: None.
+	max_memory_per_crystal_MB : float or None
+		This is the most memory (in MB) that the process for a crystal can use. If None, there is no memory budget. Default: None.
+	check_interval : float
+		This is the time (in seconds) between checks of the time and memory used by each process. Default: 0.1.
+
+	Returns
+	-------
+	results : generator of (str., str., str. or None, float, list of dict.)
+		These are the results for each crystal, given in the order that the crystals finished. Each result contains the path to the crystal, the outcome, the issue message (None if successful), the time (in seconds) it took to process the crystal, and the diagnostics found for the crystal (none are given for crystals that were stopped).
+	"""
+
+	# First, set up the crystals to process and the processes that are running.
+	tasks_to_process = list(tasks)
+	task_settings = dict(tasks_to_process)
+	running_processes = {}
+
+	# Second, process the crystals until all of them are finished.
+	while (len(tasks_to_process) > 0) or (len(running_processes) > 0):
+
+		# 2.1: Start processing crystals until no_of_cpus crystals are being processed at the same time.
+		while (len(tasks_to_process) > 0) and (len(running_processes) < no_of_cpus):
+			task = tasks_to_process.pop(0)
+			receive_connection, send_connection = Pipe(duplex=False)
+			process = Process(target=run_RSGC_on_crystal_in_process, args=(task, send_connection), daemon=True)
+			process.start()
+			send_connection.close()
+			running_processes[receive_connection] = (process, task[0], time.perf_counter())
+
+		# 2.2: Wait until a crystal has finished or until it is time to check the budgets again.
+		finished_connections = wait(list(running_processes.keys()), timeout=check_interval)
+
+		# 2.3: Give the result of each crystal that has finished.
+		for receive_connection in finished_connections:
+			process, filepath, start_time = running_processes.pop(receive_connection)
+			yield receive_result(receive_connection, process, filepath, start_time, task_settings[filepath])
+
+		# 2.4: Stop any crystals that have gone over their time or memory budget.
+		for receive_connection, (process, filepath, start_time) in list(running_processes.items()):
+			duration = time.perf_counter() - start_time
+			if (max_time_per_crystal is not None) and (duration > max_time_per_crystal):
+				outcome, message = 'timed_out', 'This crystal took longer than the time budget of '+str(max_time_per_crystal)+' s, so was stopped.'
+			elif (max_memory_per_crystal_MB is not None) and ((get_process_memory_MB(process.pid) or 0.0) > max_memory_per_crystal_MB):
+				outcome, message = 'out_of_memory', 'This crystal used more memory than the memory budget of '+str(max_memory_per_crystal_MB)+' MB, so was stopped.'
+			else:
+				continue
+
+			# 2.5: If the crystal finished after the wait above (such as just as it went over its budget), give its result rather than stopping it.
+			if receive_connection.poll() or (process.exitcode is not None):
+				del running_processes[receive_connection]
+				yield receive_result(receive_connection, process, filepath, start_time, task_settings[filepath])
+				continue
+
+			# 2.6: Stop the crystal, and remove the files it had written.
+			stop_process(process)
+			remove_crystal_files(filepath, task_settings[filepath])
+			receive_connection.close()
+			del running_processes[receive_connection]
+			yield filepath, outcome, message, duration, []
+
+def receive_result(receive_connection, process, filepath, start_time, RSGC_settings):
+	"""
+	This method is designed to receive the result of a crystal whose process has finished.
+
+	Parameters
+	----------
+	receive_connection : multiprocessing.connection.Connection
+		This is the connection to receive the result from the process with.
+	process : multiprocessing.Process
+		This is the process that processed the crystal.
+	filepath : str.
+		This is the path to the crystal file.
+	start_time : float
+		This is the time (from time.perf_counter) that the process was started.
+	RSGC_settings : dict.
+		These are the settings given to the RSGC program.
+
+	Returns
+	-------
+	result : (str., str., str. or None, float, list of dict.)
+		This is the result for the crystal. See run_RSGC_on_crystals_with_budgets for more information.
+	"""
+	try:
+		result = receive_connection.recv()
+	except EOFError:
+		# The process stopped without giving a result, such as if it was killed by the operating system.
+		process.join()
+		remove_crystal_files(filepath, RSGC_settings)
+		result = (filepath, 'failed', 'The process for this crystal stopped unexpectedly (exit code: '+str(process.exitcode)+').', time.perf_counter() - start_time, [])
+	receive_connection.close()
+	process.join()
+	return result
+
+def run_RSGC_on_crystal_in_process(task, send_connection):
+	"""
+	This method is designed to run the RSGC program on a crystal in its own process, and send the result back to the main process.
+
+	Parameters
+	----------
+	task : (str., dict.)
+		This is the path to the crystal file and the settings to give to the RSGC program.
+	send_connection : multiprocessing.connection.Connection
+		This is the connection to send the result back to the main process with.
+	"""
+	send_connection.send(run_RSGC_on_crystal(task))
+	send_connection.close()
+
+def remove_crystal_files(filepath, RSGC_settings):
+	"""
+	This method is designed to remove the files that the RSGC program had written for a crystal whose process was stopped before it finished.
+
+	These are the crystal file with sidegroups removed and the folder of molecules for this crystal. Crystals saved into a database are not removed, as these are only
+	saved once the crystal has finished.
+
+	Parameters
+	----------
+	filepath : str.
+		This is the path to the crystal file.
+	RSGC_settings : dict.
+		These are the settings given to the RSGC program.
+	"""
+
+	# First, obtain the name of the crystal and the folder its files were saved into.
+	crystal_name = '.'.join(filepath.split('.')[:-1]).split('/')[-1]
+	save_crystal_folderpath = RSGC_settings.get('save_crystal_folderpath', 'crystals_with_sidechains_removed')
+
+	# Second, remove the crystal file and the folder of molecules for this crystal.
+	crystal_filepath = os.path.join(save_crystal_folderpath, crystal_name+'_with_sidechains_removed.xyz')
+	if os.path.lexists(crystal_filepath):
+		os.remove(crystal_filepath)
+	molecules_folderpath = os.path.join(save_crystal_folderpath+'_molecules', crystal_name)
+	if os.path.exists(molecules_folderpath):
+		shutil.rmtree(molecules_folderpath, ignore_errors=True)
+
+def stop_process(process, grace_period=5.0):
+	"""
+	This method is designed to stop a process, killing it if it does not stop within the grace period.
+
+	Parameters
+	----------
+	process : multiprocessing.Process
+		This is the process to stop.
+	grace_period : float
+		This is the time (in seconds) to give the process to stop before it is killed. Default: 5.0.
+	"""
+	process.terminate()
+	process.join(grace_period)
+	if process.is_alive():
+		process.kill()
+		process.join()
+
+def get_process_memory_MB(pid):
+	"""
+	This method is designed to give the memory (resident set size) that a process is using.
+
+	Parameters
+	----------
+	pid : int
+		This is the process id of the process.
+
+	Returns
+	-------
+	memory_MB : float or None
+		This is the memory (in MB) that the process is using. None if this can not be read (such as if not on Linux).
+	"""
+	try:
+		with open('/proc/'+str(pid)+'/statm') as statm_file:
+			no_of_resident_pages = int(statm_file.read().split()[1])
+	except (OSError, ValueError, IndexError):
+		return None
+	return no_of_resident_pages * os.sysconf('SC_PAGE_SIZE') / (1024.0 * 1024.0)
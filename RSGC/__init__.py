@@ -5,7 +5,8 @@ __version__ = '0.5'
 __author__  = 'Dr. Geoffrey Weal, Dr. Chayanit Wechwithayakhlung, Dr. Josh Sutton, Dr. Daniel Packwood, Dr. Paul Hume, Prof. Justin Hodgkiss'
 
 import sys
-from importlib.util import find_spec
+from types     import ModuleType
+from importlib import import_module
 
 if sys.version_info[0] == 2:
 	toString = ''
@@ -34,199 +35,6 @@ if sys.version_info[1] < 4:
 	toString += '================================================'+'\n'
 	raise ImportError(toString)
 
-# ------------------------------------------------------------------------------------------------------------------------
-# A check for ASE
-
-ase_spec = find_spec("ase")
-ase_found = (ase_spec is not None)
-if not ase_found:
-	toString = ''
-	toString += '\n'
-	toString += '================================================'+'\n'
-	toString += 'This is the Remove Sidechain Groups from Crystals (RSGC) Program'+'\n'
-	toString += 'Version: '+str(__version__)+'\n'
-	toString += '\n'
-	toString += 'The Remove Sidechain Groups from Crystals (RSGC) Program requires ASE.'+'\n'
-	toString += '\n'
-	toString += 'Install ASE through pip by following the instruction in https://github.com/GardenGroupUO/RSGC'+'\n'
-	toString += 'These instructions will ask you to install ase by typing the following into your terminal\n'
-	toString += 'pip3 install --user --upgrade ase\n'
-	toString += '\n'
-	toString += 'This program will exit before beginning'+'\n'
-	toString += '================================================'+'\n'
-	raise ImportError(toString)	
-
-import ase
-ase_version_minimum = '3.19.0'
-from packaging import version
-if version.parse(ase.__version__) < version.parse(ase_version_minimum):
-	toString = ''
-	toString += '\n'
-	toString += '================================================'+'\n'
-	toString += 'This is the Remove Sidechain Groups from Crystals (RSGC) Program'+'\n'
-	toString += 'Version: '+str(__version__)+'\n'
-	toString += '\n'
-	toString += 'The Remove Sidechain Groups from Crystals (RSGC) Program requires ASE greater than or equal to '+str(ase_version_minimum)+'.'+'\n'
-	toString += 'The current version of ASE you are using is '+str(ase.__version__)+'.'+'\n'
-	toString += '\n'
-	toString += 'Install ASE through pip by following the instruction in https://github.com/GardenGroupUO/RSGC'+'\n'
-	toString += 'These instructions will ask you to install ase by typing the following into your terminal\n'
-	toString += 'pip3 install --user --upgrade ase\n'
-	toString += '\n'
-	toString += 'This program will exit before beginning'+'\n'
-	toString += '================================================'+'\n'
-	raise ImportError(toString)
-
-# ------------------------------------------------------------------------------------------------------------------------
-
-scipy_spec = find_spec("scipy")
-scipy_found = (scipy_spec is not None)
-if not scipy_found:
-	toString = ''
-	toString += '\n'
-	toString += '================================================'+'\n'
-	toString += 'This is the Remove Sidechain Groups from Crystals (RSGC) Program'+'\n'
-	toString += 'Version: '+str(__version__)+'\n'
-	toString += '\n'
-	toString += 'The Remove Sidechain Groups from Crystals (RSGC) Program requires the "scipy" program.'+'\n'
-	toString += '\n'
-	toString += 'Install scipy by typing the following into your terminal\n'
-	toString += '\n'
-	toString += 'pip3 install --user --upgrade scipy\n'
-	toString += '\n'
-	toString += 'This program will exit before beginning'+'\n'
-	toString += '================================================'+'\n'
-	raise ImportError(toString)	
-
-# ------------------------------------------------------------------------------------------------------------------------
-
-networkx_spec = find_spec("networkx")
-networkx_found = (networkx_spec is not None)
-if not networkx_found:
-	toString = ''
-	toString += '\n'
-	toString += '================================================'+'\n'
-	toString += 'This is the Remove Sidechain Groups from Crystals (RSGC) Program'+'\n'
-	toString += 'Version: '+str(__version__)+'\n'
-	toString += '\n'
-	toString += 'The Remove Sidechain Groups from Crystals (RSGC) Program requires the "networkx" program.'+'\n'
-	toString += '\n'
-	toString += 'Install networkx through pip by following the instruction in https://github.com/GardenGroupUO/RSGC'+'\n'
-	toString += 'These instructions will ask you to install networkx by typing the following into your terminal\n'
-	toString += '\n'
-	toString += 'pip3 install --user --upgrade networkx\n'
-	toString += '\n'
-	toString += 'This program will exit before beginning'+'\n'
-	toString += '================================================'+'\n'
-	raise ImportError(toString)	
-
-# ------------------------------------------------------------------------------------------------------------------------
-
-pymatgen_spec = find_spec("pymatgen")
-pymatgen_found = (pymatgen_spec is not None)
-if not pymatgen_found:
-	toString = ''
-	toString += '\n'
-	toString += '================================================'+'\n'
-	toString += 'This is the Remove Sidechain Groups from Crystals (RSGC) Program'+'\n'
-	toString += 'Version: '+str(__version__)+'\n'
-	toString += '\n'
-	toString += 'The Remove Sidechain Groups from Crystals (RSGC) Program requires the "pymatgen" program.'+'\n'
-	toString += '\n'
-	toString += 'Install pymatgen through pip by following the instruction in https://github.com/GardenGroupUO/RSGC'+'\n'
-	toString += 'These instructions will ask you to install pymatgen by typing the following into your terminal\n'
-	toString += '\n'
-	toString += 'pip3 install --user --upgrade pymatgen\n'
-	toString += '\n'
-	toString += 'This program will exit before beginning'+'\n'
-	toString += '================================================'+'\n'
-	raise ImportError(toString)	
-
-# ------------------------------------------------------------------------------------------------------------------------
-
-packaging_spec = find_spec("packaging")
-packaging_found = (packaging_spec is not None)
-if not packaging_found:
-	toString = ''
-	toString += '\n'
-	toString += '================================================'+'\n'
-	toString += 'This is the Remove Sidechain Groups from Crystals (RSGC) Program'+'\n'
-	toString += 'Version: '+str(__version__)+'\n'
-	toString += '\n'
-	toString += 'The Remove Sidechain Groups from Crystals (RSGC) Program requires the "packaging" program.'+'\n'
-	toString += '\n'
-	toString += 'Install packaging through pip by following the instruction in https://github.com/GardenGroupUO/RSGC'+'\n'
-	toString += 'These instructions will ask you to install packaging by typing the following into your terminal\n'
-	toString += '\n'
-	toString += 'pip3 install --user --upgrade packaging\n'
-	toString += '\n'
-	toString += 'This program will exit before beginning'+'\n'
-	toString += '================================================'+'\n'
-	raise ImportError(toString)	
-
-# ------------------------------------------------------------------------------------------------------------------------
-
-tqdm_spec = find_spec("tqdm")
-tqdm_found = (tqdm_spec is not None)
-if not tqdm_found:
-	toString = ''
-	toString += '\n'
-	toString += '================================================'+'\n'
-	toString += 'This is the Remove Sidechain Groups from Crystals (RSGC) Program'+'\n'
-	toString += 'Version: '+str(__version__)+'\n'
-	toString += '\n'
-	toString += 'The Remove Sidechain Groups from Crystals (RSGC) Program requires the "tqdm" program.'+'\n'
-	toString += '\n'
-	toString += 'Install tqdm through pip by following the instruction in https://github.com/GardenGroupUO/RSGC'+'\n'
-	toString += 'These instructions will ask you to install tqdm by typing the following into your terminal\n'
-	toString += '\n'
-	toString += 'pip3 install --user --upgrade tqdm\n'
-	toString += '\n'
-	toString += 'This program will exit before beginning'+'\n'
-	toString += '================================================'+'\n'
-
-# ------------------------------------------------------------------------------------------------------------------------
-
-tqdm_spec = find_spec("xlsxwriter")
-tqdm_found = (tqdm_spec is not None)
-if not tqdm_found:
-	toString = ''
-	toString += '\n'
-	toString += '================================================'+'\n'
-	toString += 'This is the Remove Sidechain Groups from Crystals (RSGC) Program'+'\n'
-	toString += 'Version: '+str(__version__)+'\n'
-	toString += '\n'
-	toString += 'The Remove Sidechain Groups from Crystals (RSGC) Program requires the "xlsxwriter" program.'+'\n'
-	toString += '\n'
-	toString += 'Install xlsxwriter through pip by following the instruction in https://github.com/GardenGroupUO/RSGC'+'\n'
-	toString += 'These instructions will ask you to install xlsxwriter by typing the following into your terminal\n'
-	toString += '\n'
-	toString += 'pip3 install --user --upgrade xlsxwriter\n'
-	toString += '\n'
-	toString += 'This program will exit before beginning'+'\n'
-	toString += '================================================'+'\n'
-
-# ------------------------------------------------------------------------------------------------------------------------
-
-mprof_spec = find_spec("memory_profiler")
-mprof_found = (tqdm_spec is not None)
-if not mprof_found:
-	toString = ''
-	toString += '\n'
-	toString += '================================================'+'\n'
-	toString += 'This is the Remove Sidechain Groups from Crystals (RSGC) Program'+'\n'
-	toString += 'Version: '+str(__version__)+'\n'
-	toString += '\n'
-	toString += 'The Remove Sidechain Groups from Crystals (RSGC) Program requires the "memory_profiler" program.'+'\n'
-	toString += '\n'
-	toString += 'Install memory_profiler through pip by following the instruction in https://github.com/GardenGroupUO/RSGC'+'\n'
-	toString += 'These instructions will ask you to install memory_profiler by typing the following into your terminal\n'
-	toString += '\n'
-	toString += 'pip3 install --user --upgrade memory_profiler\n'
-	toString += '\n'
-	toString += 'This program will exit before beginning'+'\n'
-	toString += '================================================'+'\n'
-
 # ------------------------------------------------------------------------------------------------------------------------
 
 __author_email__ = 'geoffrey.weal@vuw.ac.nz'
@@ -235,14 +43,59 @@ __url__ = 'https://github.com/geoffreyweal/RSGC'
 __doc__ = 'See https://github.com/geoffreyweal/RSGC for the documentation on this program'
 
 # ================================================================================================
-from RSGC.RSGC.RSGC import RSGC
-from RSGC.RSGC.Hydrogen_in_Ring_Exception import Hydrogen_in_Ring_Exception
+# The parts of the RSGC program are only imported when they are first used (see PEP 562), so that "import RSGC" is fast.
+# The programs that each part needs are checked when that part is first used.
+
+_lazy_attributes = {
+	'RSGC':                              ('RSGC.RSGC.RSGC',                             ['numpy', 'ase', 'networkx', 'tqdm', 'packaging', 'SUMELF']),
+	'run_RSGC_on_database':              ('RSGC.RSGC.run_RSGC_on_database',             ['numpy', 'ase', 'networkx', 'tqdm', 'packaging', 'SUMELF']),
+	'RSGC_on_multiple_structures':       ('RSGC.RSGC.RSGC_on_multiple_structures',      ['numpy', 'ase', 'networkx', 'tqdm', 'packaging', 'SUMELF']),
+	'RSGC_Database':                     ('RSGC.RSGC.RSGC_methods.RSGC_Database',       ['numpy', 'ase', 'packaging', 'SUMELF']),
+	'Hydrogen_in_Ring_Exception':        ('RSGC.RSGC.Hydrogen_in_Ring_Exception',        []),
+	'Problematic_Molecules_Exception':   ('RSGC.RSGC.Problematic_Molecules_Exception',   []),
+	'Unexpected_Coordination_Exception': ('RSGC.RSGC.Unexpected_Coordination_Exception', []),
+}
+
+def __getattr__(attribute_name):
+	"""
+	This method will import a part of the RSGC program when it is first used, after checking that the programs it needs are installed.
+
+	Parameters
+	----------
+	attribute_name : str.
+		This is the name of the part of the RSGC program to import.
+
+	Returns
+	-------
+	attribute : object
+		This is the part of the RSGC program.
+	"""
+	if attribute_name not in _lazy_attributes:
+		raise AttributeError("module 'RSGC' has no attribute '"+str(attribute_name)+"'")
+	module_name, dependency_names = _lazy_attributes[attribute_name]
+	from RSGC.RSGC.check_dependencies import check_dependencies
+	check_dependencies(dependency_names)
+	attribute = getattr(import_module(module_name), attribute_name)
+	globals()[attribute_name] = attribute
+	return attribute
+
+def __dir__():
+	return sorted(set(globals().keys()) | set(_lazy_attributes.keys()))
+
+class _RSGC_Package(ModuleType):
+	"""
+	The RSGC.RSGC sub-package has the same name as the RSGC function. When a module in this sub-package is imported, Python sets RSGC.RSGC to this sub-package. 
+	This is ignored, so that "from RSGC import RSGC" always gives the RSGC function (the modules in this sub-package can still be imported as normal).
+	"""
+	def __setattr__(self, attribute_name, value):
+		if (attribute_name == 'RSGC') and isinstance(value, ModuleType):
+			return
+		super().__setattr__(attribute_name, value)
+
+sys.modules['RSGC'].__class__ = _RSGC_Package
+
 # ================================================================================================
 
-__all__ = [RSGC, Hydrogen_in_Ring_Exception]
+__all__ = ['RSGC', 'Hydrogen_in_Ring_Exception', 'Problematic_Molecules_Exception', 'Unexpected_Coordination_Exception', 'run_RSGC_on_database', 'RSGC_on_multiple_structures', 'RSGC_Database']
 
 # ------------------------------------------------------------------------------------------------------------------------
-
-
-
-